@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import products, users, logs, aliexpress, sns, dashboard
+from app.api.v1.endpoints import products, users, logs, aliexpress, sns, dashboard, webhooks, jobs
 
 api_router = APIRouter()
 
@@ -10,3 +10,5 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(logs.router, prefix="/logs", tags=["logs"])
 api_router.include_router(aliexpress.router, prefix="/aliexpress", tags=["aliexpress"])
 api_router.include_router(sns.router, prefix="/sns", tags=["sns"])
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
@@ -1,11 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+import asyncio
+import json
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from app.core.database import get_db
 from app.services.aliexpress_service import AliExpressService
-from app.services.shopify_service import ShopifyService
+from app.services.browser_pool import browser_pool
+from app.services.page_loader import page_loader
+from app.services.aliexpress_page_parser import fast_path_stats
+from app.services.cache_service import aliexpress_cache
+from app.services.scrape_session_pool import scrape_sessions
+from app.core.config import settings
 from app.services.logging_service import LoggingService
-from app.models.product import Product
+from app.services.job_service import JobService
+from app.services.import_pipeline import ImportPipeline
+from app.models.job import Job
+from app.services.trending_service import TrendingService
+from app.services.candidate_scoring_service import CandidateScoringService
+from app.tasks.import_tasks import import_products_task
+from app.tasks.trending_tasks import crawl_trending_task
 
 router = APIRouter()
 
@@ -15,20 +30,29 @@ async def search_aliexpress_products(
     category: str = Query("Home & Garden", description="카테고리"),
     min_orders: int = Query(100, description="최소 주문 수"),
     max_price: Optional[float] = Query(None, description="최대 가격"),
-    page: int = Query(1, ge=1),
-    limit: int = Query(20, ge=1, le=50),
+    page: int = Query(1, ge=1, description="시작 페이지"),
+    limit: int = Query(20, ge=1, le=500),
     db: Session = Depends(get_db)
 ):
-    """알리익스프레스에서 제품 검색"""
+    """알리익스프레스에서 제품 검색 (limit이 한 페이지보다 크면 여러 페이지 동시 조회)"""
     try:
         aliexpress_service = AliExpressService()
-        products = await aliexpress_service.search_products(
-            keyword=keyword,
-            category=category,
-            min_orders=min_orders,
-            max_price=max_price,
-            page=page,
-            limit=limit
+        cache_key = aliexpress_cache.make_key(
+            "search", keyword=keyword, category=category, min_orders=min_orders,
+            max_price=max_price, page=page, limit=limit
+        )
+        products = await aliexpress_cache.get_or_fetch(
+            cache_key,
+            lambda: aliexpress_service.search_products_multi(
+                keyword=keyword,
+                category=category,
+                min_orders=min_orders,
+                max_price=max_price,
+                start_page=page,
+                limit=limit
+            ),
+            ttl=settings.ALIEXPRESS_SEARCH_CACHE_TTL,
+            stale_ttl=settings.ALIEXPRESS_CACHE_STALE_TTL
         )
         
         LoggingService.log_info(f"알리익스프레스 제품 검색 완료: {keyword}, {len(products)}개 결과")
@@ -43,31 +67,164 @@ async def search_aliexpress_products(
         LoggingService.log_error(f"알리익스프레스 제품 검색 실패: {str(e)}")
         raise HTTPException(status_code=500, detail="제품 검색 중 오류가 발생했습니다.")
 
+@router.get("/search/stream")
+async def stream_aliexpress_search(
+    keyword: str = Query(..., description="검색할 제품 키워드"),
+    category: str = Query("Home & Garden", description="카테고리"),
+    min_orders: int = Query(100, description="최소 주문 수"),
+    max_price: Optional[float] = Query(None, description="최대 가격"),
+    page: int = Query(1, ge=1, description="시작 페이지"),
+    limit: int = Query(100, ge=1, le=500)
+):
+    """여러 검색 결과 페이지를 동시에 조회하고 페이지가 완료될 때마다 NDJSON으로 전송"""
+    aliexpress_service = AliExpressService()
+
+    async def result_stream():
+        total = 0
+        try:
+            async for chunk in aliexpress_service.iter_search_pages(
+                keyword=keyword, category=category, min_orders=min_orders,
+                max_price=max_price, start_page=page, limit=limit
+            ):
+                total += len(chunk["products"])
+                yield json.dumps(chunk, ensure_ascii=False) + "\n"
+            yield json.dumps({"done": True, "total": total}) + "\n"
+        except Exception as e:
+            LoggingService.log_error(f"알리익스프레스 스트리밍 검색 실패: {str(e)}")
+            yield json.dumps({"done": True, "total": total, "error": "제품 검색 중 오류가 발생했습니다."}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(result_stream(), media_type="application/x-ndjson")
+
 @router.get("/trending")
 async def get_trending_products(
     category: str = Query("Home & Garden", description="카테고리"),
     limit: int = Query(20, ge=1, le=50),
+    as_of: Optional[datetime] = Query(None, description="비교할 과거 시점 (해당 시점 스냅샷과의 변동 포함)"),
     db: Session = Depends(get_db)
 ):
-    """인기 제품 조회 (판매 주문이 많은 제품)"""
+    """인기 제품 조회 (주기적으로 수집된 최신 스냅샷 사용)"""
     try:
-        aliexpress_service = AliExpressService()
-        trending_products = await aliexpress_service.get_trending_products(
-            category=category,
-            limit=limit
-        )
+        trending_service = TrendingService(db)
+        snapshot = trending_service.get_snapshot(category)
         
-        LoggingService.log_info(f"인기 제품 조회 완료: {category}, {len(trending_products)}개 결과")
+        if snapshot is None:
+            # No crawl has run for this category yet; serve a cached live scrape
+            aliexpress_service = AliExpressService()
+            trending_products = await aliexpress_cache.get_or_fetch(
+                aliexpress_cache.make_key("trending", category=category, limit=limit),
+                lambda: aliexpress_service.get_trending_products(
+                    category=category,
+                    limit=limit
+                ),
+                ttl=settings.ALIEXPRESS_TRENDING_CACHE_TTL,
+                stale_ttl=settings.ALIEXPRESS_CACHE_STALE_TTL
+            )
+            return {
+                "products": trending_products,
+                "category": category,
+                "total": len(trending_products),
+                "captured_at": None
+            }
         
-        return {
-            "products": trending_products,
+        result = {
+            "products": (snapshot.products or [])[:limit],
             "category": category,
-            "total": len(trending_products)
+            "total": min(limit, snapshot.product_count or 0),
+            "captured_at": snapshot.captured_at.isoformat()
         }
+        
+        if as_of is not None:
+            previous = trending_service.get_snapshot(category, as_of=as_of)
+            result["diff"] = TrendingService.diff(previous, snapshot) if previous else None
+        
+        return result
     except Exception as e:
         LoggingService.log_error(f"인기 제품 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail="인기 제품 조회 중 오류가 발생했습니다.")
 
+@router.post("/trending/refresh")
+async def refresh_trending_products(
+    categories: Optional[List[str]] = None,
+    db: Session = Depends(get_db)
+):
+    """인기 제품 스냅샷 즉시 수집 (백그라운드 작업)"""
+    try:
+        job = JobService.create_job(db, "trending_crawl", params={"categories": categories})
+        task = crawl_trending_task.delay(categories, job_id=job.id)
+        JobService.attach_task(db, job, task.id)
+        
+        return {
+            "message": "인기 제품 수집이 시작되었습니다.",
+            "job_id": job.id,
+            "status": "queued"
+        }
+    except Exception as e:
+        LoggingService.log_error(f"인기 제품 수집 시작 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail="인기 제품 수집 시작 중 오류가 발생했습니다.")
+
+@router.post("/score")
+async def score_candidates(
+    products: List[Dict[str, Any]],
+    min_orders: int = Query(0, ge=0, description="최소 주문 수"),
+    max_price: Optional[float] = Query(None, description="최대 가격"),
+    min_rating: float = Query(0.0, ge=0, le=5, description="최소 평점"),
+    require_us_shipping: bool = Query(False, description="US 배송 가능 제품만"),
+    formula: Optional[str] = Query(None, description="랭킹 수식 (예: orders * rating / price)"),
+    top_k: int = Query(20, ge=1, le=1000)
+):
+    """스크래핑한 제품 후보를 일괄 필터링/점수화하여 상위 top_k개 반환"""
+    try:
+        ranked = CandidateScoringService.score(
+            products, min_orders=min_orders, max_price=max_price, min_rating=min_rating,
+            require_us_shipping=require_us_shipping, formula=formula, top_k=top_k
+        )
+        return {"products": ranked, "total": len(ranked), "candidates": len(products)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        LoggingService.log_error(f"제품 후보 점수 계산 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail="제품 후보 점수 계산 중 오류가 발생했습니다.")
+
+@router.post("/score/benchmark")
+async def benchmark_candidate_scoring(
+    products: List[Dict[str, Any]],
+    min_orders: int = Query(0, ge=0),
+    max_price: Optional[float] = Query(None),
+    min_rating: float = Query(0.0, ge=0, le=5),
+    require_us_shipping: bool = Query(False),
+    top_k: int = Query(20, ge=1, le=1000),
+    repeat: int = Query(5, ge=1, le=50)
+):
+    """벡터화 점수 계산과 기존 제품별 계산의 처리 시간 비교"""
+    # The per-row path is deliberately slow; keep it off the event loop
+    return await asyncio.to_thread(
+        CandidateScoringService.benchmark,
+        products, repeat=repeat, min_orders=min_orders, max_price=max_price,
+        min_rating=min_rating, require_us_shipping=require_us_shipping, top_k=top_k
+    )
+
+@router.post("/transform-batch")
+async def transform_products_batch(
+    products: List[Dict[str, Any]],
+    category: Optional[str] = Query(None, description="제품에 category가 없을 때 적용할 카테고리")
+):
+    """스크래핑한 제품 목록을 가격 규칙(PRICING_RULES)으로 한 번에 Shopify 형식으로 변환"""
+    try:
+        aliexpress_service = AliExpressService()
+        shopify_products = aliexpress_service.transform_products_to_shopify_format(products, category=category)
+        if products and not shopify_products:
+            raise HTTPException(status_code=500, detail="제품 데이터 변환 중 오류가 발생했습니다.")
+        return {
+            "products": shopify_products,
+            "total": len(shopify_products),
+            "skipped": len(products) - len(shopify_products)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        LoggingService.log_error(f"제품 일괄 변환 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail="제품 데이터 변환 중 오류가 발생했습니다.")
+
 @router.get("/product/{product_id}")
 async def get_aliexpress_product_detail(
     product_id: str,
@@ -76,7 +233,12 @@ async def get_aliexpress_product_detail(
     """알리익스프레스 제품 상세 정보 조회"""
     try:
         aliexpress_service = AliExpressService()
-        product_detail = await aliexpress_service.get_product_detail(product_id)
+        product_detail = await aliexpress_cache.get_or_fetch(
+            aliexpress_cache.make_key("product", product_id=product_id),
+            lambda: aliexpress_service.get_product_detail(product_id),
+            ttl=settings.ALIEXPRESS_PRODUCT_CACHE_TTL,
+            stale_ttl=settings.ALIEXPRESS_CACHE_STALE_TTL
+        )
         
         LoggingService.log_info(f"알리익스프레스 제품 상세 조회 완료: {product_id}")
         
@@ -85,35 +247,54 @@ async def get_aliexpress_product_detail(
         LoggingService.log_error(f"알리익스프레스 제품 상세 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail="제품 상세 조회 중 오류가 발생했습니다.")
 
+@router.get("/browser-pool")
+async def get_browser_pool_stats():
+    """Playwright 브라우저 풀 상태 조회"""
+    return browser_pool.get_stats()
+
+@router.get("/scrape-stats")
+async def get_scrape_stats():
+    """스크래핑 작업별 대역폭/렌더링 시간 통계"""
+    return {
+        "lightweight_mode": page_loader.lightweight,
+        "operations": page_loader.stats.summary(),
+        "http_fast_path": fast_path_stats.summary()
+    }
+
+@router.get("/sessions")
+async def get_scrape_session_stats():
+    """스크래핑 세션(User-Agent/프록시) 순환 및 호스트별 제한 상태 조회"""
+    return scrape_sessions.get_stats()
+
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """검색/인기/상세 결과 캐시 적중률 통계"""
+    return aliexpress_cache.get_stats()
+
 @router.post("/import")
 async def import_aliexpress_product(
     product_id: str,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """알리익스프레스 제품을 Shopify에 임포트"""
     try:
         # Check if product already exists
-        existing_product = db.query(Product).filter(
-            Product.source_url.contains(product_id)
-        ).first()
-        
-        if existing_product:
+        if ImportPipeline.imported_product_ids(db, [product_id]):
             raise HTTPException(status_code=400, detail="이미 임포트된 제품입니다.")
         
-        # Add background task for import
-        background_tasks.add_task(
-            import_product_to_shopify,
-            product_id=product_id,
-            db=db
-        )
+        # Record the job, then enqueue it on the task queue
+        job = JobService.create_job(db, "import", item_keys=[product_id], params={"product_ids": [product_id]})
+        task = import_products_task.delay([product_id], job_id=job.id)
+        JobService.attach_task(db, job, task.id)
         
-        LoggingService.log_info(f"알리익스프레스 제품 임포트 시작: {product_id}")
+        LoggingService.log_info(f"알리익스프레스 제품 임포트 시작: {product_id}, 작업 {job.id}")
         
         return {
             "message": "제품 임포트가 시작되었습니다. 백그라운드에서 처리 중입니다.",
             "product_id": product_id,
-            "status": "processing"
+            "job_id": job.id,
+            "status": "queued"
         }
     except HTTPException:
         raise
@@ -124,42 +305,31 @@ async def import_aliexpress_product(
 @router.post("/import-batch")
 async def import_aliexpress_products_batch(
     product_ids: List[str],
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """여러 알리익스프레스 제품을 일괄 임포트"""
     try:
         # Check for existing products
-        existing_products = []
-        new_product_ids = []
-        
-        for product_id in product_ids:
-            existing_product = db.query(Product).filter(
-                Product.source_url.contains(product_id)
-            ).first()
-            
-            if existing_product:
-                existing_products.append(product_id)
-            else:
-                new_product_ids.append(product_id)
+        imported = ImportPipeline.imported_product_ids(db, product_ids)
+        existing_products = [product_id for product_id in product_ids if product_id in imported]
+        new_product_ids = [product_id for product_id in product_ids if product_id not in imported]
         
         if not new_product_ids:
             raise HTTPException(status_code=400, detail="모든 제품이 이미 임포트되어 있습니다.")
         
-        # Add background task for batch import
-        background_tasks.add_task(
-            import_products_batch_to_shopify,
-            product_ids=new_product_ids,
-            db=db
-        )
+        # Record the job, then enqueue it on the task queue
+        job = JobService.create_job(db, "import", item_keys=new_product_ids, params={"product_ids": new_product_ids})
+        task = import_products_task.delay(new_product_ids, job_id=job.id)
+        JobService.attach_task(db, job, task.id)
         
-        LoggingService.log_info(f"알리익스프레스 제품 일괄 임포트 시작: {len(new_product_ids)}개 제품")
+        LoggingService.log_info(f"알리익스프레스 제품 일괄 임포트 시작: {len(new_product_ids)}개 제품, 작업 {job.id}")
         
         return {
             "message": f"{len(new_product_ids)}개 제품의 임포트가 시작되었습니다.",
             "new_products": new_product_ids,
             "existing_products": existing_products,
-            "status": "processing"
+            "job_id": job.id,
+            "status": "queued"
         }
     except HTTPException:
         raise
@@ -169,80 +339,19 @@ async def import_aliexpress_products_batch(
 
 @router.get("/import-status")
 async def get_import_status(
+    limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db)
 ):
-    """임포트 상태 조회"""
+    """임포트 작업 상태 조회 (jobs 테이블 기반)"""
     try:
-        # Get recently imported products
-        recent_imports = db.query(Product).filter(
-            Product.import_source == "aliexpress"
-        ).order_by(Product.created_at.desc()).limit(10).all()
-        
-        result = []
-        for product in recent_imports:
-            result.append({
-                "id": product.id,
-                "title": product.title,
-                "import_source": product.import_source,
-                "source_url": product.source_url,
-                "status": product.status,
-                "created_at": product.created_at.isoformat() if product.created_at else None
-            })
+        recent_jobs = db.query(Job).filter(
+            Job.job_type == "import"
+        ).order_by(Job.created_at.desc()).limit(limit).all()
         
         return {
-            "recent_imports": result,
-            "total_imported": db.query(Product).filter(
-                Product.import_source == "aliexpress"
-            ).count()
+            "recent_jobs": [JobService.to_progress(job) for job in recent_jobs],
+            "running": [job.id for job in recent_jobs if job.status in ("queued", "running", "retrying")]
         }
     except Exception as e:
         LoggingService.log_error(f"임포트 상태 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail="임포트 상태 조회 중 오류가 발생했습니다.")
-
-async def import_product_to_shopify(product_id: str, db: Session):
-    """백그라운드에서 제품을 Shopify에 임포트하는 함수"""
-    try:
-        aliexpress_service = AliExpressService()
-        shopify_service = ShopifyService()
-        
-        # Get product detail from AliExpress
-        product_detail = await aliexpress_service.get_product_detail(product_id)
-        
-        # Transform product data for Shopify
-        shopify_product_data = aliexpress_service.transform_to_shopify_format(product_detail)
-        
-        # Create product in Shopify
-        shopify_product = await shopify_service.create_product(shopify_product_data)
-        
-        # Save to database
-        new_product = Product(
-            shopify_id=shopify_product.get("id"),
-            title=shopify_product_data["title"],
-            description=shopify_product_data.get("description"),
-            price=shopify_product_data.get("price"),
-            vendor=shopify_product_data.get("vendor"),
-            product_type=shopify_product_data.get("product_type"),
-            image_url=shopify_product_data.get("image_url"),
-            images=shopify_product_data.get("images"),
-            import_source="aliexpress",
-            source_url=product_detail.get("url"),
-            source_data=product_detail
-        )
-        
-        db.add(new_product)
-        db.commit()
-        
-        LoggingService.log_info(f"제품 임포트 완료: {product_id} -> Shopify ID: {shopify_product.get('id')}")
-        
-    except Exception as e:
-        LoggingService.log_error(f"제품 임포트 실패: {product_id}, 오류: {str(e)}")
-        db.rollback()
-
-async def import_products_batch_to_shopify(product_ids: List[str], db: Session):
-    """백그라운드에서 여러 제품을 일괄 임포트하는 함수"""
-    for product_id in product_ids:
-        try:
-            await import_product_to_shopify(product_id, db)
-        except Exception as e:
-            LoggingService.log_error(f"일괄 임포트 중 제품 실패: {product_id}, 오류: {str(e)}")
-            continue
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import Dict, Any
 from app.core.database import get_db
 from app.models import product, user, log, sns_content
+from app.services.shopify_rate_limiter import shopify_rate_limiter
 from sqlalchemy import func
 from datetime import datetime, timedelta
 
@@ -101,3 +102,10 @@ async def get_sales_data(db: Session = Depends(get_db)) -> Dict[str, Any]:
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"매출 데이터 조회 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/shopify-rate-limit")
+async def get_shopify_rate_limit() -> Dict[str, Any]:
+    """Shopify API 호출 버킷 점유율 조회"""
+    return {
+        "buckets": shopify_rate_limiter.get_metrics()
+    }
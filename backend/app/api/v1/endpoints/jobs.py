@@ -0,0 +1,112 @@
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.database import get_db
+from app.models.job import Job, JobItem
+from app.services.job_service import JobService, TERMINAL_STATUSES
+from app.services.logging_service import LoggingService
+
+router = APIRouter()
+
+@router.get("/")
+async def get_jobs(
+    job_type: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """작업 목록 조회"""
+    try:
+        query = db.query(Job)
+        
+        if job_type:
+            query = query.filter(Job.job_type == job_type)
+        if status:
+            query = query.filter(Job.status == status)
+        
+        jobs = query.order_by(Job.created_at.desc()).limit(limit).all()
+        return [JobService.to_progress(job) for job in jobs]
+    except Exception as e:
+        LoggingService.log_error(f"작업 목록 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail="작업 목록 조회 중 오류가 발생했습니다.")
+
+@router.get("/{job_id}")
+async def get_job_status(job_id: int, db: Session = Depends(get_db)):
+    """작업 상태 및 진행률 조회 (완료/실패/대기 수, 처리량, ETA)"""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    
+    return JobService.to_progress(job)
+
+@router.get("/{job_id}/items")
+async def get_job_items(
+    job_id: int,
+    status: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """작업 항목별 상태 조회"""
+    try:
+        query = db.query(JobItem).filter(JobItem.job_id == job_id)
+        
+        if status:
+            query = query.filter(JobItem.status == status)
+        
+        items = query.order_by(JobItem.id).offset((page - 1) * limit).limit(limit).all()
+        return [
+            {
+                "item_key": item.item_key,
+                "status": item.status,
+                "error": item.error,
+                "updated_at": item.updated_at.isoformat() if item.updated_at else None
+            } for item in items
+        ]
+    except Exception as e:
+        LoggingService.log_error(f"작업 항목 조회 실패: {job_id}, 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail="작업 항목 조회 중 오류가 발생했습니다.")
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: int,
+    request: Request,
+    interval: float = Query(1.0, ge=0.2, le=10.0)
+):
+    """작업 진행률 SSE 스트림 (변경 시에만 이벤트 전송)"""
+    if await asyncio.to_thread(JobService.get_progress, job_id) is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    
+    async def event_stream():
+        last_payload = None
+        idle = 0.0
+        while not await request.is_disconnected():
+            progress = await asyncio.to_thread(JobService.get_progress, job_id)
+            if progress is None:
+                break
+            
+            payload = json.dumps(progress, ensure_ascii=False)
+            if payload != last_payload:
+                yield f"event: progress\ndata: {payload}\n\n"
+                last_payload = payload
+                idle = 0.0
+            elif idle >= 15:
+                # Keep proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                idle = 0.0
+            
+            if progress["status"] in TERMINAL_STATUSES:
+                yield f"event: done\ndata: {payload}\n\n"
+                break
+            
+            await asyncio.sleep(interval)
+            idle += interval
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
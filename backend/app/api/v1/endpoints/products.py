@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
 from app.models.product import Product
 from app.services.shopify_service import ShopifyService
 from app.services.logging_service import LoggingService
+from app.services.job_service import JobService
+from app.core.config import settings
+from app.services.openai_service import OpenAIService
+from app.services.openai_batch_service import OpenAIBatchService
+from app.services.product_enrichment_service import ProductEnrichmentService
+from app.tasks.sync_tasks import sync_shopify_products_task, bulk_export_products_task
+from app.tasks.generation_tasks import openai_batch_task
 
 router = APIRouter()
 
@@ -18,7 +25,7 @@ async def get_products(
     """제품 목록 조회 (페이지네이션 지원)"""
     try:
         offset = (page - 1) * limit
-        query = db.query(Product)
+        query = db.query(Product).filter(Product.deleted_at.is_(None))
         
         if search:
             query = query.filter(Product.title.contains(search))
@@ -135,83 +142,127 @@ async def delete_product(
         LoggingService.log_error(f"제품 삭제 실패: {str(e)}")
         raise HTTPException(status_code=500, detail="제품 삭제 중 오류가 발생했습니다.")
 
-@router.post("/sync-shopify")
-async def sync_shopify_products(db: Session = Depends(get_db)):
-    """Shopify에서 제품 동기화 (더미 데이터)"""
+@router.post("/{product_id}/enrich")
+async def enrich_product(
+    product_id: int,
+    platforms: List[str] = Query(["instagram"], description="SNS 콘텐츠를 생성할 플랫폼"),
+    content_type: str = Query("post", description="SNS 콘텐츠 유형"),
+    use_cache: bool = Query(True, description="같은 제품 정보로 생성한 결과가 있으면 재사용"),
+    db: Session = Depends(get_db)
+):
+    """제품 설명/SEO 메타 정보/SNS 콘텐츠/감정 분석을 한 번의 AI 호출로 생성하고 함께 저장"""
     try:
-        from datetime import datetime
-        
-        # 더미 제품 데이터
-        dummy_products = [
-            {
-                "shopify_id": 1,
-                "title": "스마트 홈 가전",
-                "description": "최신 기술로 만든 스마트 홈 가전 제품입니다.",
-                "price": 299.99,
-                "status": "active",
-                "image_url": "https://via.placeholder.com/300x300?text=Smart+Home",
-                "vendor": "TechHome",
-                "product_type": "Electronics",
-                "tags": "smart,home,automation",
-                "meta_title": "스마트 홈 가전 - 최신 기술",
-                "meta_description": "최신 기술로 만든 스마트 홈 가전 제품을 만나보세요.",
-                "inventory_quantity": 50,
-                "handle": "smart-home-appliance",
-                "import_source": "manual",
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
-            },
-            {
-                "shopify_id": 2,
-                "title": "무선 이어폰",
-                "description": "고음질 무선 이어폰으로 음악을 즐겨보세요.",
-                "price": 89.99,
-                "status": "active",
-                "image_url": "https://via.placeholder.com/300x300?text=Wireless+Earbuds",
-                "vendor": "AudioTech",
-                "product_type": "Electronics",
-                "tags": "wireless,audio,music",
-                "meta_title": "무선 이어폰 - 고음질",
-                "meta_description": "고음질 무선 이어폰으로 음악을 즐겨보세요.",
-                "inventory_quantity": 100,
-                "handle": "wireless-earbuds",
-                "import_source": "manual",
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
-            },
-            {
-                "shopify_id": 3,
-                "title": "스마트워치",
-                "description": "건강 모니터링과 알림 기능이 있는 스마트워치입니다.",
-                "price": 199.99,
-                "status": "active",
-                "image_url": "https://via.placeholder.com/300x300?text=Smartwatch",
-                "vendor": "WearableTech",
-                "product_type": "Electronics",
-                "tags": "smartwatch,health,fitness",
-                "meta_title": "스마트워치 - 건강 모니터링",
-                "meta_description": "건강 모니터링과 알림 기능이 있는 스마트워치입니다.",
-                "inventory_quantity": 75,
-                "handle": "smartwatch",
-                "import_source": "manual",
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
-            }
-        ]
+        enrichment_service = ProductEnrichmentService(db)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        product = db.query(Product).filter(Product.id == product_id).first()
+        if not product:
+            raise HTTPException(status_code=404, detail="제품을 찾을 수 없습니다.")
         
-        # 기존 제품 삭제
-        db.query(Product).delete()
+        result = await enrichment_service.enrich(
+            product, platforms, content_type, use_cache=None if use_cache else False
+        )
+        return {
+            "product_id": product_id,
+            **result,
+            "message": "제품 콘텐츠가 성공적으로 생성되었습니다."
+        }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        LoggingService.log_error(f"제품 통합 콘텐츠 생성 실패: {str(e)}")
+        raise HTTPException(status_code=502, detail="AI 응답 형식이 올바르지 않습니다. 다시 시도해주세요.")
+    except Exception as e:
+        LoggingService.log_error(f"제품 통합 콘텐츠 생성 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail="제품 콘텐츠 생성 중 오류가 발생했습니다.")
+
+@router.post("/sync-shopify")
+async def sync_shopify_products(
+    full: bool = Query(False, description="전체 동기화 여부 (기본: 변경분만)"),
+    db: Session = Depends(get_db)
+):
+    """Shopify에서 제품 동기화 (updated_at 기준 증분 동기화 작업 등록)"""
+    try:
+        # Fail fast on missing Shopify settings before queueing the job
+        ShopifyService()
+        job = JobService.create_job(db, "sync", params={"full": full})
+        task = sync_shopify_products_task.delay(full=full, job_id=job.id)
+        JobService.attach_task(db, job, task.id)
         
-        # 새 제품 추가
-        for product_data in dummy_products:
-            new_product = Product(**product_data)
-            db.add(new_product)
+        LoggingService.log_info(f"Shopify 제품 동기화 작업 등록: {job.id}")
+        return {
+            "message": "제품 동기화가 시작되었습니다. 백그라운드에서 처리 중입니다.",
+            "job_id": job.id,
+            "full": full,
+            "status": "queued"
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        LoggingService.log_error(f"제품 동기화 시작 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail="제품 동기화 중 오류가 발생했습니다.")
+
+@router.post("/bulk-export")
+async def bulk_export_shopify_products(db: Session = Depends(get_db)):
+    """Shopify GraphQL bulk operation으로 전체 카탈로그 동기화"""
+    try:
+        # Fail fast on missing Shopify settings before queueing the job
+        ShopifyService()
+        job = JobService.create_job(db, "bulk_export")
+        task = bulk_export_products_task.delay(job_id=job.id)
+        JobService.attach_task(db, job, task.id)
         
-        db.commit()
-        LoggingService.log_info(f"더미 제품 동기화 완료: {len(dummy_products)}개 제품")
+        LoggingService.log_info(f"Shopify bulk export 동기화 시작: {job.id}")
+        return {
+            "message": "Shopify 전체 카탈로그 bulk export가 시작되었습니다. 백그라운드에서 처리 중입니다.",
+            "job_id": job.id,
+            "status": "queued"
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        LoggingService.log_error(f"Shopify bulk export 시작 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail="bulk export 시작 중 오류가 발생했습니다.")
+
+@router.post("/ai-batch")
+async def start_openai_batch(
+    operation: str = Query(..., description="생성할 항목 (description: 제품 설명, seo: 메타 타이틀/설명)"),
+    product_ids: Optional[List[int]] = Body(None, description="대상 제품 ID (지정하지 않으면 필터 사용)"),
+    product_type: Optional[str] = Query(None, description="카테고리(product_type)"),
+    import_source: Optional[str] = Query(None, description="가져온 경로 (예: aliexpress)"),
+    limit: int = Query(settings.OPENAI_BATCH_MAX_REQUESTS, ge=1, le=settings.OPENAI_BATCH_MAX_REQUESTS),
+    db: Session = Depends(get_db)
+):
+    """OpenAI Batch API로 제품 설명/SEO 메타 정보 일괄 재작성 (오프라인, 최대 24시간 소요)"""
+    if operation not in OpenAIBatchService.OPERATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 작업입니다: {operation} (사용 가능: {', '.join(OpenAIBatchService.OPERATIONS)})"
+        )
+    try:
+        # Fail fast on missing OpenAI settings before queueing the job
+        OpenAIService()
+        params = {
+            "operation": operation,
+            "product_ids": product_ids,
+            "product_type": product_type,
+            "import_source": import_source,
+            "limit": limit
+        }
+        job = JobService.create_job(db, "openai_batch", params=params)
+        task = openai_batch_task.delay(**params, job_id=job.id)
+        JobService.attach_task(db, job, task.id)
         
-        return {"message": f"{len(dummy_products)}개의 제품이 동기화되었습니다."}
+        LoggingService.log_info(f"OpenAI 배치 작업 등록: {job.id}, {operation}")
+        return {
+            "message": "OpenAI 배치 작업이 시작되었습니다. 완료되면 제품 정보가 일괄 업데이트됩니다.",
+            "job_id": job.id,
+            "status": "queued"
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        db.rollback()
-        LoggingService.log_error(f"제품 동기화 실패: {str(e)}")
-        raise HTTPException(status_code=500, detail="제품 동기화 중 오류가 발생했습니다.")
+        LoggingService.log_error(f"OpenAI 배치 작업 시작 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail="OpenAI 배치 작업 시작 중 오류가 발생했습니다.")
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import json
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
 from app.models.sns_content import SNSContent
 from app.models.product import Product
-from app.services.openai_service import OpenAIService
+from app.services.sns_service import SNSContentService
+from app.services.cache_service import llm_cache
+from app.services.llm_rate_limiter import llm_rate_limiter
+from app.services.job_service import JobService
+from app.tasks.generation_tasks import generate_sns_content_task
 from app.services.logging_service import LoggingService
 
 router = APIRouter()
@@ -56,6 +63,7 @@ async def generate_sns_content(
     product_id: int,
     platform: str,
     content_type: str = "post",
+    async_job: bool = Query(False, description="작업 큐에서 비동기로 생성"),
     db: Session = Depends(get_db)
 ):
     """AI를 사용하여 SNS 콘텐츠 생성"""
@@ -65,57 +73,21 @@ async def generate_sns_content(
         if not product:
             raise HTTPException(status_code=404, detail="제품을 찾을 수 없습니다.")
         
-        # Generate content using OpenAI
-        openai_service = OpenAIService()
-        
-        prompt = f"""
-        제품 정보:
-        - 제품명: {product.title}
-        - 설명: {product.description}
-        - 가격: ${product.price}
-        - 카테고리: {product.product_type}
-        
-        {platform}용 {content_type} 콘텐츠를 생성해주세요.
-        다음을 포함해주세요:
-        1. 매력적인 제목
-        2. 제품을 홍보하는 설명
-        3. 관련 해시태그 (최대 20개)
-        4. 고객이 행동하도록 유도하는 문구
-        
-        한국어로 작성해주세요.
-        """
-        
-        generated_content = await openai_service.generate_content(prompt)
-        
-        # Parse generated content
-        lines = generated_content.split('\n')
-        title = ""
-        description = ""
-        hashtags = ""
-        
-        for line in lines:
-            if line.strip().startswith('제목:') or line.strip().startswith('Title:'):
-                title = line.split(':', 1)[1].strip()
-            elif line.strip().startswith('설명:') or line.strip().startswith('Description:'):
-                description = line.split(':', 1)[1].strip()
-            elif '#' in line:
-                hashtags = line.strip()
-        
-        # Save to database
-        sns_content = SNSContent(
-            product_id=product_id,
-            platform=platform,
-            content_type=content_type,
-            title=title,
-            description=description,
-            hashtags=hashtags,
-            generated_content=generated_content,
-            image_urls=[product.image_url] if product.image_url else []
-        )
+        if async_job:
+            job = JobService.create_job(db, "sns_generation", params={
+                "product_id": product_id, "platform": platform, "content_type": content_type
+            })
+            task = generate_sns_content_task.delay(product_id, platform, content_type, job_id=job.id)
+            JobService.attach_task(db, job, task.id)
+            return {
+                "message": "SNS 콘텐츠 생성이 시작되었습니다.",
+                "job_id": job.id,
+                "status": "queued"
+            }
         
-        db.add(sns_content)
-        db.commit()
-        db.refresh(sns_content)
+        # Generate content using OpenAI and save
+        sns_service = SNSContentService()
+        sns_content = await sns_service.generate_for_product(db, product, platform, content_type)
         
         LoggingService.log_info(f"SNS 콘텐츠 생성 완료: 제품 {product_id}, 플랫폼 {platform}")
         
@@ -136,6 +108,59 @@ async def generate_sns_content(
         LoggingService.log_error(f"SNS 콘텐츠 생성 실패: {str(e)}")
         raise HTTPException(status_code=500, detail="SNS 콘텐츠 생성 중 오류가 발생했습니다.")
 
+@router.post("/generate-batch")
+async def generate_sns_content_batch(
+    platforms: List[str] = Body(..., min_length=1, description="플랫폼 목록 (예: instagram, tiktok)"),
+    content_types: List[str] = Body(["post"], min_length=1, description="콘텐츠 유형 목록"),
+    product_ids: Optional[List[int]] = Body(None, description="대상 제품 ID (지정하지 않으면 필터 사용)"),
+    search: Optional[str] = Query(None, description="제품명 검색"),
+    product_type: Optional[str] = Query(None, description="카테고리(product_type)"),
+    status: Optional[str] = Query(None, description="제품 상태"),
+    import_source: Optional[str] = Query(None, description="가져온 경로 (예: aliexpress)"),
+    limit: int = Query(100, ge=1, le=settings.SNS_BATCH_MAX_PRODUCTS),
+    concurrency: Optional[int] = Query(None, ge=1, le=100, description="동시 생성 수")
+):
+    """필터에 맞는 제품 × 플랫폼 × 콘텐츠 유형 조합의 SNS 콘텐츠를 일괄 생성하고 진행 상황을 NDJSON으로 전송"""
+    sns_service = SNSContentService()
+    
+    def select_products(db: Session) -> List[Product]:
+        query = db.query(Product).filter(Product.deleted_at.is_(None))
+        if product_ids:
+            query = query.filter(Product.id.in_(product_ids))
+        if search:
+            query = query.filter(Product.title.contains(search))
+        if product_type:
+            query = query.filter(Product.product_type == product_type)
+        if status:
+            query = query.filter(Product.status == status)
+        if import_source:
+            query = query.filter(Product.import_source == import_source)
+        return query.order_by(Product.id).limit(limit).all()
+    
+    async def progress_stream():
+        # The stream outlives the request's dependencies, so it owns its session
+        db = SessionLocal()
+        batch = None
+        completed = 0
+        try:
+            batch = sns_service.generate_batch(db, select_products(db), platforms, content_types, concurrency)
+            async for progress in batch:
+                completed = progress["completed"]
+                yield json.dumps(progress, ensure_ascii=False) + "\n"
+        except Exception as e:
+            db.rollback()
+            LoggingService.log_error(f"일괄 SNS 콘텐츠 생성 실패: {str(e)}")
+            yield json.dumps({"done": True, "completed": completed, "error": "SNS 콘텐츠 일괄 생성 중 오류가 발생했습니다."}, ensure_ascii=False) + "\n"
+        finally:
+            # On client disconnect, let the batch save finished generations before the session closes
+            try:
+                if batch is not None:
+                    await batch.aclose()
+            finally:
+                db.close()
+    
+    return StreamingResponse(progress_stream(), media_type="application/x-ndjson")
+
 @router.put("/content/{content_id}")
 async def update_sns_content(
     content_id: int,
@@ -181,47 +206,17 @@ async def regenerate_sns_content(
             raise HTTPException(status_code=404, detail="제품을 찾을 수 없습니다.")
         
         # Regenerate content using OpenAI
-        openai_service = OpenAIService()
-        
-        prompt = f"""
-        제품 정보:
-        - 제품명: {product.title}
-        - 설명: {product.description}
-        - 가격: ${product.price}
-        - 카테고리: {product.product_type}
-        
-        {sns_content.platform}용 {sns_content.content_type} 콘텐츠를 다시 생성해주세요.
-        이전 콘텐츠와 다른 스타일로 작성해주세요.
-        
-        다음을 포함해주세요:
-        1. 매력적인 제목
-        2. 제품을 홍보하는 설명
-        3. 관련 해시태그 (최대 20개)
-        4. 고객이 행동하도록 유도하는 문구
-        
-        한국어로 작성해주세요.
-        """
-        
-        generated_content = await openai_service.generate_content(prompt)
-        
-        # Parse generated content
-        lines = generated_content.split('\n')
-        title = ""
-        description = ""
-        hashtags = ""
-        
-        for line in lines:
-            if line.strip().startswith('제목:') or line.strip().startswith('Title:'):
-                title = line.split(':', 1)[1].strip()
-            elif line.strip().startswith('설명:') or line.strip().startswith('Description:'):
-                description = line.split(':', 1)[1].strip()
-            elif '#' in line:
-                hashtags = line.strip()
+        sns_service = SNSContentService()
+        generated_content = await sns_service.openai_service.generate_content(
+            sns_service.build_prompt(product, sns_content.platform, sns_content.content_type, regenerate=True),
+            use_cache=False
+        )
+        parsed = sns_service.parse_generated_content(generated_content)
         
         # Update content
-        sns_content.title = title
-        sns_content.description = description
-        sns_content.hashtags = hashtags
+        sns_content.title = parsed["title"]
+        sns_content.description = parsed["description"]
+        sns_content.hashtags = parsed["hashtags"]
         sns_content.generated_content = generated_content
         
         db.commit()
@@ -242,6 +237,16 @@ async def regenerate_sns_content(
         LoggingService.log_error(f"SNS 콘텐츠 재생성 실패: {str(e)}")
         raise HTTPException(status_code=500, detail="SNS 콘텐츠 재생성 중 오류가 발생했습니다.")
 
+@router.get("/cache-stats")
+async def get_llm_cache_stats():
+    """LLM 생성 결과 캐시 적중률 통계"""
+    return llm_cache.get_stats()
+
+@router.get("/rate-limit")
+async def get_llm_rate_limit():
+    """OpenAI 분당 요청/토큰 예산 사용 현황"""
+    return llm_rate_limiter.snapshot()
+
 @router.get("/platforms")
 async def get_supported_platforms():
     """지원되는 SNS 플랫폼 목록"""
@@ -0,0 +1,48 @@
+import base64
+import hashlib
+import hmac
+import json
+from fastapi import APIRouter, HTTPException, Request, Header
+from typing import Optional
+from app.core.config import settings
+from app.services.webhook_buffer import webhook_buffer, SUPPORTED_TOPICS
+
+router = APIRouter()
+
+def verify_shopify_hmac(body: bytes, hmac_header: Optional[str]) -> bool:
+    """Shopify 웹훅 HMAC-SHA256 서명 검증"""
+    if not settings.SHOPIFY_WEBHOOK_SECRET or not hmac_header:
+        return False
+    digest = hmac.new(settings.SHOPIFY_WEBHOOK_SECRET.encode("utf-8"), body, hashlib.sha256).digest()
+    return hmac.compare_digest(base64.b64encode(digest).decode("utf-8"), hmac_header)
+
+@router.post("/shopify")
+async def receive_shopify_webhook(
+    request: Request,
+    x_shopify_topic: str = Header(...),
+    x_shopify_hmac_sha256: Optional[str] = Header(None),
+    x_shopify_webhook_id: Optional[str] = Header(None)
+):
+    """Shopify 웹훅 수신 (검증 후 즉시 응답, DB 기록은 버퍼에서 일괄 처리)"""
+    body = await request.body()
+    if not verify_shopify_hmac(body, x_shopify_hmac_sha256):
+        raise HTTPException(status_code=401, detail="웹훅 서명이 올바르지 않습니다.")
+    
+    if x_shopify_topic not in SUPPORTED_TOPICS:
+        return {"status": "ignored", "topic": x_shopify_topic}
+    
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="웹훅 본문이 올바른 JSON이 아닙니다.")
+    
+    # A full queue returns 503 so Shopify redelivers the webhook later
+    if not webhook_buffer.submit(x_shopify_topic, payload, webhook_id=x_shopify_webhook_id):
+        raise HTTPException(status_code=503, detail="웹훅 처리 대기열이 가득 찼습니다.")
+    
+    return {"status": "accepted", "topic": x_shopify_topic}
+
+@router.get("/stats")
+async def get_webhook_stats():
+    """웹훅 버퍼 처리 통계"""
+    return webhook_buffer.stats
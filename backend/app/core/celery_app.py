@@ -0,0 +1,43 @@
+from celery import Celery
+from app.core.config import settings
+
+# Celery application (workers: celery -A app.core.celery_app worker -Q imports,sync,generation)
+celery_app = Celery(
+    "shopify_automation",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=[
+        "app.tasks.import_tasks",
+        "app.tasks.sync_tasks",
+        "app.tasks.generation_tasks",
+        "app.tasks.trending_tasks"
+    ]
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    timezone="UTC",
+    enable_utc=True,
+    # Report STARTED and keep unfinished jobs on the broker if a worker dies
+    task_track_started=True,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    result_expires=settings.CELERY_RESULT_EXPIRES,
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_routes={
+        "app.tasks.import_tasks.*": {"queue": "imports"},
+        "app.tasks.sync_tasks.*": {"queue": "sync"},
+        "app.tasks.generation_tasks.*": {"queue": "generation"},
+        "app.tasks.trending_tasks.*": {"queue": "sync"}
+    },
+    # Periodic jobs (scheduler: celery -A app.core.celery_app beat)
+    beat_schedule={
+        "crawl-trending-products": {
+            "task": "app.tasks.trending_tasks.crawl_trending_task",
+            "schedule": settings.TRENDING_CRAWL_INTERVAL
+        }
+    }
+)
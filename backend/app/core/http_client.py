@@ -0,0 +1,191 @@
+import asyncio
+import importlib.util
+from typing import AsyncIterator, Dict, List, Optional
+import httpx
+from loguru import logger
+from app.core.config import settings
+
+# Shared Shopify client (one per event loop)
+_shopify_client: Optional[httpx.AsyncClient] = None
+_shopify_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Shared OpenAI client (one per event loop)
+_openai_client: Optional[httpx.AsyncClient] = None
+_openai_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Shared clients for plain-HTTP scraping, one per proxy (None = direct), bound to one event loop
+_scraper_clients: Dict[Optional[str], httpx.AsyncClient] = {}
+_scraper_clients_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Every client created on a loop, closed when that loop shuts down (replaced clients included)
+_loop_clients: Dict[asyncio.AbstractEventLoop, List[httpx.AsyncClient]] = {}
+_loop_closers: Dict[asyncio.AbstractEventLoop, AsyncIterator[None]] = {}
+
+
+async def _close_loop_clients(loop: asyncio.AbstractEventLoop) -> AsyncIterator[None]:
+    """루프 종료 시 그 루프에서 만든 클라이언트 종료 (shutdown_asyncgens에서 실행되는 비동기 제너레이터)"""
+    try:
+        yield
+    finally:
+        _loop_closers.pop(loop, None)
+        for client in _loop_clients.pop(loop, []):
+            if client.is_closed:
+                continue
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"HTTP 클라이언트 종료 실패: {str(e)}")
+
+
+def _track(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> httpx.AsyncClient:
+    """클라이언트를 만든 루프가 종료될 때 함께 닫히도록 등록"""
+    if loop is None:
+        return client
+    if loop not in _loop_clients:
+        _loop_clients[loop] = []
+        # asyncio.run() finalizes async generators on the loop before closing it, so the
+        # connections are closed on the loop that owns them even if the client was replaced
+        closer = _loop_closers[loop] = _close_loop_clients(loop)
+        # Registers the generator with the running loop; nothing is awaited before the yield
+        try:
+            closer.__anext__().send(None)
+        except StopIteration:
+            pass
+    # Drop clients already closed by close_http_clients() so a long-lived loop does not accumulate them
+    _loop_clients[loop] = [tracked for tracked in _loop_clients[loop] if not tracked.is_closed] + [client]
+    return client
+
+
+def _http2_available() -> bool:
+    """h2 패키지 설치 여부 확인"""
+    return importlib.util.find_spec("h2") is not None
+
+
+def _build_shopify_client() -> httpx.AsyncClient:
+    """Shopify용 커넥션 풀 클라이언트 생성"""
+    http2 = settings.SHOPIFY_HTTP2
+    if http2 and not _http2_available():
+        logger.warning("h2 패키지가 없어 HTTP/1.1로 Shopify 클라이언트를 생성합니다.")
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.SHOPIFY_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SHOPIFY_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.SHOPIFY_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(
+            settings.SHOPIFY_READ_TIMEOUT,
+            connect=settings.SHOPIFY_CONNECT_TIMEOUT
+        )
+    )
+
+
+def get_shopify_client() -> httpx.AsyncClient:
+    """공유 Shopify HTTP 클라이언트 반환 (없으면 생성)"""
+    global _shopify_client, _shopify_client_loop
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    # Connections are bound to the loop they were opened on, so a client created
+    # on another loop (e.g. a previous asyncio.run() call) cannot be reused.
+    if _shopify_client is None or _shopify_client.is_closed or _shopify_client_loop is not loop:
+        _shopify_client = _track(_build_shopify_client(), loop)
+        _shopify_client_loop = loop
+
+    return _shopify_client
+
+
+def _build_scraper_client(proxy: Optional[str] = None) -> httpx.AsyncClient:
+    """스크래핑용 커넥션 풀 클라이언트 생성"""
+    return httpx.AsyncClient(
+        proxies=proxy,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=settings.SCRAPER_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SCRAPER_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        timeout=httpx.Timeout(settings.SCRAPER_HTTP_TIMEOUT)
+    )
+
+
+def get_scraper_client(proxy: Optional[str] = None) -> httpx.AsyncClient:
+    """프록시별 공유 스크래핑 HTTP 클라이언트 반환 (없으면 생성)"""
+    global _scraper_clients, _scraper_clients_loop
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if _scraper_clients_loop is not loop:
+        _scraper_clients = {}
+        _scraper_clients_loop = loop
+
+    client = _scraper_clients.get(proxy)
+    if client is None or client.is_closed:
+        client = _scraper_clients[proxy] = _track(_build_scraper_client(proxy), loop)
+    return client
+
+
+def _build_openai_client() -> httpx.AsyncClient:
+    """OpenAI API용 커넥션 풀 클라이언트 생성"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        timeout=httpx.Timeout(
+            settings.OPENAI_TIMEOUT,
+            connect=settings.OPENAI_CONNECT_TIMEOUT
+        )
+    )
+
+
+def get_openai_http_client() -> httpx.AsyncClient:
+    """공유 OpenAI HTTP 클라이언트 반환 (없으면 생성)"""
+    global _openai_client, _openai_client_loop
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if _openai_client is None or _openai_client.is_closed or _openai_client_loop is not loop:
+        _openai_client = _track(_build_openai_client(), loop)
+        _openai_client_loop = loop
+
+    return _openai_client
+
+
+async def init_http_clients():
+    """애플리케이션 시작 시 공유 HTTP 클라이언트 생성"""
+    get_shopify_client()
+    get_scraper_client()
+    get_openai_http_client()
+
+
+async def close_http_clients():
+    """애플리케이션 종료 시 공유 HTTP 클라이언트 종료"""
+    global _shopify_client, _shopify_client_loop, _scraper_clients, _scraper_clients_loop
+    global _openai_client, _openai_client_loop
+
+    if _shopify_client is not None and not _shopify_client.is_closed:
+        await _shopify_client.aclose()
+    _shopify_client = None
+    _shopify_client_loop = None
+
+    for client in _scraper_clients.values():
+        if not client.is_closed:
+            await client.aclose()
+    _scraper_clients = {}
+    _scraper_clients_loop = None
+
+    if _openai_client is not None and not _openai_client.is_closed:
+        await _openai_client.aclose()
+    _openai_client = None
+    _openai_client_loop = None
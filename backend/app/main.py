@@ -6,6 +6,9 @@ from dotenv import load_dotenv
 
 from app.core.config import settings
 from app.core.database import engine
+from app.core.http_client import init_http_clients, close_http_clients
+from app.services.webhook_buffer import webhook_buffer
+from app.services.browser_pool import browser_pool
 from app.models import base
 from app.api.v1.api import api_router
 
@@ -38,6 +41,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def startup_event():
+    """공유 리소스 초기화"""
+    await init_http_clients()
+    webhook_buffer.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """공유 리소스 정리"""
+    await webhook_buffer.stop()
+    await browser_pool.close()
+    await close_http_clients()
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
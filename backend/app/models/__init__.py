@@ -3,6 +3,9 @@ from .product import Product
 from .user import User
 from .log import Log
 from .sns_content import SNSContent
+from .sync_state import ShopifySyncState
+from .job import Job, JobItem
+from .trending_snapshot import TrendingSnapshot
 
 __all__ = [
     "Base",
@@ -10,5 +13,9 @@ __all__ = [
     "Product",
     "User",
     "Log",
-    "SNSContent"
+    "SNSContent",
+    "ShopifySyncState",
+    "Job",
+    "JobItem",
+    "TrendingSnapshot"
 ]
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, String, Text, JSON, Integer, DateTime, Index
+from app.models.base import BaseModel
+
+class Job(BaseModel):
+    """백그라운드 작업 모델"""
+    __tablename__ = "jobs"
+    
+    job_type = Column(String, nullable=False, index=True)  # import, sync, bulk_export, sns_generation, trending_crawl, openai_batch
+    status = Column(String, default="queued", index=True)  # queued, running, retrying, completed, failed
+    task_id = Column(String, index=True)  # Celery task ID
+    
+    # Item counters (kept on the job row so progress reads are a single lookup)
+    total_items = Column(Integer, default=0)
+    done_items = Column(Integer, default=0)
+    failed_items = Column(Integer, default=0)
+    
+    params = Column(JSON)
+    result = Column(JSON)
+    error = Column(Text)
+    
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+class JobItem(BaseModel):
+    """작업 항목별 상태 모델"""
+    __tablename__ = "job_items"
+    __table_args__ = (
+        Index("ix_job_items_job_id_item_key", "job_id", "item_key"),
+    )
+    
+    job_id = Column(Integer, nullable=False, index=True)
+    item_key = Column(String, nullable=False)  # e.g. AliExpress product ID
+    status = Column(String, default="pending")  # pending, done, failed
+    error = Column(Text)
+    result = Column(JSON)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Float, Boolean, JSON, Integer
+from sqlalchemy import Column, String, Text, Float, Boolean, JSON, Integer, DateTime
 from app.models.base import BaseModel
 
 class Product(BaseModel):
@@ -20,6 +20,9 @@ class Product(BaseModel):
     meta_title = Column(String)
     meta_description = Column(Text)
     
+    # AI enrichment results not stored in dedicated columns (keywords, sentiment)
+    ai_analysis = Column(JSON)
+    
     # Images
     image_url = Column(String)
     images = Column(JSON)  # Store multiple images as JSON
@@ -38,5 +41,9 @@ class Product(BaseModel):
     
     # Import source
     import_source = Column(String)  # "aliexpress", "manual", etc.
+    source_id = Column(String, index=True)  # Product ID on the source site (e.g. AliExpress item ID)
     source_url = Column(String)
     source_data = Column(JSON)  # Store original source data
+    
+    # Soft delete (set when the product disappears from Shopify)
+    deleted_at = Column(DateTime, index=True)
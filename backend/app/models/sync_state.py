@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, Integer, DateTime
+from app.models.base import BaseModel
+
+class ShopifySyncState(BaseModel):
+    """쇼핑몰별 Shopify 동기화 상태 모델"""
+    __tablename__ = "shopify_sync_states"
+    
+    shop_url = Column(String, unique=True, index=True, nullable=False)
+    
+    # High-water mark: newest Shopify updated_at seen so far (UTC)
+    last_updated_at = Column(DateTime)
+    last_synced_at = Column(DateTime)
+    last_full_sync_at = Column(DateTime)
+    
+    # Last run summary
+    last_inserted = Column(Integer, default=0)
+    last_updated = Column(Integer, default=0)
+    last_deleted = Column(Integer, default=0)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, JSON, Integer, DateTime, Index
+from app.models.base import BaseModel
+
+class TrendingSnapshot(BaseModel):
+    """카테고리별 인기 제품 스냅샷 모델"""
+    __tablename__ = "trending_snapshots"
+    __table_args__ = (
+        # Latest / as-of lookups are a single index seek per category
+        Index("ix_trending_snapshots_category_captured_at", "category", "captured_at"),
+    )
+
+    category = Column(String, nullable=False)
+    captured_at = Column(DateTime, nullable=False)
+    product_count = Column(Integer, default=0)
+    products = Column(JSON)  # Ranked product cards as scraped
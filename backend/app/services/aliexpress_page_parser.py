@@ -0,0 +1,247 @@
+import json
+import re
+from typing import Any, Dict, Iterator, Optional
+from bs4 import BeautifulSoup
+
+# Script assignments that carry the server-rendered product state
+_EMBEDDED_STATE_MARKERS = ("window.runParams", "window._d_c_.DCData", "window.__INIT_DATA__")
+_DATA_KEY_PATTERN = re.compile(r'["\']?data["\']?\s*:\s*{')
+# Anti-bot interstitials: slider captcha ("punish"/"_____tmd_____") and forced login redirects
+_BLOCKED_URL_MARKERS = ("_____tmd_____", "punish", "captcha", "login.aliexpress")
+_BLOCKED_PAGE_MARKERS = ("_____tmd_____", "/punish", "x5secdata", "baxia-punish")
+# "No results" notices on search listings (an empty page, as opposed to one that failed to render)
+_EMPTY_LISTING_MARKERS = ("did not match any products", "no matching results", "no results found")
+
+
+def _get(data: Any, *path, default=None):
+    """중첩 dict 안전 조회"""
+    for key in path:
+        if not isinstance(data, dict):
+            return default
+        data = data.get(key)
+    return default if data is None else data
+
+
+def _decode_object_at(text: str, start: int) -> Optional[Dict]:
+    """text[start]에서 시작하는 JSON 객체 디코딩"""
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text, start)
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def iter_embedded_states(html: str) -> Iterator[Dict]:
+    """스크립트 태그에 포함된 제품 상태 JSON 후보 추출"""
+    for marker in _EMBEDDED_STATE_MARKERS:
+        position = html.find(marker)
+        if position < 0:
+            continue
+
+        # runParams is a JS object literal whose "data" member is plain JSON
+        match = _DATA_KEY_PATTERN.search(html, position, position + 2000)
+        if match:
+            state = _decode_object_at(html, match.end() - 1)
+            if state:
+                yield state
+
+        brace = html.find("{", position)
+        if brace >= 0:
+            state = _decode_object_at(html, brace)
+            if state:
+                yield state
+
+
+def _parse_state(state: Dict, product_id: str, url: str) -> Optional[Dict]:
+    """임베디드 상태(JSON)를 상세 정보 형식으로 변환"""
+    title = _get(state, "titleModule", "subject") or _get(state, "productInfoComponent", "subject")
+    if not title:
+        return None
+
+    price = (
+        _get(state, "priceModule", "formatedActivityPrice")
+        or _get(state, "priceModule", "formatedPrice")
+        or _get(state, "priceComponent", "discountPrice", "minActivityAmount", "formatedAmount")
+        or _get(state, "priceComponent", "origPrice", "minAmount", "formatedAmount")
+        or ""
+    )
+    images = _get(state, "imageModule", "imagePathList") or _get(state, "imageComponent", "imagePathList") or []
+
+    sku_names = {}
+    for prop in _get(state, "skuModule", "productSKUPropertyList", default=[]):
+        for value in prop.get("skuPropertyValues", []):
+            sku_names[str(value.get("propertyValueId"))] = value.get("propertyValueDisplayName") or value.get("propertyValueName")
+
+    variants = []
+    for sku in _get(state, "skuModule", "skuPriceList", default=[]):
+        value_ids = [part for part in str(sku.get("skuPropIds", "")).split(",") if part]
+        name = " / ".join(sku_names.get(value_id, value_id) for value_id in value_ids) or "Default"
+        variants.append({
+            "name": name,
+            "price": _get(sku, "skuVal", "skuActivityAmount", "formatedAmount")
+                     or _get(sku, "skuVal", "skuAmount", "formatedAmount")
+                     or ""
+        })
+
+    shipping_parts = []
+    for option in _get(state, "shippingModule", "generalFreightInfo", "originalLayoutResultList", default=[]):
+        content = _get(option, "bizData", "deliveryProviderName")
+        ship_to = _get(option, "bizData", "shipToCode")
+        if content:
+            shipping_parts.append(f"{content}, ships to {ship_to}" if ship_to else content)
+    if not shipping_parts:
+        ship_to = _get(state, "shippingModule", "regionCountryName")
+        if ship_to:
+            shipping_parts.append(f"ships to {ship_to}")
+
+    rating = _get(state, "titleModule", "feedbackRating", "averageStar", default="")
+    reviews = _get(state, "titleModule", "feedbackRating", "totalValidNum", default="")
+    orders = _get(state, "titleModule", "tradeCount", default="")
+
+    return {
+        "id": product_id,
+        "title": str(title).strip(),
+        "price": str(price).strip(),
+        "description": str(_get(state, "pageModule", "description", default="")).strip(),
+        "images": [image if image.startswith("http") else f"https:{image}" for image in images if isinstance(image, str)],
+        "variants": variants,
+        "shipping": ", ".join(shipping_parts),
+        "rating": str(rating),
+        "reviews_count": str(reviews),
+        "orders": str(orders),
+        "url": url
+    }
+
+
+def _parse_json_ld(soup: BeautifulSoup, product_id: str, url: str) -> Optional[Dict]:
+    """schema.org Product(JSON-LD) 파싱"""
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        for item in data if isinstance(data, list) else [data]:
+            if not isinstance(item, dict) or item.get("@type") != "Product" or not item.get("name"):
+                continue
+            offers = item.get("offers") or {}
+            if isinstance(offers, list):
+                offers = offers[0] if offers else {}
+            images = item.get("image") or []
+            rating = item.get("aggregateRating") or {}
+            price = offers.get("price") or offers.get("lowPrice") or ""
+            currency = offers.get("priceCurrency") or ""
+            return {
+                "id": product_id,
+                "title": str(item["name"]).strip(),
+                "price": f"{currency} {price}".strip() if price else "",
+                "description": str(item.get("description") or "").strip(),
+                "images": images if isinstance(images, list) else [images],
+                "variants": [],
+                "shipping": "",
+                "rating": str(rating.get("ratingValue") or ""),
+                "reviews_count": str(rating.get("reviewCount") or ""),
+                "url": url
+            }
+    return None
+
+
+def _parse_dom(soup: BeautifulSoup, product_id: str, url: str) -> Optional[Dict]:
+    """Playwright 추출과 동일한 셀렉터로 정적 HTML 파싱"""
+    title = soup.select_one(".product-title")
+    if title is None or not title.get_text(strip=True):
+        return None
+
+    def text(selector: str) -> str:
+        element = soup.select_one(selector)
+        return element.get_text(strip=True) if element else ""
+
+    return {
+        "id": product_id,
+        "title": title.get_text(strip=True),
+        "price": text(".product-price-current"),
+        "description": text(".product-description"),
+        "images": [img.get("src") for img in soup.select(".product-image img") if img.get("src")],
+        "variants": [
+            {
+                "name": variant.select_one(".variant-name").get_text(strip=True) if variant.select_one(".variant-name") else None,
+                "price": variant.select_one(".variant-price").get_text(strip=True) if variant.select_one(".variant-price") else None
+            }
+            for variant in soup.select(".product-variant")
+        ],
+        "shipping": text(".shipping-info"),
+        "rating": text(".product-rating"),
+        "reviews_count": text(".product-reviews-count"),
+        "url": url
+    }
+
+
+def is_blocked_page(html: str, final_url: str = "") -> bool:
+    """로그인/캡차/차단 페이지 여부"""
+    final_url = final_url.lower()
+    head = html[:5000].lower()
+    return (
+        any(marker in final_url for marker in _BLOCKED_URL_MARKERS)
+        or any(marker in head for marker in _BLOCKED_PAGE_MARKERS)
+    )
+
+
+def is_empty_listing(html: str) -> bool:
+    """검색 결과가 없는 목록 페이지 여부 (제품 카드가 없고 결과 없음 안내가 있음)"""
+    lowered = html.lower()
+    return "data-product-id" not in lowered and any(marker in lowered for marker in _EMPTY_LISTING_MARKERS)
+
+
+def parse_product_page(html: str, product_id: str, url: str = "") -> Optional[Dict]:
+    """알리익스프레스 상품 페이지 HTML에서 상세 정보 추출 (실패 시 None)
+
+    임베디드 JSON → JSON-LD → DOM 셀렉터 순으로 시도합니다.
+    """
+    if not html or is_blocked_page(html, url):
+        return None
+
+    for state in iter_embedded_states(html):
+        detail = _parse_state(state, product_id, url)
+        if detail:
+            return detail
+
+    soup = BeautifulSoup(html, "lxml")
+    return _parse_json_ld(soup, product_id, url) or _parse_dom(soup, product_id, url)
+
+
+class FastPathStats:
+    """HTTP 빠른 경로 적중률/지연 시간 통계"""
+
+    def __init__(self):
+        self.attempts = 0
+        self.hits = 0
+        self.fallbacks = 0
+        self.http_ms = 0.0
+        self.fallback_ms = 0.0
+
+    def record_hit(self, elapsed_ms: float):
+        self.attempts += 1
+        self.hits += 1
+        self.http_ms += elapsed_ms
+
+    def record_miss(self, elapsed_ms: float):
+        self.attempts += 1
+        self.fallbacks += 1
+        self.http_ms += elapsed_ms
+
+    def record_fallback(self, elapsed_ms: float):
+        self.fallback_ms += elapsed_ms
+
+    def summary(self) -> Dict:
+        """적중률과 평균 지연 시간"""
+        return {
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "fallbacks": self.fallbacks,
+            "hit_rate": round(self.hits / self.attempts, 4) if self.attempts else 0,
+            "avg_http_ms": round(self.http_ms / self.attempts, 1) if self.attempts else 0,
+            "avg_fallback_ms": round(self.fallback_ms / self.fallbacks, 1) if self.fallbacks else 0
+        }
+
+
+# Process-wide fast path statistics
+fast_path_stats = FastPathStats()
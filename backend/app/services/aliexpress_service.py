@@ -1,170 +1,349 @@
 import asyncio
 import re
 import json
-from typing import List, Dict, Optional
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Optional
+from urllib.parse import urlencode
 import httpx
 from app.services.logging_service import LoggingService
+from app.services.browser_pool import browser_pool
+from app.services.page_loader import page_loader
+from app.services.aliexpress_page_parser import parse_product_page, is_blocked_page, is_empty_listing, fast_path_stats
+from app.services.scrape_session_pool import scrape_sessions, ScrapeBlockedError, NoScrapeSessionError
+from app.services.pricing_rules import PricingTable, get_pricing_table, split_costs
+from app.core.config import settings
+from app.core.http_client import get_scraper_client
+from app.utils.cache import TTLCache, SingleFlight
+
+# Extracts product cards from a listing page; the argument is the result limit
+_EXTRACT_PRODUCT_CARDS_JS = """
+    (limit) => {
+        const products = [];
+        const productElements = document.querySelectorAll('[data-product-id]');
+        
+        for (const element of productElements) {
+            if (products.length >= limit) break;
+            
+            const productId = element.getAttribute('data-product-id');
+            const titleElement = element.querySelector('.product-title');
+            const priceElement = element.querySelector('.product-price');
+            const imageElement = element.querySelector('img');
+            const ordersElement = element.querySelector('.product-orders');
+            const ratingElement = element.querySelector('.product-rating');
+            
+            if (productId && titleElement) {
+                products.push({
+                    id: productId,
+                    title: titleElement.textContent.trim(),
+                    price: priceElement ? priceElement.textContent.trim() : '',
+                    image_url: imageElement ? imageElement.src : '',
+                    orders: ordersElement ? ordersElement.textContent.trim() : '',
+                    rating: ratingElement ? ratingElement.textContent.trim() : '',
+                    url: element.href || ''
+                });
+            }
+        }
+        
+        return products;
+    }
+"""
+
+# Short-lived product detail cache shared across service instances
+_detail_cache = TTLCache(ttl=settings.ALIEXPRESS_DETAIL_CACHE_TTL, max_size=settings.ALIEXPRESS_DETAIL_CACHE_SIZE)
+_detail_flight = SingleFlight()
 
 class AliExpressService:
     """알리익스프레스 웹 스크래핑 서비스"""
     
+    # Category name -> AliExpress catId (also the category list the trending crawler walks)
+    CATEGORY_IDS = {
+        "Home & Garden": "15",
+        "Electronics": "1",
+        "Fashion": "3",
+        "Sports & Entertainment": "18",
+        "Automotive": "26",
+        "Beauty & Health": "66",
+        "Toys & Hobbies": "7",
+        "Tools & Hardware": "13"
+    }
+    DEFAULT_CATEGORY = "Home & Garden"
+    
+    # Substrings of the shipping text that indicate delivery to the US
+    US_SHIPPING_INDICATORS = (
+        'free shipping to us',
+        'ships to us',
+        'us shipping',
+        'united states',
+        'usa'
+    )
+    
     def __init__(self):
-        self.base_url = "https://www.aliexpress.com"
+        self.base_url = settings.ALIEXPRESS_BASE_URL.rstrip('/')
+        # User-Agent, proxy and cookies come from the rotating scrape session
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'Accept-Language': 'en-US,en;q=0.9'
         }
+        self.last_scrape_metrics: Optional[Dict] = None
     
     async def search_products(self, keyword: str, category: str = "Home & Garden", 
                             min_orders: int = 100, max_price: Optional[float] = None,
                             page: int = 1, limit: int = 20) -> List[Dict]:
-        """알리익스프레스에서 제품 검색"""
+        """알리익스프레스에서 제품 검색 (결과 페이지 1개)"""
         try:
-            # Build search URL
-            search_url = f"{self.base_url}/wholesale"
-            params = {
-                'SearchText': keyword,
-                'catId': self._get_category_id(category),
-                'minOrder': min_orders,
-                'page': page
-            }
-            
-            if max_price:
-                params['maxPrice'] = max_price
-            
-            # Use Playwright for dynamic content
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page_obj = await browser.new_page()
-                
-                # Set user agent
-                await page_obj.set_extra_http_headers(self.headers)
-                
-                # Navigate to search page
-                await page_obj.goto(f"{search_url}?{'&'.join([f'{k}={v}' for k, v in params.items()])}")
-                
-                # Wait for products to load
-                await page_obj.wait_for_selector('[data-product-id]', timeout=10000)
-                
-                # Extract product data
-                products = await page_obj.evaluate("""
-                    () => {
-                        const products = [];
-                        const productElements = document.querySelectorAll('[data-product-id]');
-                        
-                        productElements.forEach((element, index) => {
-                            if (index >= 20) return; // Limit to 20 products
-                            
-                            const productId = element.getAttribute('data-product-id');
-                            const titleElement = element.querySelector('.product-title');
-                            const priceElement = element.querySelector('.product-price');
-                            const imageElement = element.querySelector('img');
-                            const ordersElement = element.querySelector('.product-orders');
-                            
-                            if (productId && titleElement) {
-                                products.push({
-                                    id: productId,
-                                    title: titleElement.textContent.trim(),
-                                    price: priceElement ? priceElement.textContent.trim() : '',
-                                    image_url: imageElement ? imageElement.src : '',
-                                    orders: ordersElement ? ordersElement.textContent.trim() : '',
-                                    url: element.href || ''
-                                });
-                            }
-                        });
-                        
-                        return products;
-                    }
-                """)
-                
-                await browser.close()
-                
-                LoggingService.log_info(f"알리익스프레스 제품 검색 완료: {keyword}, {len(products)}개 결과")
-                return products
+            products = await self._scrape_listing(
+                self._search_url(keyword, category, min_orders, max_price, page),
+                operation="search",
+                limit=limit
+            )
+            LoggingService.log_info(
+                f"알리익스프레스 제품 검색 완료: {keyword}, {len(products)}개 결과, "
+                f"{self.last_scrape_metrics['bytes']}바이트, {self.last_scrape_metrics['render_ms']}ms"
+            )
+            return products
                 
         except Exception as e:
             LoggingService.log_error(f"알리익스프레스 제품 검색 실패: {str(e)}")
             return []
     
+    async def iter_search_pages(self, keyword: str, category: str = "Home & Garden",
+                                min_orders: int = 100, max_price: Optional[float] = None,
+                                start_page: int = 1, limit: int = 100,
+                                max_pages: int = None) -> AsyncIterator[Dict]:
+        """여러 검색 결과 페이지를 브라우저 풀에서 동시에 조회하며 완료되는 순서대로 반환
+
+        제품 ID로 중복을 제거하고, limit개를 채우면 남은 페이지 조회를 취소합니다.
+        각 항목은 {"page": 페이지 번호, "products": 새 제품 목록} 형식입니다. 로드에 실패한 페이지는
+        재시도 후에도 실패하면 {"page", "products": [], "error"}로 알리고 건너뛰며, 결과가 없는
+        페이지를 만났을 때만 더 이상 다음 페이지를 조회하지 않습니다.
+        """
+        page_size = settings.ALIEXPRESS_SEARCH_PAGE_SIZE
+        last_page = start_page + (max_pages or settings.ALIEXPRESS_SEARCH_MAX_PAGES) - 1
+        next_page = start_page
+        pending = set()
+        seen = set()
+        collected = 0
+        exhausted = False
+        
+        async def fetch(page_number: int):
+            """(페이지 번호, 제품 목록 또는 None, 오류) 반환 (None은 재시도 후에도 로드 실패)"""
+            url = self._search_url(keyword, category, min_orders, max_price, page_number)
+            retries = settings.ALIEXPRESS_SEARCH_PAGE_RETRIES
+            for attempt in range(retries + 1):
+                try:
+                    return page_number, await self._scrape_listing(url, operation="search", limit=page_size), None
+                except Exception as e:
+                    if attempt >= retries:
+                        LoggingService.log_warning(
+                            f"알리익스프레스 검색 페이지 조회 실패, 건너뜀: {keyword} {page_number}페이지, 오류: {str(e)}"
+                        )
+                        return page_number, None, str(e)
+                    await asyncio.sleep(settings.ALIEXPRESS_SEARCH_RETRY_DELAY * 2 ** attempt)
+        
+        def launch(count: int):
+            nonlocal next_page
+            for _ in range(count):
+                if next_page > last_page:
+                    return
+                pending.add(asyncio.create_task(fetch(next_page)))
+                next_page += 1
+        
+        # Concurrency is bounded by the browser pool, so all needed pages start at once
+        launch(math.ceil(limit / page_size))
+        try:
+            while pending and collected < limit:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: t.result()[0]):
+                    page_number, products, error = task.result()
+                    if products is None:
+                        yield {"page": page_number, "products": [], "error": error}
+                        continue
+                    if not products:
+                        exhausted = True
+                    
+                    new_products = []
+                    for product in products:
+                        if product['id'] in seen:
+                            continue
+                        seen.add(product['id'])
+                        new_products.append(product)
+                    new_products = new_products[:limit - collected]
+                    if new_products:
+                        collected += len(new_products)
+                        yield {"page": page_number, "products": new_products}
+                    if collected >= limit:
+                        break
+                
+                # Duplicates or skipped pages can leave us short; fetch more while pages remain
+                if not pending and not exhausted and collected < limit:
+                    launch(math.ceil((limit - collected) / page_size))
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def search_products_multi(self, keyword: str, category: str = "Home & Garden",
+                                    min_orders: int = 100, max_price: Optional[float] = None,
+                                    start_page: int = 1, limit: int = 100) -> List[Dict]:
+        """여러 페이지 동시 검색 결과를 limit개까지 모아서 반환"""
+        products = []
+        async for chunk in self.iter_search_pages(
+            keyword=keyword, category=category, min_orders=min_orders,
+            max_price=max_price, start_page=start_page, limit=limit
+        ):
+            products.extend(chunk["products"])
+        return products
+    
     async def get_trending_products(self, category: str = "Home & Garden", limit: int = 20) -> List[Dict]:
         """인기 제품 조회 (판매 주문이 많은 제품)"""
         try:
-            # Use trending products page
-            trending_url = f"{self.base_url}/wholesale"
+            # Trending = wholesale listing sorted by sales
             params = {
                 'catId': self._get_category_id(category),
-                'sortType': 'total_tranpro_desc',  # Sort by sales
+                'sortType': 'total_tranpro_desc',
                 'page': 1
             }
+            products = await self._scrape_listing(
+                f"{self.base_url}/wholesale?{urlencode(params)}",
+                operation="trending",
+                limit=limit
+            )
+            for product in products:
+                product['is_trending'] = True
             
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page_obj = await browser.new_page()
-                
-                await page_obj.set_extra_http_headers(self.headers)
-                await page_obj.goto(f"{trending_url}?{'&'.join([f'{k}={v}' for k, v in params.items()])}")
-                
-                # Wait for products to load
-                await page_obj.wait_for_selector('[data-product-id]', timeout=10000)
-                
-                # Extract trending products
-                products = await page_obj.evaluate(f"""
-                    () => {{
-                        const products = [];
-                        const productElements = document.querySelectorAll('[data-product-id]');
-                        
-                        productElements.forEach((element, index) => {{
-                            if (index >= {limit}) return;
-                            
-                            const productId = element.getAttribute('data-product-id');
-                            const titleElement = element.querySelector('.product-title');
-                            const priceElement = element.querySelector('.product-price');
-                            const imageElement = element.querySelector('img');
-                            const ordersElement = element.querySelector('.product-orders');
-                            const ratingElement = element.querySelector('.product-rating');
-                            
-                            if (productId && titleElement) {{
-                                products.push({{
-                                    id: productId,
-                                    title: titleElement.textContent.trim(),
-                                    price: priceElement ? priceElement.textContent.trim() : '',
-                                    image_url: imageElement ? imageElement.src : '',
-                                    orders: ordersElement ? ordersElement.textContent.trim() : '',
-                                    rating: ratingElement ? ratingElement.textContent.trim() : '',
-                                    url: element.href || '',
-                                    is_trending: true
-                                }});
-                            }}
-                        }});
-                        
-                        return products;
-                    }}
-                """)
-                
-                await browser.close()
-                
-                LoggingService.log_info(f"알리익스프레스 인기 제품 조회 완료: {category}, {len(products)}개 결과")
-                return products
+            LoggingService.log_info(
+                f"알리익스프레스 인기 제품 조회 완료: {category}, {len(products)}개 결과, "
+                f"{self.last_scrape_metrics['bytes']}바이트, {self.last_scrape_metrics['render_ms']}ms"
+            )
+            return products
                 
         except Exception as e:
             LoggingService.log_error(f"알리익스프레스 인기 제품 조회 실패: {str(e)}")
             return []
     
-    async def get_product_detail(self, product_id: str) -> Optional[Dict]:
-        """제품 상세 정보 조회"""
-        try:
-            product_url = f"{self.base_url}/item/{product_id}.html"
+    def _search_url(self, keyword: str, category: str, min_orders: int,
+                    max_price: Optional[float], page: int) -> str:
+        """검색 결과 페이지 URL 생성"""
+        params = {
+            'SearchText': keyword,
+            'catId': self._get_category_id(category),
+            'minOrder': min_orders,
+            'page': page
+        }
+        if max_price:
+            params['maxPrice'] = max_price
+        return f"{self.base_url}/wholesale?{urlencode(params)}"
+    
+    async def _scrape_listing(self, url: str, operation: str, limit: int) -> List[Dict]:
+        """목록 페이지(검색/인기)에서 제품 카드를 최대 limit개 추출"""
+        async with self._browser_page(url) as page_obj:
+            # Navigate and wait for products to load
+            try:
+                metrics = await self._load_page(page_obj, url, '[data-product-id]', operation)
+            except ScrapeBlockedError:
+                raise
+            except Exception:
+                # No product card ever appears on a "no results" page; that is an empty listing, not a failure
+                if not is_empty_listing(await page_obj.content()):
+                    raise
+                self.last_scrape_metrics = {"url": url, "bytes": 0, "requests": 0, "blocked_requests": 0, "render_ms": 0.0}
+                return []
             
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page_obj = await browser.new_page()
-                
-                await page_obj.set_extra_http_headers(self.headers)
-                await page_obj.goto(product_url)
-                
-                # Wait for product details to load
-                await page_obj.wait_for_selector('.product-title', timeout=10000)
+            products = await page_obj.evaluate(_EXTRACT_PRODUCT_CARDS_JS, limit)
+            self.last_scrape_metrics = metrics
+            return products
+    
+    @asynccontextmanager
+    async def _browser_page(self, url: str):
+        """스크래핑 세션을 골라 그 세션 전용 컨텍스트에서 페이지 대여 (성공 시 쿠키 저장)"""
+        async with scrape_sessions.session(url) as session:
+            try:
+                async with browser_pool.page(session.context_options(), context_key=session.id) as page_obj:
+                    await page_obj.set_extra_http_headers(self.headers)
+                    yield page_obj
+                    session.update_cookies(await page_obj.context.cookies())
+            except ScrapeBlockedError:
+                # The context carries the flagged cookies/fingerprint; never reuse it
+                await browser_pool.discard(session.id)
+                raise
+    
+    async def _load_page(self, page_obj, url: str, wait_selector: str, operation: str) -> Dict:
+        """페이지 로드 (셀렉터 대기 실패 시 캡차/차단 페이지인지 확인)"""
+        try:
+            return await page_loader.load(page_obj, url, wait_selector, operation=operation)
+        except Exception:
+            try:
+                html = await page_obj.content()
+            except Exception:
+                html = ""
+            if is_blocked_page(html, page_obj.url):
+                raise ScrapeBlockedError(f"차단 페이지 감지: {page_obj.url}")
+            raise
+    
+    async def get_product_detail(self, product_id: str, use_cache: bool = True) -> Optional[Dict]:
+        """제품 상세 정보 조회 (단기 캐시 + 동일 제품 동시 요청 병합)"""
+        if use_cache:
+            cached = _detail_cache.get(product_id)
+            if cached is not None:
+                return dict(cached)
+        
+        # Concurrent or nested callers for the same product share one scrape
+        product_detail = await _detail_flight.do(product_id, lambda: self._scrape_product_detail(product_id))
+        if product_detail:
+            _detail_cache.set(product_id, product_detail)
+            return dict(product_detail)
+        return None
+    
+    def product_url(self, product_id: str) -> str:
+        """제품 상세 페이지 URL"""
+        return f"{self.base_url}/item/{product_id}.html"
+
+    async def _scrape_product_detail(self, product_id: str) -> Optional[Dict]:
+        """제품 상세 조회 (HTTP 빠른 경로 실패 시 Playwright 사용)"""
+        product_url = self.product_url(product_id)
+        
+        if settings.SCRAPER_HTTP_FAST_PATH:
+            product_detail = await self._fetch_product_detail_http(product_id, product_url)
+            if product_detail:
+                return product_detail
+        
+        start = time.perf_counter()
+        product_detail = await self._scrape_product_detail_browser(product_id, product_url)
+        if settings.SCRAPER_HTTP_FAST_PATH:
+            fast_path_stats.record_fallback((time.perf_counter() - start) * 1000)
+        return product_detail
+    
+    async def _fetch_product_detail_http(self, product_id: str, product_url: str) -> Optional[Dict]:
+        """상품 페이지를 일반 HTTP로 받아 임베디드 JSON/HTML 파싱"""
+        start = time.perf_counter()
+        product_detail = None
+        try:
+            async with scrape_sessions.session(product_url) as session:
+                response = await get_scraper_client(session.proxy).get(
+                    product_url, headers=session.http_headers(self.headers)
+                )
+                if response.status_code in (403, 429) or is_blocked_page(response.text, str(response.url)):
+                    raise ScrapeBlockedError(f"HTTP {response.status_code} 차단 응답: {response.url}")
+                session.update_http_cookies(response.cookies, response.url.host)
+                if response.status_code == 200:
+                    product_detail = parse_product_page(response.text, product_id, str(response.url))
+        except (httpx.HTTPError, ScrapeBlockedError, NoScrapeSessionError) as e:
+            LoggingService.log_warning(f"HTTP 상세 조회 실패, 브라우저로 재시도: {product_id}, 오류: {str(e)}")
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if product_detail:
+            fast_path_stats.record_hit(elapsed_ms)
+            self.last_scrape_metrics = {"url": product_url, "mode": "http", "render_ms": round(elapsed_ms, 1)}
+        else:
+            fast_path_stats.record_miss(elapsed_ms)
+        return product_detail
+    
+    async def _scrape_product_detail_browser(self, product_id: str, product_url: str) -> Optional[Dict]:
+        """제품 상세 페이지 스크래핑 (Playwright)"""
+        try:
+            async with self._browser_page(product_url) as page_obj:
+                # Navigate and wait for product details to load
+                metrics = await self._load_page(page_obj, product_url, '.product-title', "detail")
                 
                 # Extract detailed product information
                 product_detail = await page_obj.evaluate("""
@@ -196,72 +375,108 @@ class AliExpressService:
                     }
                 """)
                 
-                await browser.close()
-                
-                LoggingService.log_info(f"알리익스프레스 제품 상세 조회 완료: {product_id}")
+                self.last_scrape_metrics = metrics
+                LoggingService.log_info(
+                    f"알리익스프레스 제품 상세 조회 완료: {product_id}, "
+                    f"{metrics['bytes']}바이트, {metrics['render_ms']}ms"
+                )
                 return product_detail
                 
         except Exception as e:
             LoggingService.log_error(f"알리익스프레스 제품 상세 조회 실패: {product_id}, 오류: {str(e)}")
             return None
     
-    def transform_to_shopify_format(self, aliexpress_product: Dict) -> Dict:
+    def transform_to_shopify_format(self, aliexpress_product: Dict, category: Optional[str] = None) -> Dict:
         """알리익스프레스 제품 데이터를 Shopify 형식으로 변환"""
+        products = self.transform_products_to_shopify_format([aliexpress_product], category=category)
+        return products[0] if products else {}
+    
+    @staticmethod
+    def _transform_input(product: Dict) -> Dict:
+        """변환에 쓰는 필드 형식 확인 (잘못된 제품은 ValueError, 가격 문자열 오류는 0원으로 처리됨)"""
+        if not isinstance(product, dict):
+            raise ValueError(f"제품 데이터가 객체가 아닙니다: {type(product).__name__}")
+        variants = product.get('variants') or []
+        if not isinstance(variants, list) or not all(isinstance(variant, dict) for variant in variants):
+            raise ValueError("variants 형식이 올바르지 않습니다")
+        images = product.get('images') or []
+        if isinstance(images, str):
+            images = [images]
+        if not isinstance(images, list):
+            raise ValueError("images 형식이 올바르지 않습니다")
+        return {**product, "variants": variants, "images": images}
+
+    def transform_products_to_shopify_format(self, aliexpress_products: List[Dict],
+                                             category: Optional[str] = None,
+                                             pricing_table: Optional[PricingTable] = None) -> List[Dict]:
+        """여러 제품을 한 번에 Shopify 형식으로 변환
+
+        제품과 변형의 원가를 하나의 배열로 모아 컴파일된 가격 규칙(카테고리, 원가 구간,
+        끝자리, 환율)을 한 번에 적용합니다. 제품의 category가 없으면 인자로 받은 category를 사용합니다.
+        형식이 잘못된 제품은 로그를 남기고 건너뛰므로 결과 목록이 입력보다 짧을 수 있습니다.
+        """
+        products = []
+        for index, product in enumerate(aliexpress_products):
+            try:
+                products.append(self._transform_input(product))
+            except ValueError as e:
+                LoggingService.log_warning(f"제품 데이터 변환 건너뜀 ({index}번째): {str(e)}")
+
         try:
-            # Extract price (remove currency symbols and convert to float)
-            price_str = aliexpress_product.get('price', '0')
-            price = self._extract_price(price_str)
-            
-            # Calculate markup price (example: 50% markup)
-            markup_price = price * 1.5 if price > 0 else 0
+            pricing_table = pricing_table or get_pricing_table()
+            costs, variant_counts = split_costs(products)
+            categories = []
+            for product, variant_count in zip(products, variant_counts):
+                categories.extend([product.get('category') or category] * (variant_count + 1))
             
-            # Create Shopify product data
-            shopify_product = {
-                "title": aliexpress_product.get('title', ''),
-                "description": aliexpress_product.get('description', ''),
-                "price": markup_price,
-                "compare_at_price": price,  # Original price as compare price
-                "vendor": "AliExpress Import",
-                "product_type": "General",
-                "tags": "aliexpress,import",
-                "image_url": aliexpress_product.get('images', [None])[0] if aliexpress_product.get('images') else None,
-                "images": aliexpress_product.get('images', []),
-                "inventory_quantity": 100,  # Default inventory
-                "inventory_management": "shopify",
-                "status": "active"
-            }
+            priced = pricing_table.apply(costs, categories)
+            prices = priced["price"].tolist()
+            compare_at_prices = priced["compare_at_price"].tolist()
+            inventories = priced["inventory"].tolist()
+            variant_inventories = priced["variant_inventory"].tolist()
             
-            # Add variants if available
-            if aliexpress_product.get('variants'):
-                shopify_product['variants'] = []
-                for variant in aliexpress_product['variants']:
-                    variant_price = self._extract_price(variant.get('price', '0'))
-                    shopify_product['variants'].append({
-                        "title": variant.get('name', 'Default'),
-                        "price": variant_price * 1.5,
-                        "compare_at_price": variant_price,
-                        "inventory_quantity": 50
-                    })
+            shopify_products = []
+            position = 0
+            for product, variant_count in zip(products, variant_counts):
+                images = product['images']
+                shopify_product = {
+                    "title": product.get('title', ''),
+                    "description": product.get('description', ''),
+                    "price": prices[position],
+                    "compare_at_price": compare_at_prices[position],  # Original price as compare price
+                    "vendor": "AliExpress Import",
+                    "product_type": "General",
+                    "tags": "aliexpress,import",
+                    "image_url": images[0] if images else None,
+                    "images": images,
+                    "inventory_quantity": inventories[position],
+                    "inventory_management": "shopify",
+                    "status": "active"
+                }
+                position += 1
+                
+                if variant_count:
+                    shopify_product['variants'] = []
+                    for variant in product['variants']:
+                        shopify_product['variants'].append({
+                            "title": variant.get('name', 'Default'),
+                            "price": prices[position],
+                            "compare_at_price": compare_at_prices[position],
+                            "inventory_quantity": variant_inventories[position]
+                        })
+                        position += 1
+                
+                shopify_products.append(shopify_product)
             
-            return shopify_product
+            return shopify_products
             
         except Exception as e:
             LoggingService.log_error(f"제품 데이터 변환 실패: {str(e)}")
-            return {}
+            return []
     
     def _get_category_id(self, category: str) -> str:
         """카테고리명을 알리익스프레스 카테고리 ID로 변환"""
-        category_mapping = {
-            "Home & Garden": "15",
-            "Electronics": "1",
-            "Fashion": "3",
-            "Sports & Entertainment": "18",
-            "Automotive": "26",
-            "Beauty & Health": "66",
-            "Toys & Hobbies": "7",
-            "Tools & Hardware": "13"
-        }
-        return category_mapping.get(category, "15")  # Default to Home & Garden
+        return self.CATEGORY_IDS.get(category, self.CATEGORY_IDS[self.DEFAULT_CATEGORY])
     
     def _extract_price(self, price_str: str) -> float:
         """가격 문자열에서 숫자 추출"""
@@ -272,25 +487,17 @@ class AliExpressService:
         except (ValueError, TypeError):
             return 0.0
     
-    async def check_us_shipping(self, product_id: str) -> bool:
-        """US 배송 가능 여부 확인"""
+    async def check_us_shipping(self, product_id: str, product_detail: Optional[Dict] = None) -> bool:
+        """US 배송 가능 여부 확인 (이미 조회한 상세 정보가 있으면 재사용)"""
         try:
-            product_detail = await self.get_product_detail(product_id)
+            if product_detail is None:
+                product_detail = await self.get_product_detail(product_id)
             if not product_detail:
                 return False
             
             shipping_info = product_detail.get('shipping', '').lower()
             
-            # Check for US shipping indicators
-            us_shipping_indicators = [
-                'free shipping to us',
-                'ships to us',
-                'us shipping',
-                'united states',
-                'usa'
-            ]
-            
-            return any(indicator in shipping_info for indicator in us_shipping_indicators)
+            return any(indicator in shipping_info for indicator in self.US_SHIPPING_INDICATORS)
             
         except Exception as e:
             LoggingService.log_error(f"US 배송 확인 실패: {product_id}, 오류: {str(e)}")
@@ -319,7 +526,7 @@ class AliExpressService:
                 "rating": rating,
                 "reviews_count": reviews,
                 "popularity_score": orders * rating if rating > 0 else 0,
-                "has_us_shipping": await self.check_us_shipping(product_id)
+                "has_us_shipping": await self.check_us_shipping(product_id, product_detail)
             }
             
         except Exception as e:
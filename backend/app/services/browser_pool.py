@@ -0,0 +1,181 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+from app.core.config import settings
+from app.services.logging_service import LoggingService
+
+
+class PooledContext:
+    """풀에서 관리되는 BrowserContext와 사용 횟수"""
+
+    def __init__(self, context: BrowserContext, generation: int, key: Optional[str] = None):
+        self.context = context
+        self.generation = generation
+        self.key = key
+        self.uses = 0
+
+
+class BrowserPool:
+    """프로세스 공용 Chromium 브라우저 풀
+
+    브라우저는 한 번만 실행하고, 격리된 BrowserContext를 제한된 개수만큼 나눠 줍니다.
+    컨텍스트는 max_uses회 사용 후 교체하고, 브라우저가 종료되면 다음 요청에서 재시작합니다.
+    유휴 컨텍스트는 context_key(예: 스크래핑 세션 ID)별로 보관되어 같은 옵션으로만 재사용됩니다.
+    """
+
+    def __init__(self, max_contexts: int = None, max_uses: int = None, headless: bool = None):
+        self.max_contexts = max_contexts or settings.BROWSER_POOL_SIZE
+        self.max_uses = max_uses or settings.BROWSER_CONTEXT_MAX_USES
+        self.headless = settings.BROWSER_HEADLESS if headless is None else headless
+
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._generation = 0  # Incremented on every browser (re)launch
+        self._idle: List[PooledContext] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.stats = {"launches": 0, "contexts_created": 0, "contexts_recycled": 0, "pages_served": 0}
+
+    def _bind_loop(self):
+        """현재 이벤트 루프에 동기화 객체 바인딩 (루프가 바뀌면 상태 초기화)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Playwright objects from another loop are unusable here; drop them
+            self._playwright = None
+            self._browser = None
+            self._idle = []
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.max_contexts)
+
+    async def start(self):
+        """브라우저 실행 (이미 실행 중이면 무시)"""
+        self._bind_loop()
+        await self._ensure_browser()
+
+    async def _ensure_browser(self) -> Browser:
+        """브라우저가 없거나 종료되었으면 (재)실행"""
+        async with self._lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+
+            if self._browser is not None:
+                LoggingService.log_warning("Chromium 브라우저 연결이 끊어져 재시작합니다.")
+            self._idle = []
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self._generation += 1
+            self.stats["launches"] += 1
+            return self._browser
+
+    async def _acquire_context(self, context_options: Optional[Dict] = None,
+                               context_key: Optional[str] = None) -> PooledContext:
+        """같은 키의 유휴 컨텍스트 재사용 또는 새 컨텍스트 생성"""
+        browser = await self._ensure_browser()
+
+        for index in range(len(self._idle) - 1, -1, -1):
+            pooled = self._idle[index]
+            if pooled.key == context_key and pooled.generation == self._generation:
+                del self._idle[index]
+                return pooled
+
+        context = await browser.new_context(**(context_options or {}))
+        self.stats["contexts_created"] += 1
+        return PooledContext(context, self._generation, context_key)
+
+    async def _release_context(self, pooled: PooledContext, healthy: bool):
+        """컨텍스트 반환 (사용 한도 초과, 오류, 브라우저 재시작 시 폐기)"""
+        pooled.uses += 1
+        reusable = (
+            healthy
+            and pooled.uses < self.max_uses
+            and pooled.generation == self._generation
+            and self._browser is not None
+            and self._browser.is_connected()
+        )
+        if reusable:
+            self._idle.append(pooled)
+            # Keyed contexts can outnumber the pool; evict the least recently released
+            while len(self._idle) > self.max_contexts:
+                await self._close_context(self._idle.pop(0))
+            return
+
+        await self._close_context(pooled)
+
+    async def _close_context(self, pooled: PooledContext):
+        """컨텍스트 폐기"""
+        self.stats["contexts_recycled"] += 1
+        try:
+            await pooled.context.close()
+        except Exception:
+            pass
+
+    async def discard(self, context_key: str):
+        """특정 키의 유휴 컨텍스트 폐기 (격리된 스크래핑 세션 등)"""
+        for pooled in [pooled for pooled in self._idle if pooled.key == context_key]:
+            self._idle.remove(pooled)
+            await self._close_context(pooled)
+
+    @asynccontextmanager
+    async def page(self, context_options: Optional[Dict] = None, context_key: Optional[str] = None):
+        """풀에서 페이지 대여 (동시 사용 수는 max_contexts로 제한)"""
+        self._bind_loop()
+        async with self._semaphore:
+            pooled = await self._acquire_context(context_options, context_key)
+            healthy = True
+            page: Optional[Page] = None
+            try:
+                page = await pooled.context.new_page()
+                self.stats["pages_served"] += 1
+                yield page
+            except Exception:
+                healthy = self._browser is not None and self._browser.is_connected()
+                raise
+            finally:
+                if page is not None:
+                    try:
+                        await page.close()
+                    except Exception:
+                        healthy = False
+                await self._release_context(pooled, healthy)
+
+    async def close(self):
+        """모든 컨텍스트와 브라우저 종료"""
+        if self._loop is not None and self._loop is not asyncio.get_running_loop():
+            # Objects belong to a closed loop; nothing can be awaited on them
+            self._bind_loop()
+            return
+
+        for pooled in self._idle:
+            try:
+                await pooled.context.close()
+            except Exception:
+                pass
+        self._idle = []
+
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def get_stats(self) -> Dict:
+        """풀 상태"""
+        return {
+            **self.stats,
+            "max_contexts": self.max_contexts,
+            "idle_contexts": len(self._idle),
+            "browser_connected": bool(self._browser and self._browser.is_connected())
+        }
+
+
+# Process-wide pool shared by every AliExpressService instance
+browser_pool = BrowserPool()
@@ -0,0 +1,179 @@
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from app.core.config import settings
+from app.services.logging_service import LoggingService
+from app.utils.cache import TTLCache, SingleFlight
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is optional for local runs
+    aioredis = None
+
+
+class CacheService:
+    """Redis 기반 TTL 캐시 (stale-while-revalidate 지원, Redis 불가 시 인메모리 LRU 사용)
+
+    max_entries를 지정하면 Redis에서도 네임스페이스별 항목 수를 제한합니다
+    (만료 시각 순 인덱스를 두고 초과분은 가장 먼저 만료될 항목부터 삭제).
+    """
+
+    def __init__(self, namespace: str, redis_url: str = None, memory_max_entries: int = None,
+                 max_entries: int = None):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self._index_key = f"{namespace}:__index__"
+        self.redis_url = redis_url or settings.REDIS_URL
+        self._memory = TTLCache(ttl=0, max_size=memory_max_entries or settings.CACHE_MEMORY_MAX_ENTRIES)
+        self._flight = SingleFlight()
+        self._redis = None
+        self._redis_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._redis_retry_at = 0.0
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+    def make_key(self, name: str, **params) -> str:
+        """정규화된 파라미터로 캐시 키 생성"""
+        normalized = {}
+        for key, value in params.items():
+            if isinstance(value, str):
+                value = " ".join(value.strip().lower().split())
+            elif isinstance(value, float) and value.is_integer():
+                value = int(value)
+            normalized[key] = value
+        digest = hashlib.sha1(json.dumps(normalized, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{name}:{digest}"
+
+    def make_content_key(self, name: str, payload: Dict) -> str:
+        """내용 그대로(정규화 없이) 해시한 캐시 키 생성 (프롬프트 등 대소문자/공백이 의미 있는 값용)"""
+        digest = hashlib.sha256(
+            json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest()
+        return f"{self.namespace}:{name}:{digest}"
+
+    async def _get_redis(self):
+        """Redis 클라이언트 반환 (연결 실패 시 일정 시간 인메모리 캐시 사용)"""
+        if aioredis is None or not self.redis_url:
+            return None
+
+        loop = asyncio.get_running_loop()
+        if self._redis is not None and self._redis_loop is loop:
+            return self._redis
+        if time.monotonic() < self._redis_retry_at:
+            return None
+
+        try:
+            client = aioredis.from_url(self.redis_url, socket_connect_timeout=1, socket_timeout=1)
+            await client.ping()
+        except Exception as e:
+            self._redis = None
+            self._redis_retry_at = time.monotonic() + settings.CACHE_REDIS_RETRY_INTERVAL
+            LoggingService.log_warning(f"Redis 캐시 연결 실패, 인메모리 캐시 사용: {str(e)}")
+            return None
+
+        self._redis = client
+        self._redis_loop = loop
+        return client
+
+    def _drop_redis(self):
+        """Redis 오류 시 일정 시간 인메모리 캐시로 전환"""
+        self.stats["errors"] += 1
+        self._redis = None
+        self._redis_retry_at = time.monotonic() + settings.CACHE_REDIS_RETRY_INTERVAL
+
+    async def _read(self, key: str) -> Optional[Dict]:
+        """캐시 엔벨로프({"v": 값, "t": 저장 시각}) 조회"""
+        client = await self._get_redis()
+        if client is not None:
+            try:
+                raw = await client.get(key)
+                return json.loads(raw) if raw else None
+            except Exception:
+                self._drop_redis()
+        return self._memory.get(key)
+
+    async def _write(self, key: str, value: Any, expire: float):
+        """캐시 엔벨로프 저장"""
+        envelope = {"v": value, "t": time.time()}
+        client = await self._get_redis()
+        if client is not None:
+            try:
+                await client.set(key, json.dumps(envelope, default=str), ex=max(1, int(expire)))
+                if self.max_entries:
+                    await self._evict(client, key, envelope["t"] + expire)
+                return
+            except Exception:
+                self._drop_redis()
+        self._memory.set(key, envelope, ttl=expire)
+
+    async def _evict(self, client, key: str, expires_at: float):
+        """인덱스에 키 등록 후 만료된 항목을 정리하고 max_entries 초과분 삭제"""
+        pipe = client.pipeline(transaction=False)
+        pipe.zadd(self._index_key, {key: expires_at})
+        pipe.zremrangebyscore(self._index_key, "-inf", time.time())
+        pipe.zcard(self._index_key)
+        count = (await pipe.execute())[-1]
+        if count > self.max_entries:
+            evicted = await client.zpopmin(self._index_key, count - self.max_entries)
+            if evicted:
+                await client.delete(*[member for member, _ in evicted])
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: float,
+                           stale_ttl: float = 0) -> Any:
+        """캐시 조회 후 없으면 fetch 실행
+
+        ttl 이내면 캐시 값을, ttl ~ ttl+stale_ttl 사이면 오래된 값을 즉시 반환하고
+        백그라운드에서 갱신합니다. 빈 결과는 캐시하지 않습니다.
+        """
+        envelope = await self._read(key)
+        if envelope is not None:
+            age = time.time() - envelope["t"]
+            if age < ttl:
+                self.stats["hits"] += 1
+                return envelope["v"]
+            if age < ttl + stale_ttl:
+                self.stats["stale_hits"] += 1
+                self._schedule_refresh(key, fetch, ttl, stale_ttl)
+                return envelope["v"]
+
+        self.stats["misses"] += 1
+        return await self._flight.do(key, lambda: self._fetch_and_store(key, fetch, ttl, stale_ttl))
+
+    async def _fetch_and_store(self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float) -> Any:
+        """값 조회 후 캐시에 저장"""
+        value = await fetch()
+        if value:
+            await self._write(key, value, ttl + stale_ttl)
+        return value
+
+    def _schedule_refresh(self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float):
+        """백그라운드 갱신 예약 (동일 키는 한 번만 실행)"""
+        async def refresh():
+            try:
+                await self._flight.do(key, lambda: self._fetch_and_store(key, fetch, ttl, stale_ttl))
+                self.stats["refreshes"] += 1
+            except Exception as e:
+                LoggingService.log_warning(f"캐시 백그라운드 갱신 실패: {key}, 오류: {str(e)}")
+
+        task = asyncio.create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    def get_stats(self) -> Dict:
+        """캐시 적중률 통계"""
+        lookups = self.stats["hits"] + self.stats["stale_hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round((self.stats["hits"] + self.stats["stale_hits"]) / lookups, 4) if lookups else 0,
+            "backend": "redis" if self._redis is not None else "memory",
+            "memory_entries": len(self._memory)
+        }
+
+
+# AliExpress scrape results (search, trending, product detail)
+aliexpress_cache = CacheService("aliexpress")
+
+# LLM completions keyed by model, prompts and sampling parameters
+llm_cache = CacheService("llm", max_entries=settings.LLM_CACHE_MAX_ENTRIES)
@@ -0,0 +1,175 @@
+import math
+import re
+import time
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from app.services.aliexpress_service import AliExpressService
+
+# Columns available to custom ranking formulas
+FORMULA_COLUMNS = ("price", "orders", "rating", "reviews_count", "popularity_score", "has_us_shipping")
+_FORMULA_PATTERN = re.compile(r"^[\w\s.+\-*/()]+$")
+_US_SHIPPING_PATTERN = re.compile("|".join(re.escape(indicator) for indicator in AliExpressService.US_SHIPPING_INDICATORS))
+# Same patterns as AliExpressService._extract_price/_extract_number/_extract_rating
+_NON_PRICE_CHARS = r"[^\d.]"
+_FIRST_INTEGER = r"(\d+)"
+_FIRST_DECIMAL = r"(\d+\.?\d*)"
+
+
+class CandidateScoringService:
+    """스크래핑한 알리익스프레스 제품 후보를 일괄(벡터화) 파싱/필터링/점수화하는 서비스"""
+
+    @staticmethod
+    def _column(products: List[Dict], column: str) -> pd.Series:
+        """제품별 문자열 컬럼 (행 하나가 제품 하나)"""
+        return pd.Series([str(product.get(column) or "") for product in products], dtype=object)
+
+    @classmethod
+    def to_frame(cls, products: List[Dict]) -> pd.DataFrame:
+        """제품 목록에서 숫자 컬럼 DataFrame 생성 (행 순서는 products와 동일)
+
+        AliExpressService의 _extract_price/_extract_number/_extract_rating과 같은 규칙을
+        pandas 문자열 연산으로 컬럼 단위로 적용합니다.
+        """
+        if not products:
+            return pd.DataFrame({column: pd.Series(dtype=float) for column in FORMULA_COLUMNS})
+
+        def to_number(values: pd.Series) -> pd.Series:
+            return pd.to_numeric(values, errors="coerce").fillna(0)
+
+        def first_integer(column: str) -> np.ndarray:
+            found = cls._column(products, column).str.extract(_FIRST_INTEGER, expand=False)
+            return to_number(found).to_numpy(dtype=np.int64)
+
+        price = to_number(
+            cls._column(products, "price").str.replace(_NON_PRICE_CHARS, "", regex=True)
+        ).to_numpy(dtype=float)
+        orders = first_integer("orders")
+        reviews_count = first_integer("reviews_count")
+
+        # Ratings out of 50 are normalized to 5
+        rating = to_number(
+            cls._column(products, "rating").str.extract(_FIRST_DECIMAL, expand=False)
+        ).to_numpy(dtype=float)
+        rating = np.where(rating > 5, rating / 10, rating)
+
+        has_us_shipping = cls._column(products, "shipping").str.lower().str.contains(
+            _US_SHIPPING_PATTERN, regex=True
+        ).to_numpy(dtype=bool)
+
+        return pd.DataFrame({
+            "price": price,
+            "orders": orders,
+            "rating": rating,
+            "reviews_count": reviews_count,
+            "popularity_score": np.where(rating > 0, orders * rating, 0.0),
+            "has_us_shipping": has_us_shipping
+        })
+
+    @staticmethod
+    def validate_formula(formula: str):
+        """랭킹 수식 검증 (허용된 컬럼과 사칙연산만 사용 가능)"""
+        if not _FORMULA_PATTERN.match(formula):
+            raise ValueError("랭킹 수식에는 컬럼명, 숫자, 사칙연산, 괄호만 사용할 수 있습니다.")
+        for name in re.findall(r"[A-Za-z_]\w*", formula):
+            if name not in FORMULA_COLUMNS:
+                raise ValueError(f"알 수 없는 컬럼입니다: {name} (사용 가능: {', '.join(FORMULA_COLUMNS)})")
+
+    @classmethod
+    def score(cls, products: List[Dict], min_orders: int = 0, max_price: Optional[float] = None,
+              min_rating: float = 0.0, require_us_shipping: bool = False,
+              formula: Optional[str] = None, top_k: int = 20) -> List[Dict]:
+        """필터를 한 번에 적용하고 점수 상위 top_k개 반환
+
+        formula를 지정하지 않으면 popularity_score(orders * rating)로 정렬합니다.
+        """
+        if formula:
+            cls.validate_formula(formula)
+
+        df = cls.to_frame(products)
+        if df.empty:
+            return []
+
+        mask = df["orders"].to_numpy() >= min_orders
+        mask &= df["rating"].to_numpy() >= min_rating
+        if max_price is not None:
+            mask &= df["price"].to_numpy() <= max_price
+        if require_us_shipping:
+            mask &= df["has_us_shipping"].to_numpy()
+        positions = np.flatnonzero(mask)
+        if not len(positions):
+            return []
+
+        if formula:
+            values = df.iloc[positions].eval(formula)
+            scores = np.broadcast_to(np.asarray(values, dtype=float), (len(positions),))
+        else:
+            scores = df["popularity_score"].to_numpy(dtype=float)[positions]
+        scores = np.nan_to_num(scores, nan=-np.inf, posinf=-np.inf, neginf=-np.inf)
+
+        # Partial selection of the top K, then sort only those K
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        # Parsed numeric values replace the scraped strings in the returned rows
+        selected = positions[top]
+        parsed = df.iloc[selected].to_dict(orient="records")
+        ranked = []
+        for position, values, score in zip(selected.tolist(), parsed, scores[top].tolist()):
+            ranked.append({
+                **products[position],
+                **values,
+                "has_us_shipping": bool(values["has_us_shipping"]),
+                "score": score if math.isfinite(score) else None
+            })
+        return ranked
+
+    @staticmethod
+    def score_per_row(products: List[Dict], min_orders: int = 0, max_price: Optional[float] = None,
+                      min_rating: float = 0.0, require_us_shipping: bool = False, top_k: int = 20) -> List[Dict]:
+        """기존 방식(제품별 정규식 파싱)으로 같은 필터/점수 계산 (벤치마크 비교용)"""
+        service = AliExpressService()
+        scored = []
+        for product in products:
+            price = service._extract_price(str(product.get("price") or ""))
+            orders = service._extract_number(str(product.get("orders") or ""))
+            rating = service._extract_rating(str(product.get("rating") or ""))
+            shipping = str(product.get("shipping") or "").lower()
+            has_us_shipping = any(indicator in shipping for indicator in AliExpressService.US_SHIPPING_INDICATORS)
+
+            if orders < min_orders or rating < min_rating:
+                continue
+            if max_price is not None and price > max_price:
+                continue
+            if require_us_shipping and not has_us_shipping:
+                continue
+            scored.append({**product, "score": orders * rating if rating > 0 else 0})
+
+        scored.sort(key=lambda item: item["score"], reverse=True)
+        return scored[:top_k]
+
+    @classmethod
+    def benchmark(cls, products: List[Dict], repeat: int = 5, **filters) -> Dict:
+        """벡터화 경로와 제품별 경로의 처리 시간 비교"""
+        def best_of(func) -> float:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        vectorized = cls.score(products, **filters)
+        per_row = cls.score_per_row(products, **filters)
+        vectorized_seconds = best_of(lambda: cls.score(products, **filters))
+        per_row_seconds = best_of(lambda: cls.score_per_row(products, **filters))
+
+        return {
+            "rows": len(products),
+            "repeat": repeat,
+            "vectorized_ms": round(vectorized_seconds * 1000, 3),
+            "per_row_ms": round(per_row_seconds * 1000, 3),
+            "speedup": round(per_row_seconds / vectorized_seconds, 2) if vectorized_seconds else None,
+            "same_scores": [item["score"] for item in vectorized] == [float(item["score"]) for item in per_row]
+        }
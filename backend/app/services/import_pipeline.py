@@ -0,0 +1,282 @@
+import asyncio
+import time
+from typing import List, Dict, Optional, Callable, Iterable, Set
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.product import Product
+from app.services.aliexpress_service import AliExpressService
+from app.services.shopify_service import ShopifyService
+from app.services.product_bulk_service import ProductBulkService
+from app.services.logging_service import LoggingService
+
+# Marks the end of a stage's input queue
+_DONE = object()
+
+
+class StageStats:
+    """파이프라인 단계별 처리 통계"""
+
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def record(self, elapsed: float, success: bool = True, count: int = 1):
+        """처리 결과 기록"""
+        self.busy_seconds += elapsed
+        if success:
+            self.processed += count
+        else:
+            self.failed += count
+
+    def to_dict(self) -> Dict:
+        """통계 딕셔너리 변환"""
+        wall = (self.finished_at or time.monotonic()) - (self.started_at or time.monotonic())
+        return {
+            "stage": self.name,
+            "concurrency": self.concurrency,
+            "processed": self.processed,
+            "failed": self.failed,
+            "wall_seconds": round(wall, 3),
+            "busy_seconds": round(self.busy_seconds, 3),
+            "throughput_per_sec": round(self.processed / wall, 3) if wall > 0 else 0
+        }
+
+
+class ImportPipeline:
+    """알리익스프레스 → Shopify → DB 단계별 동시 임포트 파이프라인
+
+    스크래핑/변환, Shopify 생성, DB 기록 단계가 각자의 동시성 한도와
+    bounded 큐(backpressure)로 연결됩니다. Shopify 제품은 알리익스프레스 ID로 만든 고정 handle로
+    생성하고 생성 전에 같은 handle을 조회하므로, DB 기록이 실패한 뒤 다시 임포트해도 중복 생성되지 않습니다.
+    """
+
+    IMPORT_SOURCE = "aliexpress"
+
+    def __init__(self, scrape_concurrency: int = None, shopify_concurrency: int = None,
+                 db_batch_size: int = None, queue_size: int = None,
+                 progress_callback: Optional[Callable[[Dict], None]] = None):
+        self.progress_callback = progress_callback
+        self.total = 0
+        self.scrape_concurrency = scrape_concurrency or settings.IMPORT_SCRAPE_CONCURRENCY
+        self.shopify_concurrency = shopify_concurrency or settings.IMPORT_SHOPIFY_CONCURRENCY
+        self.db_batch_size = db_batch_size or settings.IMPORT_DB_BATCH_SIZE
+        self.queue_size = queue_size or settings.IMPORT_QUEUE_SIZE
+
+        self.aliexpress_service = AliExpressService()
+        self.shopify_service = ShopifyService()
+
+        self.stats = {
+            "scrape": StageStats("scrape", self.scrape_concurrency),
+            "shopify": StageStats("shopify", self.shopify_concurrency),
+            "database": StageStats("database", 1)
+        }
+        self.failures: Dict[str, str] = {}
+
+    @classmethod
+    def shopify_handle(cls, product_id: str) -> str:
+        """알리익스프레스 제품 ID로 만든 Shopify handle"""
+        return f"{cls.IMPORT_SOURCE}-{product_id}"
+
+    @classmethod
+    def imported_product_ids(cls, db: Session, product_ids: Iterable[str]) -> Set[str]:
+        """이미 임포트된 알리익스프레스 제품 ID (source_id 또는 상세 페이지 URL이 정확히 일치)"""
+        product_ids = {str(product_id) for product_id in product_ids}
+        if not product_ids:
+            return set()
+
+        aliexpress_service = AliExpressService()
+        # Rows written before source_id existed are matched by their exact product URL
+        urls = {aliexpress_service.product_url(product_id): product_id for product_id in product_ids}
+        rows = db.query(Product.source_id, Product.source_url).filter(
+            Product.import_source == cls.IMPORT_SOURCE,
+            or_(Product.source_id.in_(list(product_ids)), Product.source_url.in_(list(urls)))
+        ).all()
+
+        imported = set()
+        for source_id, source_url in rows:
+            if source_id in product_ids:
+                imported.add(source_id)
+            elif source_url in urls:
+                imported.add(urls[source_url])
+        return imported
+
+    async def run(self, product_ids: List[str]) -> Dict:
+        """제품 ID 목록 임포트 실행 후 단계별 리포트 반환"""
+        started = time.monotonic()
+        self.total = len(product_ids)
+        id_queue: asyncio.Queue = asyncio.Queue()
+        shopify_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        db_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        for product_id in product_ids:
+            id_queue.put_nowait(product_id)
+        for stage in self.stats.values():
+            stage.started_at = started
+
+        scrapers = [asyncio.create_task(self._scrape_worker(id_queue, shopify_queue)) for _ in range(self.scrape_concurrency)]
+        creators = [asyncio.create_task(self._shopify_worker(shopify_queue, db_queue)) for _ in range(self.shopify_concurrency)]
+        writer = asyncio.create_task(self._db_writer(db_queue))
+
+        try:
+            await asyncio.gather(*scrapers)
+            self.stats["scrape"].finished_at = time.monotonic()
+            for _ in creators:
+                await shopify_queue.put(_DONE)
+
+            await asyncio.gather(*creators)
+            self.stats["shopify"].finished_at = time.monotonic()
+            await db_queue.put(_DONE)
+
+            await writer
+            self.stats["database"].finished_at = time.monotonic()
+        except BaseException:
+            for task in scrapers + creators + [writer]:
+                task.cancel()
+            raise
+
+        report = {
+            "total": len(product_ids),
+            "imported": self.stats["database"].processed,
+            "failed": len(self.failures),
+            "elapsed_seconds": round(time.monotonic() - started, 3),
+            "stages": [stage.to_dict() for stage in self.stats.values()],
+            "failures": self.failures
+        }
+        LoggingService.log_info(
+            f"일괄 임포트 파이프라인 완료: {report['imported']}/{report['total']}개 성공, {report['elapsed_seconds']}초"
+        )
+        return report
+
+    def progress(self) -> Dict:
+        """현재 진행 상황"""
+        imported = self.stats["database"].processed
+        failed = len(self.failures)
+        return {
+            "total": self.total,
+            "imported": imported,
+            "failed": failed,
+            "pending": self.total - imported - failed
+        }
+
+    async def _fail(self, product_id: str, error: str):
+        """제품 실패 기록"""
+        self.failures[product_id] = error
+        await self._notify(failed={product_id: error})
+
+    async def _notify(self, done: Optional[List[str]] = None, failed: Optional[Dict[str, str]] = None):
+        """진행 상황 콜백 호출 (콜백은 DB 기록 등을 하므로 스레드에서 실행)"""
+        if self.progress_callback is None:
+            return
+        event = {**self.progress(), "done_items": done or [], "failed_items": failed or {}}
+        try:
+            await asyncio.to_thread(self.progress_callback, event)
+        except Exception as e:
+            LoggingService.log_warning(f"임포트 진행 상황 전달 실패: {str(e)}")
+
+    async def _scrape_worker(self, id_queue: asyncio.Queue, out_queue: asyncio.Queue):
+        """스크래핑 + Shopify 형식 변환 단계"""
+        while True:
+            try:
+                product_id = id_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            start = time.monotonic()
+            try:
+                product_detail = await self.aliexpress_service.get_product_detail(product_id)
+                if not product_detail:
+                    raise ValueError("제품 상세 정보를 가져오지 못했습니다.")
+                shopify_product_data = self.aliexpress_service.transform_to_shopify_format(product_detail)
+                if not shopify_product_data:
+                    raise ValueError("제품 데이터 변환에 실패했습니다.")
+            except Exception as e:
+                self.stats["scrape"].record(time.monotonic() - start, success=False)
+                await self._fail(product_id, f"scrape: {str(e)}")
+                continue
+
+            self.stats["scrape"].record(time.monotonic() - start)
+            await out_queue.put((product_id, product_detail, shopify_product_data))
+
+    async def _shopify_worker(self, in_queue: asyncio.Queue, out_queue: asyncio.Queue):
+        """Shopify 제품 생성 단계 (호출 버킷으로 속도 제한)"""
+        while True:
+            item = await in_queue.get()
+            if item is _DONE:
+                return
+
+            product_id, product_detail, shopify_product_data = item
+            handle = self.shopify_handle(product_id)
+            start = time.monotonic()
+            try:
+                # A previous attempt may have created it before its DB write failed
+                shopify_product = await self.shopify_service.find_product_by_handle(handle)
+                if shopify_product is None:
+                    shopify_product = await self.shopify_service.create_product({**shopify_product_data, "handle": handle})
+            except Exception as e:
+                self.stats["shopify"].record(time.monotonic() - start, success=False)
+                await self._fail(product_id, f"shopify: {str(e)}")
+                continue
+
+            self.stats["shopify"].record(time.monotonic() - start)
+            await out_queue.put((product_id, {
+                "shopify_id": str(shopify_product.get("id")),
+                "title": shopify_product_data["title"],
+                "description": shopify_product_data.get("description"),
+                "price": shopify_product_data.get("price"),
+                "vendor": shopify_product_data.get("vendor"),
+                "product_type": shopify_product_data.get("product_type"),
+                "image_url": shopify_product_data.get("image_url"),
+                "images": shopify_product_data.get("images"),
+                "handle": shopify_product.get("handle") or handle,
+                "import_source": self.IMPORT_SOURCE,
+                "source_id": str(product_id),
+                "source_url": product_detail.get("url") or self.aliexpress_service.product_url(product_id),
+                "source_data": product_detail
+            }))
+
+    async def _db_writer(self, in_queue: asyncio.Queue):
+        """DB 배치 기록 단계"""
+        batch = []
+        while True:
+            item = await in_queue.get()
+            if item is not _DONE:
+                batch.append(item)
+            if batch and (item is _DONE or len(batch) >= self.db_batch_size):
+                await self._write_batch(batch)
+                batch = []
+            if item is _DONE:
+                return
+
+    async def _write_batch(self, batch):
+        """배치 upsert (동기 세션은 스레드에서 실행)"""
+        start = time.monotonic()
+        try:
+            await asyncio.to_thread(self._upsert, [row for _, row in batch])
+        except Exception as e:
+            self.stats["database"].record(time.monotonic() - start, success=False, count=len(batch))
+            failed = {product_id: f"database: {str(e)}" for product_id, _ in batch}
+            self.failures.update(failed)
+            await self._notify(failed=failed)
+            return
+        self.stats["database"].record(time.monotonic() - start, count=len(batch))
+        await self._notify(done=[product_id for product_id, _ in batch])
+
+    @staticmethod
+    def _upsert(rows: List[Dict]):
+        """제품 행 upsert 후 커밋"""
+        db = SessionLocal()
+        try:
+            ProductBulkService.upsert_products(db, rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
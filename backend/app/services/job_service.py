@@ -0,0 +1,175 @@
+from datetime import datetime
+from typing import List, Dict, Optional
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models.job import Job, JobItem
+
+TERMINAL_STATUSES = {"completed", "failed"}
+
+
+class JobService:
+    """작업(jobs) 상태 및 진행률 관리 서비스"""
+
+    @staticmethod
+    def create_job(db: Session, job_type: str, item_keys: Optional[List[str]] = None,
+                   params: Optional[Dict] = None) -> Job:
+        """작업과 항목 행 생성"""
+        item_keys = item_keys or []
+        job = Job(job_type=job_type, status="queued", total_items=len(item_keys), params=params)
+        db.add(job)
+        db.flush()
+
+        if item_keys:
+            db.execute(insert(JobItem), [
+                {"job_id": job.id, "item_key": str(key), "status": "pending"} for key in item_keys
+            ])
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def attach_task(db: Session, job: Job, task_id: str):
+        """Celery 작업 ID 연결"""
+        job.task_id = task_id
+        db.commit()
+
+    @staticmethod
+    def mark_running(job_id: int, task_id: Optional[str] = None):
+        """작업 시작 처리"""
+        db = SessionLocal()
+        try:
+            values = {Job.status: "running", Job.error: None}
+            if task_id:
+                values[Job.task_id] = task_id
+            db.query(Job).filter(Job.id == job_id).update(values, synchronize_session=False)
+            db.query(Job).filter(Job.id == job_id, Job.started_at.is_(None)).update(
+                {Job.started_at: datetime.utcnow()}, synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def record_items(job_id: int, done: Optional[List[str]] = None, failed: Optional[Dict[str, str]] = None):
+        """항목 완료/실패 상태를 upsert하고 작업 카운터를 항목 행에서 다시 계산
+
+        같은 항목을 여러 번 기록해도(작업 재시도 등) 카운터가 중복 증가하지 않습니다.
+        """
+        statuses = {str(item_key): ("done", None) for item_key in done or []}
+        statuses.update({str(item_key): ("failed", error) for item_key, error in (failed or {}).items()})
+        if not statuses:
+            return
+
+        db = SessionLocal()
+        try:
+            existing = {
+                item_key for (item_key,) in db.query(JobItem.item_key).filter(
+                    JobItem.job_id == job_id, JobItem.item_key.in_(list(statuses))
+                )
+            }
+            new_items = [
+                {"job_id": job_id, "item_key": item_key, "status": status, "error": error}
+                for item_key, (status, error) in statuses.items() if item_key not in existing
+            ]
+            if new_items:
+                db.execute(insert(JobItem), new_items)
+
+            done_keys = [item_key for item_key in existing if statuses[item_key][0] == "done"]
+            if done_keys:
+                db.query(JobItem).filter(JobItem.job_id == job_id, JobItem.item_key.in_(done_keys)).update(
+                    {JobItem.status: "done", JobItem.error: None}, synchronize_session=False
+                )
+            for item_key in existing - set(done_keys):
+                db.query(JobItem).filter(JobItem.job_id == job_id, JobItem.item_key == item_key).update(
+                    {JobItem.status: "failed", JobItem.error: statuses[item_key][1]}, synchronize_session=False
+                )
+
+            def count_items(status: Optional[str] = None):
+                query = select(func.count(JobItem.id)).where(JobItem.job_id == job_id)
+                if status:
+                    query = query.where(JobItem.status == status)
+                return query.scalar_subquery()
+
+            db.execute(
+                update(Job).where(Job.id == job_id).values(
+                    total_items=count_items(),
+                    done_items=count_items("done"),
+                    failed_items=count_items("failed")
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def save_result(job_id: int, result: Dict):
+        """진행 중인 작업의 중간 결과 저장 (재실행 시 이어서 처리할 정보 등)"""
+        db = SessionLocal()
+        try:
+            db.query(Job).filter(Job.id == job_id).update({Job.result: result}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def finish(job_id: int, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        """작업 종료 처리"""
+        db = SessionLocal()
+        try:
+            values = {Job.status: status, Job.result: result, Job.error: error}
+            if status in TERMINAL_STATUSES:
+                values[Job.finished_at] = datetime.utcnow()
+            db.query(Job).filter(Job.id == job_id).update(values, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def to_progress(job: Job) -> Dict:
+        """작업 진행률, 처리량, ETA 계산"""
+        done = job.done_items or 0
+        failed = job.failed_items or 0
+        total = job.total_items or 0
+        pending = max(0, total - done - failed)
+
+        elapsed = None
+        throughput = None
+        eta_seconds = None
+        if job.started_at:
+            elapsed = ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds()
+            if elapsed > 0:
+                throughput = (done + failed) / elapsed
+                if throughput > 0 and job.status not in TERMINAL_STATUSES:
+                    eta_seconds = pending / throughput
+
+        return {
+            "id": job.id,
+            "job_type": job.job_type,
+            "status": job.status,
+            "task_id": job.task_id,
+            "total": total,
+            "done": done,
+            "failed": failed,
+            "pending": pending,
+            "percent": round((done + failed) / total * 100, 2) if total else (100.0 if job.status == "completed" else 0.0),
+            "elapsed_seconds": round(elapsed, 2) if elapsed is not None else None,
+            "throughput_per_sec": round(throughput, 3) if throughput is not None else None,
+            "eta_seconds": round(eta_seconds, 1) if eta_seconds is not None else None,
+            "params": job.params,
+            "result": job.result,
+            "error": job.error,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None
+        }
+
+    @staticmethod
+    def get_progress(job_id: int) -> Optional[Dict]:
+        """작업 진행률 조회 (기본키 단건 조회)"""
+        db = SessionLocal()
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+            return JobService.to_progress(job) if job else None
+        finally:
+            db.close()
@@ -0,0 +1,100 @@
+import asyncio
+import time
+from typing import Dict, Optional
+from app.core.config import settings
+
+
+class LLMRateLimiter:
+    """OpenAI 분당 요청 수/토큰 수 예산 (토큰 버킷, 0이면 제한 없음)
+
+    호출 전에 예상 토큰(프롬프트 추정치 + max_tokens)을 예약하고, 응답의 실제 사용량으로
+    차이를 보정합니다. 대기 중인 호출은 도착 순서대로 실행됩니다.
+    """
+
+    def __init__(self, requests_per_minute: int = None, tokens_per_minute: int = None):
+        self.requests_per_minute = settings.OPENAI_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute
+        self.tokens_per_minute = settings.OPENAI_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute
+        self.available_requests = float(self.requests_per_minute)
+        self.available_tokens = float(self.tokens_per_minute)
+        self.updated_at = time.monotonic()
+        self.total_requests = 0
+        self.total_tokens = 0
+        self.waited_seconds = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        """현재 이벤트 루프에 묶인 Lock 반환"""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _refill(self):
+        """경과 시간만큼 예산 충전"""
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        if self.requests_per_minute:
+            self.available_requests = min(
+                self.requests_per_minute, self.available_requests + elapsed * self.requests_per_minute / 60
+            )
+        if self.tokens_per_minute:
+            self.available_tokens = min(
+                self.tokens_per_minute, self.available_tokens + elapsed * self.tokens_per_minute / 60
+            )
+
+    @staticmethod
+    def estimate_tokens(params: Dict) -> int:
+        """요청 토큰 수 보수적 추정 (한글 기준 약 2자당 1토큰 + max_tokens)"""
+        prompt_chars = sum(len(message.get("content") or "") for message in params.get("messages", []))
+        return prompt_chars // 2 + 1 + params.get("max_tokens", 0)
+
+    async def acquire(self, tokens: int) -> int:
+        """요청 1건과 tokens만큼의 예산이 생길 때까지 대기 후 예약 (예약한 토큰 수 반환)"""
+        if self.tokens_per_minute:
+            # A single request larger than the whole budget still has to run eventually
+            tokens = min(tokens, self.tokens_per_minute)
+
+        start = time.monotonic()
+        async with self._get_lock():
+            while True:
+                self._refill()
+                wait = 0.0
+                if self.requests_per_minute and self.available_requests < 1:
+                    wait = (1 - self.available_requests) * 60 / self.requests_per_minute
+                if self.tokens_per_minute and self.available_tokens < tokens:
+                    wait = max(wait, (tokens - self.available_tokens) * 60 / self.tokens_per_minute)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            self.available_requests -= 1
+            self.available_tokens -= tokens
+            self.total_requests += 1
+            self.waited_seconds += time.monotonic() - start
+        return tokens
+
+    def record_usage(self, reserved: int, used: int):
+        """실제 사용 토큰으로 예약분 보정"""
+        self.total_tokens += used
+        if self.tokens_per_minute:
+            self.available_tokens = min(self.tokens_per_minute, self.available_tokens + reserved - used)
+
+    def snapshot(self) -> Dict:
+        """현재 예산 상태"""
+        self._refill()
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "available_requests": round(self.available_requests, 2) if self.requests_per_minute else None,
+            "available_tokens": round(self.available_tokens) if self.tokens_per_minute else None,
+            "total_requests": self.total_requests,
+            "total_tokens": self.total_tokens,
+            "avg_wait_ms": round(self.waited_seconds / self.total_requests * 1000, 1) if self.total_requests else 0
+        }
+
+
+# Process-wide budget shared by every OpenAIService instance (one API key per process)
+llm_rate_limiter = LLMRateLimiter()
@@ -0,0 +1,195 @@
+import json
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+import httpx
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.http_client import get_openai_http_client
+from app.models.product import Product
+from app.services.openai_service import OpenAIService
+from app.services.logging_service import LoggingService
+
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class OpenAIBatchService:
+    """OpenAI Batch API로 제품 설명/SEO 메타 정보를 오프라인 일괄 생성하는 서비스
+
+    products 행으로 요청 JSONL을 만들어 업로드(start)하고, 상태를 조회(poll)하다가
+    종료되면 결과 파일을 스트리밍으로 읽어 청크 단위로 일괄 업데이트(finish)합니다.
+    폴링 간 대기는 Celery 작업 재등록으로 처리하므로 워커를 붙잡지 않습니다. 설치된 openai SDK에는
+    Batch API가 없어 공유 OpenAI HTTP 클라이언트로 REST API를 직접 호출하며,
+    OPENAI_BASE_URL을 로컬 가짜 서버로 지정하면 고정된 결과를 재생할 수 있습니다.
+    """
+
+    # operation -> (prompt builder, max_tokens)
+    OPERATIONS = {
+        "description": (OpenAIService.build_description_prompt, 800),
+        "seo": (OpenAIService.build_seo_prompt, 1000)
+    }
+
+    def __init__(self, db: Session, openai_service: OpenAIService = None):
+        self.db = db
+        self.openai_service = openai_service or OpenAIService()
+        self.base_url = (settings.OPENAI_BASE_URL or "https://api.openai.com/v1").rstrip("/")
+        self.headers = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}"}
+
+    def build_requests(self, products: List[Product], operation: str) -> List[Dict]:
+        """제품별 Chat Completions 요청 (custom_id = "{operation}-{product_id}")"""
+        build_prompt, max_tokens = self.OPERATIONS[operation]
+        return [
+            {
+                "custom_id": f"{operation}-{product.id}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self.openai_service.build_params(
+                    build_prompt(OpenAIService.product_info(product)), max_tokens=max_tokens
+                )
+            }
+            for product in products
+        ]
+
+    async def _request(self, method: str, path: str, **kwargs) -> Dict:
+        """OpenAI REST API 호출"""
+        response = await get_openai_http_client().request(
+            method, f"{self.base_url}{path}", headers=self.headers, **kwargs
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def submit(self, requests: List[Dict], operation: str) -> Dict:
+        """요청 JSONL 업로드 후 배치 작업 생성"""
+        jsonl = "\n".join(json.dumps(request, ensure_ascii=False) for request in requests).encode("utf-8")
+        uploaded = await self._request(
+            "POST", "/files",
+            data={"purpose": "batch"},
+            files={"file": (f"{operation}.jsonl", jsonl, "application/jsonl")}
+        )
+        return await self._request("POST", "/batches", json={
+            "input_file_id": uploaded["id"],
+            "endpoint": "/v1/chat/completions",
+            "completion_window": settings.OPENAI_BATCH_COMPLETION_WINDOW,
+            "metadata": {"operation": operation}
+        })
+
+    async def poll(self, batch_id: str) -> Dict:
+        """배치 작업 상태 1회 조회"""
+        batch = await self._request("GET", f"/batches/{batch_id}")
+        LoggingService.log_info(
+            f"OpenAI 배치 상태: {batch_id}, 상태: {batch['status']}, 진행: {batch.get('request_counts')}"
+        )
+        return batch
+
+    @staticmethod
+    def is_transient(error: Exception) -> bool:
+        """다시 조회하면 성공할 수 있는 오류인지 (네트워크 오류, 429, 5xx)
+
+        인증 실패(401)나 없는 배치(404) 같은 오류는 재시도해도 그대로이므로 False입니다.
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            status_code = error.response.status_code
+            return status_code == 429 or status_code >= 500
+        return isinstance(error, httpx.TransportError)
+
+    async def iter_results(self, file_id: str) -> AsyncIterator[Dict]:
+        """결과 파일을 한 줄씩 스트리밍"""
+        async with get_openai_http_client().stream(
+            "GET", f"{self.base_url}/files/{file_id}/content", headers=self.headers
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.strip():
+                    yield json.loads(line)
+
+    def _values(self, operation: str, content: str) -> Dict:
+        """생성 결과를 products 컬럼 값으로 변환 (빈 결과는 빈 딕셔너리)"""
+        if operation == "description":
+            return {"description": content} if content.strip() else {}
+        seo = self.openai_service.parse_seo_content(content)
+        return {
+            column: seo[key]
+            for column, key in (("meta_title", "meta_title"), ("meta_description", "meta_description"))
+            if seo[key]
+        }
+
+    async def apply_results(self, operation: str, file_id: str) -> Dict:
+        """결과 파일을 OPENAI_BATCH_UPDATE_SIZE개씩 모아 products에 일괄 반영"""
+        counts = {"updated": 0, "failed": 0}
+        rows: List[Dict] = []
+
+        def flush():
+            if rows:
+                self.db.execute(update(Product), rows)
+                self.db.commit()
+                counts["updated"] += len(rows)
+                rows.clear()
+
+        async for result in self.iter_results(file_id):
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                counts["failed"] += 1
+                continue
+
+            content = response["body"]["choices"][0]["message"]["content"] or ""
+            values = self._values(operation, content)
+            if not values:
+                counts["failed"] += 1
+                continue
+
+            product_id = int(result["custom_id"].rsplit("-", 1)[1])
+            rows.append({"id": product_id, **values, "updated_at": datetime.utcnow()})
+            if len(rows) >= settings.OPENAI_BATCH_UPDATE_SIZE:
+                flush()
+        flush()
+        return counts
+
+    def select_products(self, product_ids: Optional[List[int]] = None, product_type: Optional[str] = None,
+                        import_source: Optional[str] = None, limit: Optional[int] = None) -> List[Product]:
+        """배치 대상 제품 조회 (삭제되지 않은 제품, ID 순)"""
+        query = self.db.query(Product).filter(Product.deleted_at.is_(None))
+        if product_ids:
+            query = query.filter(Product.id.in_(product_ids))
+        if product_type:
+            query = query.filter(Product.product_type == product_type)
+        if import_source:
+            query = query.filter(Product.import_source == import_source)
+        return query.order_by(Product.id).limit(min(limit or settings.OPENAI_BATCH_MAX_REQUESTS,
+                                                     settings.OPENAI_BATCH_MAX_REQUESTS)).all()
+
+    async def start(self, operation: str, product_ids: Optional[List[int]] = None,
+                    product_type: Optional[str] = None, import_source: Optional[str] = None,
+                    limit: Optional[int] = None) -> Optional[Dict]:
+        """대상 제품으로 요청을 만들어 배치 제출 (대상이 없으면 None)"""
+        if operation not in self.OPERATIONS:
+            raise ValueError(f"지원하지 않는 작업입니다: {operation} (사용 가능: {', '.join(self.OPERATIONS)})")
+
+        products = self.select_products(product_ids, product_type, import_source, limit)
+        if not products:
+            return None
+
+        batch = await self.submit(self.build_requests(products, operation), operation)
+        LoggingService.log_info(f"OpenAI 배치 제출: {batch['id']}, {operation}, {len(products)}건")
+        return batch
+
+    async def finish(self, operation: str, batch: Dict) -> Dict:
+        """종료 상태가 된 배치의 결과 반영"""
+        batch_id = batch["id"]
+        result = {
+            "operation": operation,
+            "batch_id": batch_id,
+            "status": batch["status"],
+            "request_counts": batch.get("request_counts"),
+            "updated": 0,
+            "failed": 0
+        }
+        # Expired/cancelled batches still return the requests that finished
+        if batch.get("output_file_id"):
+            result.update(await self.apply_results(operation, batch["output_file_id"]))
+        elif batch["status"] != "completed":
+            raise RuntimeError(f"OpenAI 배치 작업 실패: {batch_id}, 상태: {batch['status']}, 오류: {batch.get('errors')}")
+
+        LoggingService.log_info(
+            f"OpenAI 배치 결과 반영 완료: {batch_id}, 업데이트 {result['updated']}개, 실패 {result['failed']}개"
+        )
+        return result
@@ -1,47 +1,135 @@
+import json
 import openai
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional
 from app.core.config import settings
+from app.core.http_client import get_openai_http_client
+from app.services.cache_service import llm_cache
+from app.services.llm_rate_limiter import llm_rate_limiter
 from app.services.logging_service import LoggingService
 
+
+class TruncatedResponseError(ValueError):
+    """max_tokens에 도달해 응답이 잘림 (finish_reason == "length")"""
+
+    def __init__(self, max_tokens: int):
+        super().__init__(f"응답이 max_tokens({max_tokens})에서 잘렸습니다")
+        self.max_tokens = max_tokens
+
+
 class OpenAIService:
     """OpenAI API 연동 서비스"""
     
+    SYSTEM_PROMPT = "당신은 전문적인 마케팅 콘텐츠 작성자입니다. 한국어로 명확하고 매력적인 콘텐츠를 작성해주세요."
+    
     def __init__(self):
         """OpenAI API 초기화"""
         if not settings.OPENAI_API_KEY:
             raise ValueError("OpenAI API 키가 설정되지 않았습니다. OPENAI_API_KEY를 확인해주세요.")
         
-        openai.api_key = settings.OPENAI_API_KEY
-        self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.model = settings.OPENAI_MODEL
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self._http_client = None
     
-    async def generate_content(self, prompt: str, max_tokens: int = 1000) -> str:
-        """텍스트 콘텐츠 생성"""
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "당신은 전문적인 마케팅 콘텐츠 작성자입니다. 한국어로 명확하고 매력적인 콘텐츠를 작성해주세요."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=max_tokens,
-                temperature=0.7
+    @property
+    def client(self) -> openai.AsyncOpenAI:
+        """공유 커넥션 풀을 사용하는 비동기 클라이언트 (풀이 재생성되면 함께 재생성)"""
+        http_client = get_openai_http_client()
+        if self._client is None or self._http_client is not http_client:
+            self._client = openai.AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL or None,
+                timeout=settings.OPENAI_TIMEOUT,
+                max_retries=settings.OPENAI_MAX_RETRIES,
+                http_client=http_client
             )
-            
-            content = response.choices[0].message.content
-            LoggingService.log_info(f"OpenAI 콘텐츠 생성 완료: {len(content)}자")
-            
-            return content
-            
+            self._http_client = http_client
+        return self._client
+    
+    async def generate_content(self, prompt: str, max_tokens: int = 1000, timeout: Optional[float] = None,
+                               temperature: float = 0.7, use_cache: Optional[bool] = None) -> str:
+        """텍스트 콘텐츠 생성 (실패 시 오류 안내 문구 반환)"""
+        try:
+            return await self.generate(prompt, max_tokens, timeout, temperature, use_cache)
+        # asyncio.CancelledError is not an Exception subclass, so cancellation propagates
         except Exception as e:
             LoggingService.log_error(f"OpenAI 콘텐츠 생성 실패: {str(e)}")
             return "콘텐츠 생성 중 오류가 발생했습니다."
     
+    async def generate(self, prompt: str, max_tokens: int = 1000, timeout: Optional[float] = None,
+                       temperature: float = 0.7, use_cache: Optional[bool] = None,
+                       response_format: Optional[Dict] = None,
+                       validate: Optional[Callable[[str], Any]] = None,
+                       allow_truncated: bool = True) -> str:
+        """텍스트 콘텐츠 생성 (실패 시 예외 발생)
+        
+        이벤트 루프를 막지 않으며, 호출한 작업이 취소되면 진행 중인 요청도 함께 취소됩니다.
+        모델/시스템 프롬프트/사용자 프롬프트/샘플링 파라미터가 같으면 캐시된 결과를 반환합니다.
+        use_cache가 None이면 temperature가 LLM_CACHE_MAX_TEMPERATURE 이하일 때만 캐시하고,
+        False면 캐시를 조회/저장하지 않습니다 (재생성 등). validate가 예외를 발생시킨
+        응답은 캐시하지 않습니다. allow_truncated가 False면 max_tokens에서 잘린 응답에
+        TruncatedResponseError를 발생시킵니다 (캐시되지 않음).
+        """
+        params = self.build_params(prompt, max_tokens, temperature, response_format)
+        if use_cache is None:
+            use_cache = temperature <= settings.LLM_CACHE_MAX_TEMPERATURE
+        
+        async def fetch() -> str:
+            content = await self._complete(params, timeout, allow_truncated)
+            if validate:
+                validate(content)
+            return content
+        
+        if not use_cache:
+            return await fetch()
+        return await llm_cache.get_or_fetch(
+            llm_cache.make_content_key("chat", params),
+            fetch,
+            ttl=settings.LLM_CACHE_TTL
+        )
+    
+    def build_params(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7,
+                     response_format: Optional[Dict] = None) -> Dict:
+        """Chat Completions 요청 본문 (실시간 호출과 Batch API 요청이 같은 형식 사용)"""
+        params = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self.SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+        if response_format:
+            params["response_format"] = response_format
+        return params
+    
+    async def _complete(self, params: Dict, timeout: Optional[float] = None, allow_truncated: bool = True) -> str:
+        """Chat Completions API 호출 (분당 요청/토큰 예산 내에서 실행, 실패 시 예외 발생)"""
+        reserved = await llm_rate_limiter.acquire(llm_rate_limiter.estimate_tokens(params))
+        
+        response = await self.client.chat.completions.create(
+            **params,
+            timeout=timeout or settings.OPENAI_TIMEOUT
+        )
+        if response.usage is not None:
+            llm_rate_limiter.record_usage(reserved, response.usage.total_tokens)
+        
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            LoggingService.log_warning(f"OpenAI 응답이 max_tokens({params['max_tokens']})에서 잘림")
+            if not allow_truncated:
+                raise TruncatedResponseError(params["max_tokens"])
+        
+        content = choice.message.content
+        LoggingService.log_info(f"OpenAI 콘텐츠 생성 완료: {len(content)}자")
+        return content
+    
     async def generate_sns_content(self, product_info: Dict, platform: str, content_type: str = "post") -> Dict:
         """SNS용 콘텐츠 생성"""
         try:
@@ -100,10 +188,20 @@ class OpenAIService:
                 "full_content": "콘텐츠 생성 중 오류가 발생했습니다."
             }
     
-    async def generate_product_description(self, product_info: Dict) -> str:
-        """제품 설명 생성"""
-        try:
-            prompt = f"""
+    @staticmethod
+    def product_info(product) -> Dict:
+        """Product 모델에서 프롬프트에 사용할 제품 정보 추출"""
+        return {
+            "title": product.title,
+            "description": product.description or "",
+            "price": product.price or 0,
+            "product_type": product.product_type or ""
+        }
+    
+    @staticmethod
+    def build_description_prompt(product_info: Dict) -> str:
+        """제품 설명 생성 프롬프트"""
+        return f"""
             다음 제품 정보를 바탕으로 매력적인 제품 설명을 작성해주세요:
             
             제품명: {product_info.get('title', '')}
@@ -119,20 +217,11 @@ class OpenAIService:
             
             한국어로 작성하고, HTML 태그를 사용하여 구조화해주세요.
             """
-            
-            description = await self.generate_content(prompt, max_tokens=800)
-            LoggingService.log_info(f"제품 설명 생성 완료")
-            
-            return description
-            
-        except Exception as e:
-            LoggingService.log_error(f"제품 설명 생성 실패: {str(e)}")
-            return product_info.get('description', '제품 설명을 생성할 수 없습니다.')
     
-    async def generate_seo_content(self, product_info: Dict) -> Dict:
-        """SEO 최적화 콘텐츠 생성"""
-        try:
-            prompt = f"""
+    @staticmethod
+    def build_seo_prompt(product_info: Dict) -> str:
+        """SEO 메타 정보 생성 프롬프트"""
+        return f"""
             다음 제품 정보를 바탕으로 SEO 최적화된 메타 정보를 생성해주세요:
             
             제품명: {product_info.get('title', '')}
@@ -147,25 +236,49 @@ class OpenAIService:
             
             검색 엔진 최적화를 고려하여 작성해주세요.
             """
+    
+    @staticmethod
+    def parse_seo_content(content: str) -> Dict:
+        """생성된 텍스트에서 메타 타이틀/메타 설명/키워드 추출"""
+        result = {
+            "meta_title": "",
+            "meta_description": "",
+            "keywords": ""
+        }
+        
+        for line in content.split('\n'):
+            line = line.strip()
+            if line.startswith('메타 타이틀:'):
+                result["meta_title"] = line.replace('메타 타이틀:', '').strip()
+            elif line.startswith('메타 설명:'):
+                result["meta_description"] = line.replace('메타 설명:', '').strip()
+            elif line.startswith('키워드:'):
+                result["keywords"] = line.replace('키워드:', '').strip()
+        
+        return result
+    
+    async def generate_product_description(self, product_info: Dict) -> str:
+        """제품 설명 생성"""
+        try:
+            prompt = self.build_description_prompt(product_info)
             
-            content = await self.generate_content(prompt)
+            description = await self.generate_content(prompt, max_tokens=800)
+            LoggingService.log_info(f"제품 설명 생성 완료")
             
-            # Parse the response
-            lines = content.split('\n')
-            result = {
-                "meta_title": "",
-                "meta_description": "",
-                "keywords": ""
-            }
+            return description
             
-            for line in lines:
-                line = line.strip()
-                if line.startswith('메타 타이틀:'):
-                    result["meta_title"] = line.replace('메타 타이틀:', '').strip()
-                elif line.startswith('메타 설명:'):
-                    result["meta_description"] = line.replace('메타 설명:', '').strip()
-                elif line.startswith('키워드:'):
-                    result["keywords"] = line.replace('키워드:', '').strip()
+        except Exception as e:
+            LoggingService.log_error(f"제품 설명 생성 실패: {str(e)}")
+            return product_info.get('description', '제품 설명을 생성할 수 없습니다.')
+    
+    async def generate_seo_content(self, product_info: Dict) -> Dict:
+        """SEO 최적화 콘텐츠 생성"""
+        try:
+            prompt = self.build_seo_prompt(product_info)
+            
+            content = await self.generate_content(prompt)
+            
+            result = self.parse_seo_content(content)
             
             LoggingService.log_info(f"SEO 콘텐츠 생성 완료")
             return result
@@ -178,6 +291,135 @@ class OpenAIService:
                 "keywords": product_info.get('product_type', '')
             }
     
+    @staticmethod
+    def build_enrichment_prompt(product_info: Dict, platforms: List[str], content_type: str = "post") -> str:
+        """제품 설명/SEO/SNS/감정 분석을 한 번에 요청하는 프롬프트 (JSON 응답)"""
+        sns_example = ", ".join(
+            f'"{platform}": {{"title": "...", "description": "...", "hashtags": ["#..."], "cta": "..."}}'
+            for platform in platforms
+        )
+        return f"""
+            제품 정보:
+            - 제품명: {product_info.get('title', '')}
+            - 설명: {product_info.get('description', '')}
+            - 가격: ${product_info.get('price', 0)}
+            - 카테고리: {product_info.get('product_type', '')}
+            
+            위 제품에 대해 다음을 모두 작성하고, 아래 구조의 JSON 객체 하나로만 응답해주세요:
+            
+            1. description: 주요 특징과 장점, 활용법, 구매 이유, 품질 보증/서비스를 포함한 HTML 제품 설명
+            2. seo: 메타 타이틀(50-60자), 메타 설명(150-160자), 주요 키워드 목록
+            3. sns: 플랫폼별({', '.join(platforms)}) {content_type} 콘텐츠 - 제목, 홍보 설명, 해시태그(최대 20개), 행동 유도 문구
+            4. sentiment: 감정 점수(1-10점, 10점이 가장 긍정적), 주요 감정(긍정적/부정적/중립), 개선 제안 목록
+            
+            {{
+              "description": "<p>...</p>",
+              "seo": {{"meta_title": "...", "meta_description": "...", "keywords": ["..."]}},
+              "sns": {{{sns_example}}},
+              "sentiment": {{"score": 7, "sentiment": "긍정적", "improvements": ["..."]}}
+            }}
+            
+            한국어로 작성하고, 각 플랫폼의 특성에 맞게 최적화해주세요.
+            """
+    
+    @staticmethod
+    def parse_enrichment(content: str, platforms: List[str]) -> Dict:
+        """enrich_product JSON 응답 파싱/검증 (형식이 맞지 않으면 ValueError)"""
+        data = json.loads(content)
+        if not isinstance(data, dict):
+            raise ValueError("응답이 JSON 객체가 아닙니다.")
+        
+        def section(parent: Dict, key: str) -> Dict:
+            value = parent.get(key)
+            if not isinstance(value, dict):
+                raise ValueError(f"응답에 {key} 항목이 없습니다.")
+            return value
+        
+        def text(parent: Dict, key: str, required: bool = True) -> str:
+            value = parent.get(key)
+            if isinstance(value, list):
+                value = ", ".join(str(item).strip() for item in value if str(item).strip())
+            value = str(value).strip() if value is not None else ""
+            if required and not value:
+                raise ValueError(f"응답에 {key} 값이 없습니다.")
+            return value
+        
+        seo = section(data, "seo")
+        sns = section(data, "sns")
+        sentiment = section(data, "sentiment")
+        
+        sns_content = {}
+        for platform in platforms:
+            post = section(sns, platform)
+            hashtags = post.get("hashtags")
+            sns_content[platform] = {
+                "title": text(post, "title"),
+                "description": text(post, "description"),
+                "hashtags": " ".join(hashtags) if isinstance(hashtags, list) else text(post, "hashtags", required=False),
+                "cta": text(post, "cta", required=False)
+            }
+        
+        try:
+            score = max(1, min(10, int(sentiment.get("score", 5))))
+        except (TypeError, ValueError):
+            score = 5
+        improvements = sentiment.get("improvements") or []
+        
+        return {
+            "description": text(data, "description"),
+            "seo": {
+                "meta_title": text(seo, "meta_title"),
+                "meta_description": text(seo, "meta_description"),
+                "keywords": text(seo, "keywords", required=False)
+            },
+            "sns": sns_content,
+            "sentiment": {
+                "sentiment_score": score,
+                "sentiment": text(sentiment, "sentiment", required=False) or "중립",
+                "improvements": [str(item) for item in improvements] if isinstance(improvements, list) else [str(improvements)]
+            }
+        }
+    
+    async def enrich_product(self, product_info: Dict, platforms: List[str], content_type: str = "post",
+                             use_cache: Optional[bool] = None) -> Dict:
+        """제품 설명/SEO/SNS 콘텐츠/감정 분석을 JSON 응답 한 번의 호출로 생성 (실패 시 예외 발생)
+        
+        제품 정보를 한 번만 보내므로 항목별 개별 호출보다 호출 수와 입력 토큰이 줄어듭니다.
+        형식이 맞지 않는 응답은 캐시하지 않으므로 한 번 더 요청하면 새로 생성됩니다.
+        max_tokens에서 잘린 응답은 OPENAI_ENRICH_MAX_TOKENS_LIMIT까지 max_tokens를 두 배로
+        늘려 다시 요청하고, 한도에서도 잘리면 TruncatedResponseError를 발생시킵니다.
+        """
+        prompt = self.build_enrichment_prompt(product_info, platforms, content_type)
+        max_tokens = settings.OPENAI_ENRICH_MAX_TOKENS
+        
+        def validate(content: str):
+            self.parse_enrichment(content, platforms)
+        
+        attempt = 0
+        while True:
+            try:
+                content = await self.generate(
+                    prompt,
+                    max_tokens=max_tokens,
+                    use_cache=use_cache,
+                    response_format={"type": "json_object"},
+                    validate=validate,
+                    allow_truncated=False
+                )
+                result = self.parse_enrichment(content, platforms)
+                LoggingService.log_info(f"제품 통합 콘텐츠 생성 완료: {product_info.get('title', '')}")
+                return result
+            except TruncatedResponseError:
+                if max_tokens >= settings.OPENAI_ENRICH_MAX_TOKENS_LIMIT:
+                    raise
+                max_tokens = min(max_tokens * 2, settings.OPENAI_ENRICH_MAX_TOKENS_LIMIT)
+                LoggingService.log_warning(f"제품 통합 콘텐츠 응답 잘림, max_tokens {max_tokens}로 재시도")
+            except ValueError as e:
+                attempt += 1
+                LoggingService.log_warning(f"제품 통합 콘텐츠 응답 형식 오류 (시도 {attempt}): {str(e)}")
+                if attempt >= 2:
+                    raise
+    
     async def analyze_product_sentiment(self, product_info: Dict) -> Dict:
         """제품 감정 분석"""
         try:
@@ -256,12 +498,13 @@ class OpenAIService:
     async def test_connection(self) -> bool:
         """OpenAI API 연결 테스트"""
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+            response = await self.client.chat.completions.create(
+                model=self.model,
                 messages=[
                     {"role": "user", "content": "Hello"}
                 ],
-                max_tokens=10
+                max_tokens=10,
+                timeout=settings.OPENAI_CONNECT_TIMEOUT
             )
             return bool(response.choices[0].message.content)
         except Exception as e:
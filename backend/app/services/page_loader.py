@@ -0,0 +1,137 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from playwright.async_api import Error as PlaywrightError, Page, Request, Route
+from app.core.config import settings
+
+
+def _split_setting(value: str) -> List[str]:
+    """쉼표 구분 설정값을 리스트로 변환"""
+    return [item.strip().lower() for item in value.split(',') if item.strip()]
+
+
+def _host_matches(host: str, domains: List[str]) -> bool:
+    """호스트가 도메인 목록(하위 도메인 포함)에 속하는지 확인"""
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+class ScrapeStats:
+    """작업별 스크래핑 대역폭/렌더링 시간 누적 통계"""
+
+    def __init__(self):
+        self.operations: Dict[str, Dict] = {}
+
+    def record(self, operation: str, metrics: Dict):
+        """호출 1회 지표 누적"""
+        totals = self.operations.setdefault(operation, {
+            "calls": 0, "bytes": 0, "requests": 0, "blocked_requests": 0, "render_ms": 0.0
+        })
+        totals["calls"] += 1
+        totals["bytes"] += metrics["bytes"]
+        totals["requests"] += metrics["requests"]
+        totals["blocked_requests"] += metrics["blocked_requests"]
+        totals["render_ms"] += metrics["render_ms"]
+
+    def summary(self) -> Dict[str, Dict]:
+        """작업별 평균 지표"""
+        result = {}
+        for operation, totals in self.operations.items():
+            calls = totals["calls"] or 1
+            result[operation] = {
+                **totals,
+                "render_ms": round(totals["render_ms"], 1),
+                "avg_bytes": round(totals["bytes"] / calls),
+                "avg_render_ms": round(totals["render_ms"] / calls, 1),
+                "avg_blocked_requests": round(totals["blocked_requests"] / calls, 1)
+            }
+        return result
+
+
+class PageLoader:
+    """요청 차단(이미지/미디어/폰트/분석 도구/서드파티)과 경량 로딩을 적용한 페이지 로더"""
+
+    def __init__(self, lightweight: bool = None, blocked_resource_types: Optional[List[str]] = None,
+                 blocked_domains: Optional[List[str]] = None, allowed_domains: Optional[List[str]] = None):
+        self.lightweight = settings.SCRAPER_LIGHTWEIGHT_MODE if lightweight is None else lightweight
+        self.blocked_resource_types = set(
+            blocked_resource_types or _split_setting(settings.SCRAPER_BLOCKED_RESOURCE_TYPES)
+        )
+        self.blocked_domains = blocked_domains or _split_setting(settings.SCRAPER_BLOCKED_DOMAINS)
+        # First-party domains; anything else is treated as third-party and aborted
+        self.allowed_domains = allowed_domains or _split_setting(settings.SCRAPER_ALLOWED_DOMAINS)
+        self.stats = ScrapeStats()
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """요청 차단 여부"""
+        if resource_type in self.blocked_resource_types:
+            return True
+        host = (urlparse(url).hostname or "").lower()
+        if not host:
+            return False
+        if _host_matches(host, self.blocked_domains):
+            return True
+        return bool(self.allowed_domains) and not _host_matches(host, self.allowed_domains)
+
+    @staticmethod
+    async def _count_bytes(request: Request, metrics: Dict):
+        """완료된 요청의 실제 응답 본문 크기 누적 (chunked/압축 응답 포함)"""
+        try:
+            sizes = await request.sizes()
+            metrics["bytes"] += sizes["responseBodySize"]
+            return
+        except (PlaywrightError, KeyError):
+            pass
+
+        # Fall back to the declared length, then to the body itself
+        try:
+            response = await request.response()
+            if response is not None:
+                length = response.headers.get("content-length") or ""
+                size = int(length) if length.isdigit() else len(await response.body())
+                metrics["bytes"] += size
+        except PlaywrightError:
+            pass
+
+    async def load(self, page: Page, url: str, wait_selector: str, operation: str,
+                   timeout: int = 10000) -> Dict:
+        """페이지를 로드하고 셀렉터가 나타날 때까지 대기 후 호출 지표 반환"""
+        metrics = {"url": url, "bytes": 0, "requests": 0, "blocked_requests": 0, "render_ms": 0.0}
+
+        async def handle_route(route: Route):
+            request = route.request
+            if self.should_block(request.url, request.resource_type):
+                metrics["blocked_requests"] += 1
+                await route.abort()
+            else:
+                await route.continue_()
+
+        pending = set()
+
+        def handle_finished(request: Request):
+            metrics["requests"] += 1
+            task = asyncio.create_task(self._count_bytes(request, metrics))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        if self.lightweight:
+            await page.route("**/*", handle_route)
+        page.on("requestfinished", handle_finished)
+
+        start = time.perf_counter()
+        try:
+            await page.goto(url, wait_until="domcontentloaded" if self.lightweight else "load")
+            await page.wait_for_selector(wait_selector, timeout=timeout)
+            metrics["render_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        finally:
+            page.remove_listener("requestfinished", handle_finished)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        # Keyed by mode so lightweight and full loads can be compared side by side
+        self.stats.record(f"{operation}:{'lightweight' if self.lightweight else 'full'}", metrics)
+        return metrics
+
+
+# Process-wide loader so statistics cover every scrape
+page_loader = PageLoader()
@@ -0,0 +1,125 @@
+import json
+import math
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from app.core.config import settings
+
+_NON_PRICE_CHARS = r"[^\d.]"
+
+# Used when PRICING_RULES is empty: 50% markup, no rounding, fixed inventory (previous behaviour)
+DEFAULT_PRICING_RULES = {
+    "source_currency": "USD",
+    "store_currency": "USD",
+    "exchange_rates": {"USD": 1.0},
+    "default": {"markup": 1.5, "fixed": 0.0, "round_to": None, "inventory": 100, "variant_inventory": 50},
+    "rules": []
+}
+
+
+class PricingTable:
+    """컴파일된 가격 규칙 테이블
+
+    규칙은 카테고리 지정 규칙 → 공통 규칙 순서로, 같은 그룹 안에서는 설정 순서대로
+    처음 일치하는 규칙이 적용됩니다. 원가 구간(min_cost 이상, max_cost 미만)은 알리익스프레스
+    원가(source_currency) 기준이며, 일치하는 규칙이 없으면 default가 적용됩니다.
+    """
+
+    def __init__(self, config: Dict):
+        default = {**DEFAULT_PRICING_RULES["default"], **config.get("default", {})}
+        rates = {**DEFAULT_PRICING_RULES["exchange_rates"], **config.get("exchange_rates", {})}
+        source = config.get("source_currency", DEFAULT_PRICING_RULES["source_currency"])
+        self.store_currency = config.get("store_currency", DEFAULT_PRICING_RULES["store_currency"])
+        if source not in rates or self.store_currency not in rates:
+            raise ValueError(f"환율 정보가 없는 통화입니다: {source} -> {self.store_currency}")
+        self.exchange_rate = rates[self.store_currency] / rates[source]
+
+        rules = config.get("rules", [])
+        ordered = [rule for rule in rules if rule.get("category")] + [rule for rule in rules if not rule.get("category")]
+        merged = [{**default, **rule} for rule in ordered] + [default]
+
+        # Column arrays indexed by rule position; the last entry is the default rule
+        self.categories = [rule.get("category") for rule in ordered]
+        self.min_cost = np.array([rule.get("min_cost", 0.0) for rule in ordered], dtype=float)
+        self.max_cost = np.array([rule.get("max_cost", math.inf) for rule in ordered], dtype=float)
+        self.markup = np.array([rule["markup"] for rule in merged], dtype=float)
+        self.fixed = np.array([rule["fixed"] for rule in merged], dtype=float)
+        self.round_to = np.array([np.nan if rule["round_to"] is None else rule["round_to"] for rule in merged], dtype=float)
+        self.inventory = np.array([rule["inventory"] for rule in merged], dtype=np.int64)
+        self.variant_inventory = np.array([rule["variant_inventory"] for rule in merged], dtype=np.int64)
+
+    def match(self, costs: np.ndarray, categories: Optional[Sequence[Optional[str]]] = None) -> np.ndarray:
+        """원가/카테고리별로 적용할 규칙 인덱스 (처음 일치한 규칙)"""
+        rule_index = np.full(len(costs), len(self.categories), dtype=np.int64)
+        if not self.categories:
+            return rule_index
+
+        category_array = np.asarray(categories if categories is not None else [None] * len(costs), dtype=object)
+        unmatched = np.ones(len(costs), dtype=bool)
+        # Rules are few, rows are many: one vectorized pass per rule
+        for position, category in enumerate(self.categories):
+            hit = unmatched & (costs >= self.min_cost[position]) & (costs < self.max_cost[position])
+            if category:
+                hit &= category_array == category
+            rule_index[hit] = position
+            unmatched &= ~hit
+        return rule_index
+
+    def apply(self, costs: Sequence[float], categories: Optional[Sequence[Optional[str]]] = None) -> Dict[str, np.ndarray]:
+        """원가 배열에 규칙을 한 번에 적용해 판매가/비교가/재고 배열 반환 (판매가/비교가는 store_currency)"""
+        costs = np.asarray(costs, dtype=float)
+        rule_index = self.match(costs, categories)
+        converted = costs * self.exchange_rate
+
+        prices = np.where(converted > 0, converted * self.markup[rule_index] + self.fixed[rule_index], 0.0)
+        # Psychological price endings, e.g. round_to=0.99 turns 12.30 into 12.99
+        round_to = self.round_to[rule_index]
+        # Round to cents before ceil so float noise (12.66 * 1.5 = 18.990000000000002) stays at 18.99
+        rounded = np.round(np.ceil(np.round(prices - round_to, 2)) + round_to, 2)
+        prices = np.where(np.isnan(round_to) | (prices <= 0), prices, rounded)
+
+        return {
+            "price": prices,
+            "compare_at_price": converted,
+            "inventory": self.inventory[rule_index],
+            "variant_inventory": self.variant_inventory[rule_index]
+        }
+
+
+@lru_cache(maxsize=8)
+def _compile(rules_json: str) -> PricingTable:
+    """규칙 JSON을 한 번만 파싱/컴파일"""
+    return PricingTable(json.loads(rules_json) if rules_json else DEFAULT_PRICING_RULES)
+
+
+def get_pricing_table(rules: Optional[Dict] = None) -> PricingTable:
+    """가격 규칙 테이블 반환 (인자가 없으면 PRICING_RULES 설정 사용, 결과는 캐시)"""
+    if rules is None:
+        return _compile(settings.PRICING_RULES)
+    return _compile(json.dumps(rules, sort_keys=True))
+
+
+def parse_prices(price_strs: List) -> List[float]:
+    """가격 문자열 목록을 한 번에 숫자로 변환 (AliExpressService._extract_price와 동일 규칙)
+
+    행마다 숫자/소수점 외 문자를 제거하고, 숫자로 읽을 수 없는 값(빈 값, "1.2.3" 등)은 0으로 둡니다.
+    """
+    if not price_strs:
+        return []
+    cleaned = pd.Series([str(price_str or '') for price_str in price_strs], dtype=object).str.replace(
+        _NON_PRICE_CHARS, "", regex=True
+    )
+    return pd.to_numeric(cleaned, errors="coerce").fillna(0.0).astype(float).tolist()
+
+
+def split_costs(products: List[Dict]) -> Tuple[List[float], List[int]]:
+    """제품/변형 가격을 하나의 원가 목록으로 펼침 (제품별 변형 개수 함께 반환)"""
+    price_strs = []
+    variant_counts = []
+    for product in products:
+        price_strs.append(product.get('price', '0'))
+        variants = product.get('variants') or []
+        price_strs.extend(variant.get('price', '0') for variant in variants)
+        variant_counts.append(len(variants))
+    return parse_prices(price_strs), variant_counts
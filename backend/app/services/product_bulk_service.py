@@ -0,0 +1,113 @@
+from datetime import datetime
+from typing import List, Dict, Optional, Iterable
+from sqlalchemy import insert, update, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.models.product import Product
+
+# Columns never overwritten by an upsert
+PROTECTED_COLUMNS = {"id", "shopify_id", "created_at"}
+
+
+class ProductBulkService:
+    """Product 행 대량 upsert 서비스 (shopify_id 기준)"""
+
+    @staticmethod
+    def _chunks(rows: Iterable[Dict], chunk_size: int) -> Iterable[List[Dict]]:
+        """행을 chunk_size 단위로 분할 (청크 내 중복 shopify_id는 마지막 값 사용)"""
+        chunk: Dict[str, Dict] = {}
+        for row in rows:
+            chunk[str(row["shopify_id"])] = row
+            if len(chunk) >= chunk_size:
+                yield list(chunk.values())
+                chunk = {}
+        if chunk:
+            yield list(chunk.values())
+
+    @staticmethod
+    def _normalize(chunk: List[Dict], insert_defaults: Dict) -> List[List[Dict]]:
+        """청크를 컬럼 구성이 같은 행끼리 묶어 반환
+
+        입력에 없는 컬럼은 채우지 않으므로 upsert가 기존 값을 NULL로 덮어쓰지 않습니다.
+        insert_defaults는 행에 없는 경우에만 추가되며 신규 행에만 적용됩니다.
+        """
+        now = datetime.utcnow()
+        groups: Dict[frozenset, List[Dict]] = {}
+        for row in chunk:
+            values = {**insert_defaults, **row}
+            values["shopify_id"] = str(row["shopify_id"])
+            values.setdefault("created_at", now)
+            values["updated_at"] = now
+            groups.setdefault(frozenset(values), []).append(values)
+        return list(groups.values())
+
+    @classmethod
+    def upsert_products(cls, db: Session, products: Iterable[Dict], chunk_size: int = 500,
+                        insert_defaults: Optional[Dict] = None) -> Dict[str, int]:
+        """제품 딕셔너리를 청크 단위로 upsert (커밋은 호출자가 수행)
+
+        PostgreSQL에서는 multi-row INSERT ... ON CONFLICT (shopify_id) DO UPDATE를,
+        그 외(SQLite 테스트 등)에서는 executemany INSERT/UPDATE를 사용합니다.
+        기존 행은 입력에 있는 컬럼만 갱신하며, insert_defaults의 컬럼은 신규 행에만 적용됩니다.
+        """
+        insert_defaults = insert_defaults or {}
+        is_postgres = db.get_bind().dialect.name == "postgresql"
+        totals = {"inserted": 0, "updated": 0}
+
+        for chunk in cls._chunks(products, chunk_size):
+            for rows in cls._normalize(chunk, insert_defaults):
+                if is_postgres:
+                    counts = cls._upsert_postgres(db, rows, insert_defaults)
+                else:
+                    counts = cls._upsert_executemany(db, rows, insert_defaults)
+                totals["inserted"] += counts["inserted"]
+                totals["updated"] += counts["updated"]
+
+        return totals
+
+    @staticmethod
+    def _upsert_postgres(db: Session, rows: List[Dict], insert_defaults: Dict) -> Dict[str, int]:
+        """PostgreSQL multi-row INSERT ... ON CONFLICT DO UPDATE"""
+        stmt = pg_insert(Product.__table__).values(rows)
+        update_columns = {
+            column: stmt.excluded[column]
+            for column in rows[0]
+            if column not in PROTECTED_COLUMNS and column not in insert_defaults
+        }
+        # xmax is 0 only for freshly inserted tuples
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Product.__table__.c.shopify_id],
+            set_=update_columns
+        ).returning(literal_column("(xmax = 0)").label("inserted"))
+
+        results = db.execute(stmt).all()
+        inserted = sum(1 for result in results if result.inserted)
+        return {"inserted": inserted, "updated": len(results) - inserted}
+
+    @staticmethod
+    def _upsert_executemany(db: Session, rows: List[Dict], insert_defaults: Dict) -> Dict[str, int]:
+        """기존 행 조회 후 executemany INSERT/UPDATE (SQLite 등)"""
+        existing = dict(
+            db.query(Product.shopify_id, Product.id).filter(
+                Product.shopify_id.in_([row["shopify_id"] for row in rows])
+            ).all()
+        )
+
+        new_rows = [row for row in rows if row["shopify_id"] not in existing]
+        updated_rows = [
+            {
+                "id": existing[row["shopify_id"]],
+                **{
+                    column: value for column, value in row.items()
+                    if column not in PROTECTED_COLUMNS and column not in insert_defaults
+                }
+            }
+            for row in rows if row["shopify_id"] in existing
+        ]
+
+        if new_rows:
+            db.execute(insert(Product), new_rows)
+        if updated_rows:
+            db.execute(update(Product), updated_rows)
+
+        return {"inserted": len(new_rows), "updated": len(updated_rows)}
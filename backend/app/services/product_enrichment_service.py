@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.product import Product
+from app.models.sns_content import SNSContent
+from app.services.openai_service import OpenAIService
+from app.services.logging_service import LoggingService
+
+
+class ProductEnrichmentService:
+    """제품 설명/SEO/SNS 콘텐츠/감정 분석을 한 번의 LLM 호출로 생성해 함께 저장하는 서비스"""
+
+    def __init__(self, db: Session, openai_service: OpenAIService = None):
+        self.db = db
+        self.openai_service = openai_service or OpenAIService()
+
+    @staticmethod
+    def sns_values(product: Product, platform: str, content_type: str, post: Dict) -> Dict:
+        """구조화된 SNS 콘텐츠로 SNSContent 컬럼 값 구성 (generated_content는 기존 텍스트 형식 유지)"""
+        return {
+            "product_id": product.id,
+            "platform": platform,
+            "content_type": content_type,
+            "title": post["title"],
+            "description": post["description"],
+            "hashtags": post["hashtags"],
+            "generated_content": (
+                f"제목: {post['title']}\n설명: {post['description']}\n"
+                f"해시태그: {post['hashtags']}\nCTA: {post['cta']}"
+            ),
+            "generated_hashtags": post["hashtags"],
+            "image_urls": [product.image_url] if product.image_url else []
+        }
+
+    async def enrich(self, product: Product, platforms: List[str], content_type: str = "post",
+                     use_cache: Optional[bool] = None) -> Dict:
+        """통합 콘텐츠 생성 후 제품 필드와 SNS 콘텐츠를 한 트랜잭션으로 저장"""
+        result = await self.openai_service.enrich_product(
+            OpenAIService.product_info(product), platforms, content_type, use_cache=use_cache
+        )
+
+        try:
+            product.description = result["description"]
+            product.meta_title = result["seo"]["meta_title"]
+            product.meta_description = result["seo"]["meta_description"]
+            product.ai_analysis = {
+                "keywords": result["seo"]["keywords"],
+                "sentiment": result["sentiment"],
+                "model": self.openai_service.model,
+                "enriched_at": datetime.utcnow().isoformat()
+            }
+            self.db.execute(insert(SNSContent), [
+                self.sns_values(product, platform, content_type, post)
+                for platform, post in result["sns"].items()
+            ])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        LoggingService.log_info(f"제품 통합 콘텐츠 저장 완료: {product.id}, SNS {len(result['sns'])}개")
+        return result
@@ -0,0 +1,176 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Set
+from sqlalchemy.orm import Session
+from app.models.product import Product
+from app.models.sync_state import ShopifySyncState
+from app.services.shopify_service import ShopifyService
+from app.services.product_bulk_service import ProductBulkService
+from app.services.logging_service import LoggingService
+
+
+class ProductSyncService:
+    """Shopify 제품을 products 테이블로 동기화하는 서비스"""
+
+    def __init__(self, db: Session, shopify_service: Optional[ShopifyService] = None, chunk_size: int = 500):
+        self.db = db
+        self.shopify_service = shopify_service or ShopifyService()
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def _to_float(value) -> Optional[float]:
+        """문자열/숫자 가격을 float로 변환"""
+        try:
+            return float(value) if value not in (None, '') else None
+        except (ValueError, TypeError):
+            return None
+
+    @classmethod
+    def shopify_to_product_row(cls, shopify_product: Dict) -> Dict:
+        """Shopify 제품(REST 형식)을 Product 컬럼 딕셔너리로 변환"""
+        variants = shopify_product.get('variants') or []
+        images = shopify_product.get('images') or []
+        first_variant = variants[0] if variants else {}
+        image_urls = [image.get('src') for image in images if image.get('src')]
+
+        return {
+            "shopify_id": str(shopify_product['id']),
+            "title": shopify_product.get('title') or '',
+            "description": shopify_product.get('body_html'),
+            "price": cls._to_float(first_variant.get('price')),
+            "compare_at_price": cls._to_float(first_variant.get('compare_at_price')),
+            "vendor": shopify_product.get('vendor'),
+            "product_type": shopify_product.get('product_type'),
+            "tags": shopify_product.get('tags'),
+            "status": shopify_product.get('status') or "active",
+            "published_at": shopify_product.get('published_at'),
+            "image_url": image_urls[0] if image_urls else None,
+            "images": image_urls,
+            "inventory_quantity": sum(variant.get('inventory_quantity') or 0 for variant in variants),
+            "variants": variants,
+            "handle": shopify_product.get('handle'),
+            "template_suffix": shopify_product.get('template_suffix'),
+            "published_scope": shopify_product.get('published_scope'),
+            "deleted_at": None
+        }
+
+    @staticmethod
+    def _parse_shopify_datetime(value: Optional[str]) -> Optional[datetime]:
+        """Shopify ISO 8601 시각을 naive UTC datetime으로 변환"""
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+
+    def upsert_rows(self, rows: List[Dict]) -> Dict[str, int]:
+        """shopify_id 기준으로 제품 행 대량 upsert"""
+        counts = ProductBulkService.upsert_products(
+            self.db, rows, chunk_size=self.chunk_size,
+            insert_defaults={"import_source": "shopify"}
+        )
+        self.db.commit()
+        return counts
+
+    def _get_sync_state(self) -> ShopifySyncState:
+        """쇼핑몰 동기화 상태 조회 (없으면 생성)"""
+        shop_url = self.shopify_service.shop_url
+        state = self.db.query(ShopifySyncState).filter(ShopifySyncState.shop_url == shop_url).first()
+        if state is None:
+            state = ShopifySyncState(shop_url=shop_url)
+            self.db.add(state)
+            self.db.flush()
+        return state
+
+    async def sync_products(self, full: bool = False) -> Dict[str, int]:
+        """high-water mark 이후 변경된 제품만 가져와 upsert (full=True면 전체 동기화)"""
+        state = self._get_sync_state()
+        high_water = state.last_updated_at
+        updated_at_min = None
+        if high_water and not full:
+            # updated_at_min is inclusive; step back slightly to absorb clock skew
+            updated_at_min = (high_water - timedelta(seconds=1)).replace(tzinfo=timezone.utc)
+
+        previous_high_water = high_water
+        created = 0
+        totals = {"inserted": 0, "updated": 0, "deleted": 0}
+        async for page in self.shopify_service.iter_products(updated_at_min=updated_at_min, pages=True):
+            if not page:
+                continue
+            for key, count in self.upsert_rows([self.shopify_to_product_row(p) for p in page]).items():
+                totals[key] += count
+            for shopify_product in page:
+                updated_at = self._parse_shopify_datetime(shopify_product.get('updated_at'))
+                if updated_at and (high_water is None or updated_at > high_water):
+                    high_water = updated_at
+                created_at = self._parse_shopify_datetime(shopify_product.get('created_at'))
+                if previous_high_water is None or created_at is None or created_at > previous_high_water:
+                    created += 1
+
+        totals["deleted"] = await self.reconcile_deletions(force=full, created=created)
+
+        now = datetime.utcnow()
+        state.last_updated_at = high_water
+        state.last_synced_at = now
+        if full:
+            state.last_full_sync_at = now
+        state.last_inserted = totals["inserted"]
+        state.last_updated = totals["updated"]
+        state.last_deleted = totals["deleted"]
+        self.db.commit()
+
+        LoggingService.log_info(
+            f"Shopify 제품 동기화 완료: 신규 {totals['inserted']}개, 수정 {totals['updated']}개, 삭제 {totals['deleted']}개"
+        )
+        return totals
+
+    async def reconcile_deletions(self, force: bool = False, created: Optional[int] = None) -> int:
+        """Shopify에서 사라진 제품을 soft-delete 처리
+
+        created는 이번 동기화에서 이전 high-water mark 이후 생성된 것으로 확인된 제품 수입니다.
+        삭제와 생성이 같은 수만큼 일어나면 개수가 같아도 ID가 다르므로, 개수 비교로 ID 조회를
+        건너뛰는 것은 생성된 제품이 없을 때(created == 0)만 허용합니다.
+        """
+        active_query = self.db.query(Product.shopify_id).filter(
+            Product.shopify_id.isnot(None),
+            Product.deleted_at.is_(None)
+        )
+
+        if not force and created == 0 and await self.shopify_service.get_product_count() == active_query.count():
+            return 0
+
+        remote_ids: Set[str] = set()
+        async for page in self.shopify_service.iter_products(fields=['id'], pages=True):
+            remote_ids.update(str(product['id']) for product in page)
+
+        missing = [shopify_id for (shopify_id,) in active_query.all() if shopify_id not in remote_ids]
+        now = datetime.utcnow()
+        for start in range(0, len(missing), self.chunk_size):
+            self.db.query(Product).filter(
+                Product.shopify_id.in_(missing[start:start + self.chunk_size])
+            ).update({Product.deleted_at: now}, synchronize_session=False)
+        self.db.commit()
+
+        return len(missing)
+
+    async def import_bulk_export(self) -> Dict[str, int]:
+        """GraphQL bulk export 결과를 스트리밍하며 products 테이블에 upsert"""
+        totals = {"inserted": 0, "updated": 0}
+        chunk = []
+
+        async for shopify_product in self.shopify_service.bulk_export_products():
+            chunk.append(self.shopify_to_product_row(shopify_product))
+            if len(chunk) >= self.chunk_size:
+                for key, count in self.upsert_rows(chunk).items():
+                    totals[key] += count
+                chunk = []
+
+        if chunk:
+            for key, count in self.upsert_rows(chunk).items():
+                totals[key] += count
+
+        LoggingService.log_info(f"Shopify bulk export 동기화 완료: 신규 {totals['inserted']}개, 수정 {totals['updated']}개")
+        return totals
@@ -0,0 +1,232 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from app.core.config import settings
+from app.services.logging_service import LoggingService
+
+
+class ScrapeBlockedError(Exception):
+    """캡차/차단 페이지가 감지됨 (세션 격리 대상)"""
+
+
+class NoScrapeSessionError(Exception):
+    """사용 가능한(격리되지 않은) 스크래핑 세션이 없음"""
+
+
+def _split_lines(value: str) -> List[str]:
+    """줄바꿈/`|` 구분 설정값을 리스트로 변환 (User-Agent에는 쉼표가 포함되므로 쉼표로 나누지 않음)"""
+    return [item.strip() for item in value.replace("|", "\n").splitlines() if item.strip()]
+
+
+class ScrapeSession:
+    """User-Agent, 프록시, 쿠키를 묶은 스크래핑 신원"""
+
+    def __init__(self, session_id: str, user_agent: str, proxy: Optional[str] = None):
+        self.id = session_id
+        self.user_agent = user_agent
+        self.proxy = proxy
+        self.cookies: Dict[str, Dict] = {}  # name -> Playwright cookie dict
+        self.in_use = 0
+        self.uses = 0
+        self.failures = 0  # Consecutive failures
+        self.blocks = 0
+        self.quarantined_until = 0.0
+        self.last_used = 0.0
+
+    @property
+    def quarantined(self) -> bool:
+        return time.monotonic() < self.quarantined_until
+
+    def context_options(self) -> Dict:
+        """BrowserContext 생성 옵션 (User-Agent, 프록시, 저장된 쿠키)"""
+        options = {"user_agent": self.user_agent}
+        if self.proxy:
+            options["proxy"] = {"server": self.proxy}
+        if self.cookies:
+            options["storage_state"] = {"cookies": list(self.cookies.values()), "origins": []}
+        return options
+
+    def http_headers(self, headers: Optional[Dict] = None) -> Dict:
+        """일반 HTTP 요청 헤더 (User-Agent, Cookie)"""
+        result = {**(headers or {}), "User-Agent": self.user_agent}
+        if self.cookies:
+            result["Cookie"] = "; ".join(f"{cookie['name']}={cookie['value']}" for cookie in self.cookies.values())
+        return result
+
+    def update_cookies(self, cookies: List[Dict]):
+        """브라우저 컨텍스트 쿠키 저장"""
+        for cookie in cookies:
+            self.cookies[cookie["name"]] = cookie
+
+    def update_http_cookies(self, response_cookies, host: str):
+        """HTTP 응답 쿠키 저장"""
+        for name, value in response_cookies.items():
+            self.cookies[name] = {"name": name, "value": value, "domain": host, "path": "/"}
+
+    def snapshot(self) -> Dict:
+        return {
+            "id": self.id,
+            "user_agent": self.user_agent,
+            "proxy": self.proxy,
+            "in_use": self.in_use,
+            "uses": self.uses,
+            "failures": self.failures,
+            "blocks": self.blocks,
+            "cookies": len(self.cookies),
+            "quarantined_for": round(max(0.0, self.quarantined_until - time.monotonic()), 1)
+        }
+
+
+class HostLimiter:
+    """호스트별 동시 요청 수와 요청 간격 제한"""
+
+    def __init__(self, concurrency: int, rate: float):
+        self.concurrency = concurrency
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_start = 0.0
+        self.active = 0
+        self.total_requests = 0
+        self.waited_seconds = 0.0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self):
+        """현재 이벤트 루프에 동기화 객체 바인딩"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._lock = asyncio.Lock()
+            self._loop = loop
+            self.active = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        """동시 실행 슬롯 확보 후 최소 요청 간격만큼 대기"""
+        self._bind_loop()
+        start = time.monotonic()
+        async with self._semaphore:
+            async with self._lock:
+                now = time.monotonic()
+                if now < self.next_start:
+                    await asyncio.sleep(self.next_start - now)
+                self.next_start = max(now, self.next_start) + self.interval
+            self.waited_seconds += time.monotonic() - start
+            self.total_requests += 1
+            self.active += 1
+            try:
+                yield
+            finally:
+                self.active -= 1
+
+    def snapshot(self) -> Dict:
+        return {
+            "active": self.active,
+            "concurrency": self.concurrency,
+            "rate_per_sec": round(1.0 / self.interval, 2) if self.interval else None,
+            "total_requests": self.total_requests,
+            "avg_wait_ms": round(self.waited_seconds / self.total_requests * 1000, 1) if self.total_requests else 0
+        }
+
+
+class ScrapeSessionPool:
+    """스크래핑 세션 순환 풀
+
+    요청마다 가장 오래 쉬었던 정상 세션을 골라 User-Agent/프록시/쿠키를 순환하고,
+    호스트별 동시 요청 수와 요청 속도를 제한합니다. 캡차/차단 페이지가 감지되거나
+    연속 실패가 max_failures회에 도달한 세션은 quarantine_seconds 동안 격리됩니다.
+    """
+
+    def __init__(self, user_agents: Optional[List[str]] = None, proxies: Optional[List[str]] = None,
+                 session_count: int = None, host_concurrency: int = None, host_rate: float = None,
+                 quarantine_seconds: float = None, max_failures: int = None):
+        user_agents = user_agents or _split_lines(settings.SCRAPER_USER_AGENTS)
+        if proxies is None:
+            proxies = [proxy.strip() for proxy in settings.SCRAPER_PROXIES.split(",") if proxy.strip()]
+        session_count = session_count or max(settings.SCRAPER_SESSION_COUNT, len(proxies))
+
+        self.sessions = [
+            ScrapeSession(
+                f"session-{index}",
+                user_agents[index % len(user_agents)],
+                proxies[index % len(proxies)] if proxies else None
+            )
+            for index in range(session_count)
+        ]
+        self.host_concurrency = host_concurrency or settings.SCRAPER_HOST_CONCURRENCY
+        self.host_rate = settings.SCRAPER_HOST_RATE if host_rate is None else host_rate
+        self.quarantine_seconds = quarantine_seconds or settings.SCRAPER_QUARANTINE_SECONDS
+        self.max_failures = max_failures or settings.SCRAPER_SESSION_MAX_FAILURES
+        self.hosts: Dict[str, HostLimiter] = {}
+        self.stats = {"requests": 0, "successes": 0, "failures": 0, "blocked": 0, "quarantined": 0}
+
+    def _host_limiter(self, url: str) -> HostLimiter:
+        host = (urlparse(url).hostname or "").lower()
+        limiter = self.hosts.get(host)
+        if limiter is None:
+            limiter = self.hosts[host] = HostLimiter(self.host_concurrency, self.host_rate)
+        return limiter
+
+    def _pick(self) -> ScrapeSession:
+        """격리되지 않은 세션 중 사용 중 요청이 적고 가장 오래 쉰 세션 선택"""
+        healthy = [session for session in self.sessions if not session.quarantined]
+        if not healthy:
+            raise NoScrapeSessionError("사용 가능한 스크래핑 세션이 없습니다. 모든 세션이 격리 상태입니다.")
+        return min(healthy, key=lambda session: (session.in_use, session.last_used))
+
+    def quarantine(self, session: ScrapeSession, reason: str):
+        """세션 격리 (쿠키 초기화)"""
+        session.quarantined_until = time.monotonic() + self.quarantine_seconds
+        session.failures = 0
+        session.cookies = {}
+        self.stats["quarantined"] += 1
+        LoggingService.log_warning(
+            f"스크래핑 세션 격리: {session.id}, 사유: {reason}, {self.quarantine_seconds}초"
+        )
+
+    @asynccontextmanager
+    async def session(self, url: str):
+        """url 호스트의 제한을 지키며 세션 대여
+
+        블록 안에서 ScrapeBlockedError가 발생하면 세션을 격리하고, 그 밖의 오류는
+        연속 실패로 집계합니다.
+        """
+        async with self._host_limiter(url).slot():
+            session = self._pick()
+            session.in_use += 1
+            session.uses += 1
+            session.last_used = time.monotonic()
+            self.stats["requests"] += 1
+            try:
+                yield session
+            except ScrapeBlockedError as e:
+                session.blocks += 1
+                self.stats["blocked"] += 1
+                self.quarantine(session, str(e) or "blocked")
+                raise
+            except Exception:
+                session.failures += 1
+                self.stats["failures"] += 1
+                if session.failures >= self.max_failures:
+                    self.quarantine(session, f"연속 실패 {session.failures}회")
+                raise
+            else:
+                session.failures = 0
+                self.stats["successes"] += 1
+            finally:
+                session.in_use -= 1
+
+    def get_stats(self) -> Dict:
+        """세션/호스트 상태"""
+        return {
+            **self.stats,
+            "healthy_sessions": sum(1 for session in self.sessions if not session.quarantined),
+            "sessions": [session.snapshot() for session in self.sessions],
+            "hosts": {host: limiter.snapshot() for host, limiter in self.hosts.items()}
+        }
+
+
+# Process-wide pool shared by every AliExpressService instance
+scrape_sessions = ScrapeSessionPool()
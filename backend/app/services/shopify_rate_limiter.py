@@ -0,0 +1,139 @@
+import asyncio
+import random
+import time
+from typing import Dict, Optional
+from app.core.config import settings
+
+
+class ShopifyCallBucket:
+    """쇼핑몰별 Shopify 호출 버킷 (leaky bucket)"""
+
+    def __init__(self, capacity: int, leak_rate: float):
+        self.capacity = capacity
+        self.leak_rate = leak_rate
+        self.level = 0.0  # Estimated number of calls currently in the bucket
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.throttled_count = 0
+        self.total_calls = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        """현재 이벤트 루프에 묶인 Lock 반환"""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _leak(self):
+        """경과 시간만큼 버킷 비우기"""
+        now = time.monotonic()
+        self.level = max(0.0, self.level - (now - self.updated_at) * self.leak_rate)
+        self.updated_at = now
+
+    async def acquire(self, headroom: int = 0):
+        """버킷에 여유가 생길 때까지 대기 후 호출 슬롯 확보"""
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+
+                self._leak()
+                limit = max(1, self.capacity - headroom)
+                # Tolerate float drift from _leak so a full bucket is not re-polled for a rounding error
+                if self.level + 1 <= limit + 1e-9:
+                    self.level += 1
+                    self.total_calls += 1
+                    return
+
+                await asyncio.sleep((self.level + 1 - limit) / self.leak_rate)
+
+    def update_from_header(self, header: Optional[str]):
+        """X-Shopify-Shop-Api-Call-Limit 헤더로 버킷 상태 보정 (예: "32/40")"""
+        if not header or '/' not in header:
+            return
+        try:
+            used, capacity = (int(part) for part in header.split('/', 1))
+        except ValueError:
+            return
+
+        self._leak()
+        self.capacity = capacity
+        self.level = float(used)
+
+    def pause(self, seconds: float):
+        """429 응답 시 지정 시간 동안 호출 중단"""
+        self.throttled_count += 1
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def snapshot(self) -> Dict:
+        """현재 버킷 상태"""
+        self._leak()
+        return {
+            "used": round(self.level, 2),
+            "capacity": self.capacity,
+            "occupancy": round(self.level / self.capacity, 4) if self.capacity else 0,
+            "leak_rate": self.leak_rate,
+            "total_calls": self.total_calls,
+            "throttled_count": self.throttled_count,
+            "blocked_for": round(max(0.0, self.blocked_until - time.monotonic()), 2)
+        }
+
+
+class ShopifyRateLimiter:
+    """쇼핑몰별 호출 버킷을 관리하는 Shopify Admin API 스케줄러"""
+
+    def __init__(self, capacity: int = None, leak_rate: float = None, headroom: int = None):
+        self.capacity = capacity or settings.SHOPIFY_BUCKET_SIZE
+        self.leak_rate = leak_rate or settings.SHOPIFY_LEAK_RATE
+        self.headroom = settings.SHOPIFY_BUCKET_HEADROOM if headroom is None else headroom
+        self._buckets: Dict[str, ShopifyCallBucket] = {}
+
+    def get_bucket(self, shop: str) -> ShopifyCallBucket:
+        """쇼핑몰 버킷 조회 (없으면 생성)"""
+        bucket = self._buckets.get(shop)
+        if bucket is None:
+            bucket = ShopifyCallBucket(self.capacity, self.leak_rate)
+            self._buckets[shop] = bucket
+        return bucket
+
+    async def acquire(self, shop: str):
+        """호출 전 슬롯 확보"""
+        await self.get_bucket(shop).acquire(self.headroom)
+
+    def record_response(self, shop: str, headers) -> None:
+        """응답 헤더로 버킷 상태 갱신"""
+        self.get_bucket(shop).update_from_header(headers.get('X-Shopify-Shop-Api-Call-Limit'))
+
+    def pause(self, shop: str, seconds: float):
+        """쇼핑몰 호출 일시 중단"""
+        self.get_bucket(shop).pause(seconds)
+
+    @staticmethod
+    def backoff_delay(attempt: int) -> float:
+        """지수 백오프 + full jitter 대기 시간"""
+        ceiling = min(settings.SHOPIFY_RETRY_MAX_DELAY, settings.SHOPIFY_RETRY_BASE_DELAY * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def retry_after_delay(headers, attempt: int) -> float:
+        """Retry-After 헤더 기반 대기 시간 (없으면 백오프)"""
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            try:
+                return float(retry_after) + random.uniform(0, settings.SHOPIFY_RETRY_BASE_DELAY)
+            except ValueError:
+                pass
+        return ShopifyRateLimiter.backoff_delay(attempt)
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """쇼핑몰별 버킷 점유율 메트릭"""
+        return {shop: bucket.snapshot() for shop, bucket in self._buckets.items()}
+
+
+# Process-wide limiter shared by every ShopifyService instance
+shopify_rate_limiter = ShopifyRateLimiter()
@@ -1,7 +1,78 @@
+import re
+import json
+import time
+import asyncio
 import httpx
-from typing import List, Dict, Optional
+from datetime import datetime
+from typing import List, Dict, Optional, Union, AsyncIterator
 from app.core.config import settings
+from app.core.http_client import get_shopify_client
 from app.services.logging_service import LoggingService
+from app.services.shopify_rate_limiter import shopify_rate_limiter
+
+# Methods that are safe to retry after a 5xx or a dropped connection
+IDEMPOTENT_METHODS = {'GET', 'PUT', 'DELETE'}
+
+# Bulk export query (products with their variants and images)
+BULK_PRODUCTS_QUERY = """
+{
+  products {
+    edges {
+      node {
+        id
+        title
+        handle
+        descriptionHtml
+        vendor
+        productType
+        tags
+        status
+        publishedAt
+        updatedAt
+        templateSuffix
+        variants {
+          edges {
+            node {
+              id
+              title
+              sku
+              price
+              compareAtPrice
+              inventoryQuantity
+            }
+          }
+        }
+        images {
+          edges {
+            node {
+              id
+              url
+              altText
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+BULK_RUN_MUTATION = """
+mutation bulkOperationRunQuery($query: String!) {
+  bulkOperationRunQuery(query: $query) {
+    bulkOperation { id status }
+    userErrors { field message }
+  }
+}
+"""
+
+BULK_STATUS_QUERY = """
+query bulkOperationStatus($id: ID!) {
+  node(id: $id) {
+    ... on BulkOperation { id status errorCode objectCount url partialDataUrl }
+  }
+}
+"""
 
 class ShopifyService:
     """Shopify API 연동 서비스"""
@@ -14,44 +85,93 @@ class ShopifyService:
         
         if not self.shop_url or not self.access_token:
             raise ValueError("Shopify 설정이 올바르지 않습니다. SHOPIFY_SHOP_URL과 SHOPIFY_ACCESS_TOKEN을 확인해주세요.")
+        
+        self.base_url = settings.SHOPIFY_API_BASE_URL.rstrip('/') or f"https://{self.shop_url}/admin/api/{self.api_version}"
+    
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """공유 커넥션 풀과 호출 버킷을 사용한 Shopify API 요청 (429/5xx 재시도)"""
+        headers = {'X-Shopify-Access-Token': self.access_token}
+        headers.update(kwargs.pop('headers', {}))
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        max_retries = settings.SHOPIFY_MAX_RETRIES
+        
+        for attempt in range(max_retries + 1):
+            await shopify_rate_limiter.acquire(self.shop_url)
+            client = get_shopify_client()
+            
+            try:
+                response = await client.request(method, f"{self.base_url}/{path}", headers=headers, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                # The request never reached Shopify, so retrying is always safe
+                if attempt >= max_retries:
+                    raise
+                await asyncio.sleep(shopify_rate_limiter.backoff_delay(attempt))
+                continue
+            except httpx.TransportError:
+                if not idempotent or attempt >= max_retries:
+                    raise
+                await asyncio.sleep(shopify_rate_limiter.backoff_delay(attempt))
+                continue
+            
+            shopify_rate_limiter.record_response(self.shop_url, response.headers)
+            
+            if response.status_code == 429 and attempt < max_retries:
+                delay = shopify_rate_limiter.retry_after_delay(response.headers, attempt)
+                shopify_rate_limiter.pause(self.shop_url, delay)
+                LoggingService.log_warning(f"Shopify 호출 제한(429): {delay:.2f}초 후 재시도 ({attempt + 1}/{max_retries})")
+                continue
+            
+            if response.status_code >= 500 and idempotent and attempt < max_retries:
+                await asyncio.sleep(shopify_rate_limiter.backoff_delay(attempt))
+                continue
+            
+            response.raise_for_status()
+            return response
+        
+    @staticmethod
+    def _next_page_info(link_header: str) -> Optional[str]:
+        """Link 헤더에서 다음 페이지 page_info 추출"""
+        for link in link_header.split(','):
+            if 'rel="next"' in link:
+                match = re.search(r'page_info=([^&>]+)', link)
+                return match.group(1) if match else None
+        return None
+    
+    async def iter_products(self, limit: int = 250, fields: Optional[List[str]] = None,
+                            updated_at_min: Optional[Union[str, datetime]] = None,
+                            pages: bool = False) -> AsyncIterator:
+        """Shopify 제품을 페이지 단위로 스트리밍 조회 (pages=True면 페이지 리스트를 yield)"""
+        params = {'limit': limit}
+        if fields:
+            params['fields'] = ','.join(fields)
+        if updated_at_min:
+            params['updated_at_min'] = updated_at_min.isoformat() if isinstance(updated_at_min, datetime) else updated_at_min
+        
+        while True:
+            response = await self._request('GET', 'products.json', params=params)
+            page = response.json().get('products', [])
+            
+            if pages:
+                yield page
+            else:
+                for product in page:
+                    yield product
+            
+            page_info = self._next_page_info(response.headers.get('Link', ''))
+            if not page_info:
+                break
+            
+            # Cursor pages only accept limit/fields; filters are encoded in page_info
+            params = {'limit': limit, 'page_info': page_info}
+            if fields:
+                params['fields'] = ','.join(fields)
     
     async def get_products(self, limit: int = 250) -> List[Dict]:
         """Shopify에서 제품 목록 조회"""
         try:
             products = []
-            page_info = None
-            
-            while True:
-                # Build query parameters
-                params = {'limit': limit}
-                if page_info:
-                    params['page_info'] = page_info
-                
-                # Make API request
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"https://{self.shop_url}/admin/api/{self.api_version}/products.json",
-                        headers={'X-Shopify-Access-Token': self.access_token},
-                        params=params
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                
-                # Extract products
-                products.extend(data.get('products', []))
-                
-                # Check for next page
-                link_header = response.headers.get('Link', '')
-                if 'rel="next"' not in link_header:
-                    break
-                
-                # Extract page_info from Link header
-                import re
-                match = re.search(r'page_info=([^&>]+)', link_header)
-                if match:
-                    page_info = match.group(1)
-                else:
-                    break
+            async for page in self.iter_products(limit=limit, pages=True):
+                products.extend(page)
             
             LoggingService.log_info(f"Shopify에서 {len(products)}개 제품 조회 완료")
             return products
@@ -60,24 +180,30 @@ class ShopifyService:
             LoggingService.log_error(f"Shopify 제품 조회 실패: {str(e)}")
             raise
     
+    async def get_product_count(self) -> int:
+        """Shopify 제품 수 조회"""
+        response = await self._request('GET', 'products/count.json')
+        return response.json().get('count', 0)
+    
     async def get_product(self, product_id: str) -> Optional[Dict]:
         """특정 제품 조회"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"https://{self.shop_url}/admin/api/{self.api_version}/products/{product_id}.json",
-                    headers={'X-Shopify-Access-Token': self.access_token}
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                LoggingService.log_info(f"Shopify 제품 조회 완료: {product_id}")
-                return data.get('product')
+            response = await self._request('GET', f"products/{product_id}.json")
+            data = response.json()
+            
+            LoggingService.log_info(f"Shopify 제품 조회 완료: {product_id}")
+            return data.get('product')
                 
         except Exception as e:
             LoggingService.log_error(f"Shopify 제품 조회 실패: {product_id}, 오류: {str(e)}")
             return None
     
+    async def find_product_by_handle(self, handle: str) -> Optional[Dict]:
+        """handle로 제품 조회 (없으면 None)"""
+        response = await self._request('GET', 'products.json', params={'handle': handle, 'fields': 'id,handle,title'})
+        products = response.json().get('products', [])
+        return products[0] if products else None
+    
     async def create_product(self, product_data: Dict) -> Dict:
         """새 제품 생성"""
         try:
@@ -101,6 +227,9 @@ class ShopifyService:
                 }
             }
             
+            if product_data.get("handle"):
+                shopify_product["product"]["handle"] = product_data["handle"]
+            
             # Add images if available
             if product_data.get("image_url"):
                 shopify_product["product"]["images"] = [
@@ -108,20 +237,11 @@ class ShopifyService:
                 ]
             
             # Create product via API
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"https://{self.shop_url}/admin/api/{self.api_version}/products.json",
-                    headers={
-                        'X-Shopify-Access-Token': self.access_token,
-                        'Content-Type': 'application/json'
-                    },
-                    json=shopify_product
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                LoggingService.log_info(f"Shopify 제품 생성 완료: {data['product']['id']}")
-                return data['product']
+            response = await self._request('POST', 'products.json', json=shopify_product)
+            data = response.json()
+            
+            LoggingService.log_info(f"Shopify 제품 생성 완료: {data['product']['id']}")
+            return data['product']
                 
         except Exception as e:
             LoggingService.log_error(f"Shopify 제품 생성 실패: {str(e)}")
@@ -148,20 +268,11 @@ class ShopifyService:
                 update_data["product"]["status"] = product_data["status"]
             
             # Update via API
-            async with httpx.AsyncClient() as client:
-                response = await client.put(
-                    f"https://{self.shop_url}/admin/api/{self.api_version}/products/{product_id}.json",
-                    headers={
-                        'X-Shopify-Access-Token': self.access_token,
-                        'Content-Type': 'application/json'
-                    },
-                    json=update_data
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                LoggingService.log_info(f"Shopify 제품 수정 완료: {product_id}")
-                return data['product']
+            response = await self._request('PUT', f"products/{product_id}.json", json=update_data)
+            data = response.json()
+            
+            LoggingService.log_info(f"Shopify 제품 수정 완료: {product_id}")
+            return data['product']
                 
         except Exception as e:
             LoggingService.log_error(f"Shopify 제품 수정 실패: {product_id}, 오류: {str(e)}")
@@ -170,15 +281,10 @@ class ShopifyService:
     async def delete_product(self, product_id: str) -> bool:
         """제품 삭제"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(
-                    f"https://{self.shop_url}/admin/api/{self.api_version}/products/{product_id}.json",
-                    headers={'X-Shopify-Access-Token': self.access_token}
-                )
-                response.raise_for_status()
-                
-                LoggingService.log_info(f"Shopify 제품 삭제 완료: {product_id}")
-                return True
+            await self._request('DELETE', f"products/{product_id}.json")
+            
+            LoggingService.log_info(f"Shopify 제품 삭제 완료: {product_id}")
+            return True
                 
         except Exception as e:
             LoggingService.log_error(f"Shopify 제품 삭제 실패: {product_id}, 오류: {str(e)}")
@@ -187,17 +293,11 @@ class ShopifyService:
     async def get_orders(self, limit: int = 50) -> List[Dict]:
         """주문 목록 조회"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"https://{self.shop_url}/admin/api/{self.api_version}/orders.json",
-                    headers={'X-Shopify-Access-Token': self.access_token},
-                    params={'limit': limit, 'status': 'any'}
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                LoggingService.log_info(f"Shopify 주문 조회 완료: {len(data.get('orders', []))}개")
-                return data.get('orders', [])
+            response = await self._request('GET', 'orders.json', params={'limit': limit, 'status': 'any'})
+            data = response.json()
+            
+            LoggingService.log_info(f"Shopify 주문 조회 완료: {len(data.get('orders', []))}개")
+            return data.get('orders', [])
                 
         except Exception as e:
             LoggingService.log_error(f"Shopify 주문 조회 실패: {str(e)}")
@@ -206,21 +306,135 @@ class ShopifyService:
     async def get_shop_info(self) -> Dict:
         """쇼핑몰 정보 조회"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"https://{self.shop_url}/admin/api/{self.api_version}/shop.json",
-                    headers={'X-Shopify-Access-Token': self.access_token}
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                LoggingService.log_info(f"Shopify 쇼핑몰 정보 조회 완료")
-                return data.get('shop', {})
+            response = await self._request('GET', 'shop.json')
+            data = response.json()
+            
+            LoggingService.log_info(f"Shopify 쇼핑몰 정보 조회 완료")
+            return data.get('shop', {})
                 
         except Exception as e:
             LoggingService.log_error(f"Shopify 쇼핑몰 정보 조회 실패: {str(e)}")
             return {}
     
+    async def graphql(self, query: str, variables: Optional[Dict] = None) -> Dict:
+        """GraphQL Admin API 호출"""
+        response = await self._request('POST', 'graphql.json', json={'query': query, 'variables': variables or {}})
+        data = response.json()
+        if data.get('errors'):
+            raise ValueError(f"Shopify GraphQL 오류: {data['errors']}")
+        return data.get('data', {})
+    
+    async def start_bulk_product_export(self) -> str:
+        """제품 전체 bulk export 작업 시작 (BulkOperation ID 반환)"""
+        data = await self.graphql(BULK_RUN_MUTATION, {'query': BULK_PRODUCTS_QUERY})
+        result = data.get('bulkOperationRunQuery') or {}
+        if result.get('userErrors'):
+            raise ValueError(f"Shopify bulk 작업 시작 실패: {result['userErrors']}")
+        
+        operation_id = result['bulkOperation']['id']
+        LoggingService.log_info(f"Shopify bulk export 시작: {operation_id}")
+        return operation_id
+    
+    async def wait_for_bulk_operation(self, operation_id: str, poll_interval: float = None,
+                                      timeout: float = None) -> Dict:
+        """bulk 작업 완료까지 폴링"""
+        poll_interval = poll_interval or settings.SHOPIFY_BULK_POLL_INTERVAL
+        deadline = time.monotonic() + (timeout or settings.SHOPIFY_BULK_TIMEOUT)
+        
+        while True:
+            data = await self.graphql(BULK_STATUS_QUERY, {'id': operation_id})
+            operation = data.get('node') or {}
+            status = operation.get('status')
+            
+            if status == 'COMPLETED':
+                LoggingService.log_info(f"Shopify bulk export 완료: {operation.get('objectCount')}개 객체")
+                return operation
+            if status in ('FAILED', 'CANCELED', 'EXPIRED'):
+                raise ValueError(f"Shopify bulk 작업 실패: {status}, {operation.get('errorCode')}")
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Shopify bulk 작업 시간 초과: {operation_id}")
+            
+            await asyncio.sleep(poll_interval)
+    
+    async def iter_bulk_results(self, url: str) -> AsyncIterator[Dict]:
+        """bulk 결과 JSONL을 한 줄씩 스트리밍 파싱하여 REST 형식 제품으로 yield"""
+        current = None
+        client = get_shopify_client()
+        
+        async with client.stream('GET', url) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                node = json.loads(line)
+                parent_id = node.get('__parentId')
+                
+                if parent_id is None:
+                    if current is not None:
+                        yield current
+                    current = self._bulk_product_to_rest(node)
+                    continue
+                
+                # Children follow their parent product in the JSONL output
+                if current is None or current['admin_graphql_api_id'] != parent_id:
+                    continue
+                if '/ProductVariant/' in node.get('id', ''):
+                    current['variants'].append({
+                        'id': self._gid_to_id(node['id']),
+                        'title': node.get('title'),
+                        'sku': node.get('sku'),
+                        'price': node.get('price'),
+                        'compare_at_price': node.get('compareAtPrice'),
+                        'inventory_quantity': node.get('inventoryQuantity')
+                    })
+                elif node.get('url'):
+                    current['images'].append({
+                        'id': self._gid_to_id(node.get('id', '')),
+                        'src': node['url'],
+                        'alt': node.get('altText')
+                    })
+        
+        if current is not None:
+            yield current
+    
+    async def bulk_export_products(self) -> AsyncIterator[Dict]:
+        """GraphQL bulk operation으로 전체 제품 export"""
+        operation_id = await self.start_bulk_product_export()
+        operation = await self.wait_for_bulk_operation(operation_id)
+        
+        # An empty catalog completes without a result file
+        if not operation.get('url'):
+            return
+        
+        async for product in self.iter_bulk_results(operation['url']):
+            yield product
+    
+    @staticmethod
+    def _gid_to_id(gid: str) -> str:
+        """GraphQL GID(gid://shopify/Product/123)를 REST ID로 변환"""
+        return gid.rsplit('/', 1)[-1]
+    
+    @classmethod
+    def _bulk_product_to_rest(cls, node: Dict) -> Dict:
+        """bulk JSONL 제품 노드를 REST products.json 형식으로 변환"""
+        tags = node.get('tags') or []
+        return {
+            'id': cls._gid_to_id(node['id']),
+            'admin_graphql_api_id': node['id'],
+            'title': node.get('title'),
+            'handle': node.get('handle'),
+            'body_html': node.get('descriptionHtml'),
+            'vendor': node.get('vendor'),
+            'product_type': node.get('productType'),
+            'tags': ', '.join(tags) if isinstance(tags, list) else tags,
+            'status': (node.get('status') or '').lower() or None,
+            'published_at': node.get('publishedAt'),
+            'updated_at': node.get('updatedAt'),
+            'template_suffix': node.get('templateSuffix'),
+            'variants': [],
+            'images': []
+        }
+    
     async def test_connection(self) -> bool:
         """Shopify API 연결 테스트"""
         try:
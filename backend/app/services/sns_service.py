@@ -0,0 +1,171 @@
+import asyncio
+from typing import AsyncIterator, Dict, List
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.product import Product
+from app.models.sns_content import SNSContent
+from app.services.openai_service import OpenAIService
+from app.services.logging_service import LoggingService
+
+
+class SNSContentService:
+    """SNS 콘텐츠 생성 서비스"""
+
+    def __init__(self, openai_service: OpenAIService = None):
+        self.openai_service = openai_service or OpenAIService()
+
+    @staticmethod
+    def build_prompt(product: Product, platform: str, content_type: str, regenerate: bool = False) -> str:
+        """제품 정보로 SNS 콘텐츠 생성 프롬프트 작성"""
+        if regenerate:
+            request = f"{platform}용 {content_type} 콘텐츠를 다시 생성해주세요. 이전 콘텐츠와 다른 스타일로 작성해주세요."
+        else:
+            request = f"{platform}용 {content_type} 콘텐츠를 생성해주세요."
+
+        return f"""
+        제품 정보:
+        - 제품명: {product.title}
+        - 설명: {product.description}
+        - 가격: ${product.price}
+        - 카테고리: {product.product_type}
+
+        {request}
+        다음을 포함해주세요:
+        1. 매력적인 제목
+        2. 제품을 홍보하는 설명
+        3. 관련 해시태그 (최대 20개)
+        4. 고객이 행동하도록 유도하는 문구
+
+        한국어로 작성해주세요.
+        """
+
+    @staticmethod
+    def parse_generated_content(generated_content: str) -> Dict[str, str]:
+        """생성된 텍스트에서 제목, 설명, 해시태그 추출"""
+        result = {"title": "", "description": "", "hashtags": ""}
+
+        for line in generated_content.split('\n'):
+            if line.strip().startswith('제목:') or line.strip().startswith('Title:'):
+                result["title"] = line.split(':', 1)[1].strip()
+            elif line.strip().startswith('설명:') or line.strip().startswith('Description:'):
+                result["description"] = line.split(':', 1)[1].strip()
+            elif '#' in line:
+                result["hashtags"] = line.strip()
+
+        return result
+
+    @staticmethod
+    def content_values(product: Product, platform: str, content_type: str, generated_content: str) -> Dict:
+        """생성된 텍스트로 SNSContent 컬럼 값 구성"""
+        parsed = SNSContentService.parse_generated_content(generated_content)
+        return {
+            "product_id": product.id,
+            "platform": platform,
+            "content_type": content_type,
+            "title": parsed["title"],
+            "description": parsed["description"],
+            "hashtags": parsed["hashtags"],
+            "generated_content": generated_content,
+            "image_urls": [product.image_url] if product.image_url else []
+        }
+
+    async def generate_for_product(self, db: Session, product: Product, platform: str,
+                                   content_type: str = "post") -> SNSContent:
+        """제품 SNS 콘텐츠 생성 후 저장 (생성 실패 시 저장하지 않고 예외 발생)"""
+        generated_content = await self.openai_service.generate(
+            self.build_prompt(product, platform, content_type)
+        )
+        sns_content = SNSContent(**self.content_values(product, platform, content_type, generated_content))
+
+        db.add(sns_content)
+        db.commit()
+        db.refresh(sns_content)
+        return sns_content
+
+    async def generate_batch(self, db: Session, products: List[Product], platforms: List[str],
+                             content_types: List[str], concurrency: int = None) -> AsyncIterator[Dict]:
+        """제품 × 플랫폼 × 콘텐츠 유형 조합을 동시에 생성하고 완료될 때마다 진행 상황을 yield (마지막은 done 요약)
+
+        동시 호출 수는 concurrency(기본 SNS_BATCH_CONCURRENCY)로, 호출 속도는 OpenAI 분당
+        요청/토큰 예산으로 제한됩니다. 생성 결과는 SNS_BATCH_INSERT_SIZE개씩 모아 한 번에 저장하며,
+        중간에 중단되어도 이미 생성된 결과는 저장됩니다. 실패한 조합은 저장하지 않습니다.
+        """
+        combinations = [
+            (product, platform, content_type)
+            for product in products for platform in platforms for content_type in content_types
+        ]
+        semaphore = asyncio.Semaphore(concurrency or settings.SNS_BATCH_CONCURRENCY)
+
+        async def generate(index: int, product: Product, platform: str, content_type: str):
+            async with semaphore:
+                try:
+                    generated_content = await self.openai_service.generate(
+                        self.build_prompt(product, platform, content_type)
+                    )
+                    return index, product, platform, content_type, generated_content, None
+                except Exception as e:
+                    return index, product, platform, content_type, None, str(e)
+
+        # Detach the products so the per-chunk commits do not expire them (one SELECT each on next access)
+        for product in products:
+            if product in db:
+                db.expunge(product)
+
+        tasks = [asyncio.create_task(generate(index, *combination)) for index, combination in enumerate(combinations)]
+        recorded = set()
+        pending_rows: List[Dict] = []
+        counts = {"total": len(tasks), "completed": 0, "created": 0, "failed": 0}
+
+        def record(result):
+            index, product, platform, content_type, generated_content, error = result
+            recorded.add(index)
+            counts["completed"] += 1
+            if error is None:
+                pending_rows.append(self.content_values(product, platform, content_type, generated_content))
+            else:
+                counts["failed"] += 1
+                LoggingService.log_warning(
+                    f"일괄 SNS 콘텐츠 생성 실패: 제품 {product.id}, {platform}/{content_type}, 오류: {error}"
+                )
+
+        def flush():
+            if pending_rows:
+                db.execute(insert(SNSContent), pending_rows)
+                db.commit()
+                counts["created"] += len(pending_rows)
+                pending_rows.clear()
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                record(result)
+                if len(pending_rows) >= settings.SNS_BATCH_INSERT_SIZE:
+                    flush()
+
+                _, product, platform, content_type, _, error = result
+                yield {
+                    "product_id": product.id,
+                    "platform": platform,
+                    "content_type": content_type,
+                    "status": "failed" if error else "generated",
+                    **counts
+                }
+            flush()
+            yield {"done": True, **counts}
+        finally:
+            # Stop generating if the consumer went away, but keep what was already paid for:
+            # generations that finished while the last event was being sent have not been consumed yet
+            for index, task in enumerate(tasks):
+                if index not in recorded and task.done() and not task.cancelled():
+                    record(task.result())
+                task.cancel()
+            try:
+                flush()
+            except Exception as e:
+                db.rollback()
+                LoggingService.log_error(f"일괄 SNS 콘텐츠 저장 실패: {str(e)}")
+
+        LoggingService.log_info(
+            f"일괄 SNS 콘텐츠 생성 완료: {counts['created']}개 저장, 실패 {counts['failed']}개"
+        )
@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.trending_snapshot import TrendingSnapshot
+from app.services.aliexpress_service import AliExpressService
+from app.services.logging_service import LoggingService
+
+
+class TrendingService:
+    """카테고리별 인기 제품 스냅샷 수집/조회 서비스"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def crawl(self, categories: Optional[List[str]] = None, limit: int = None) -> Dict:
+        """카테고리별 인기 제품을 동시에 수집해 스냅샷으로 저장
+
+        동시 실행 수는 브라우저 풀 크기로 제한됩니다. 수집에 실패한(빈) 카테고리는
+        저장하지 않아 이전 스냅샷이 계속 사용됩니다.
+        """
+        categories = categories or list(AliExpressService.CATEGORY_IDS)
+        limit = limit or settings.TRENDING_SNAPSHOT_LIMIT
+
+        async def crawl_category(category: str) -> List[Dict]:
+            return await AliExpressService().get_trending_products(category=category, limit=limit)
+
+        results = await asyncio.gather(*[crawl_category(category) for category in categories])
+
+        captured_at = datetime.utcnow()
+        rows = []
+        failed = []
+        for category, products in zip(categories, results):
+            if not products:
+                failed.append(category)
+                continue
+            for rank, product in enumerate(products, start=1):
+                product["rank"] = rank
+            rows.append({
+                "category": category,
+                "captured_at": captured_at,
+                "product_count": len(products),
+                "products": products
+            })
+
+        if rows:
+            self.db.execute(insert(TrendingSnapshot), rows)
+        pruned = self.prune()
+        self.db.commit()
+
+        LoggingService.log_info(
+            f"인기 제품 스냅샷 수집 완료: {len(rows)}개 카테고리 저장, 실패 {len(failed)}개, 정리 {pruned}개"
+        )
+        return {
+            "captured_at": captured_at.isoformat(),
+            "stored": [row["category"] for row in rows],
+            "failed": failed,
+            "pruned": pruned
+        }
+
+    def prune(self) -> int:
+        """보관 기간이 지난 스냅샷 삭제"""
+        cutoff = datetime.utcnow() - timedelta(days=settings.TRENDING_SNAPSHOT_RETENTION_DAYS)
+        return self.db.query(TrendingSnapshot).filter(
+            TrendingSnapshot.captured_at < cutoff
+        ).delete(synchronize_session=False)
+
+    def get_snapshot(self, category: str, as_of: Optional[datetime] = None) -> Optional[TrendingSnapshot]:
+        """카테고리의 최신(또는 as_of 시점 이전 마지막) 스냅샷"""
+        query = self.db.query(TrendingSnapshot).filter(TrendingSnapshot.category == category)
+        if as_of is not None:
+            query = query.filter(TrendingSnapshot.captured_at <= as_of)
+        return query.order_by(TrendingSnapshot.captured_at.desc()).first()
+
+    @staticmethod
+    def diff(previous: TrendingSnapshot, current: TrendingSnapshot) -> Dict:
+        """두 스냅샷 비교 (신규 진입, 이탈, 순위 변동)"""
+        previous_ranks = {product["id"]: product.get("rank", index + 1) for index, product in enumerate(previous.products or [])}
+        current_ranks = {product["id"]: product.get("rank", index + 1) for index, product in enumerate(current.products or [])}
+
+        rank_changes = []
+        for product_id, rank in current_ranks.items():
+            previous_rank = previous_ranks.get(product_id)
+            if previous_rank is not None and previous_rank != rank:
+                rank_changes.append({"id": product_id, "from": previous_rank, "to": rank, "change": previous_rank - rank})
+
+        return {
+            "from": previous.captured_at.isoformat(),
+            "to": current.captured_at.isoformat(),
+            "new": [product_id for product_id in current_ranks if product_id not in previous_ranks],
+            "dropped": [product_id for product_id in previous_ranks if product_id not in current_ranks],
+            "rank_changes": sorted(rank_changes, key=lambda change: -abs(change["change"]))
+        }
@@ -0,0 +1,208 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.product import Product
+from app.services.product_bulk_service import ProductBulkService
+from app.services.product_sync_service import ProductSyncService
+from app.services.logging_service import LoggingService
+from app.utils.cache import TTLCache
+
+PRODUCT_UPSERT_TOPICS = {"products/create", "products/update"}
+PRODUCT_DELETE_TOPIC = "products/delete"
+ORDER_CREATE_TOPIC = "orders/create"
+SUPPORTED_TOPICS = PRODUCT_UPSERT_TOPICS | {PRODUCT_DELETE_TOPIC, ORDER_CREATE_TOPIC}
+
+
+class WebhookBuffer:
+    """Shopify 웹훅을 모아 일정 주기로 병합(coalesce)해 DB에 기록하는 버퍼
+
+    웹훅은 큐에 넣는 즉시 Shopify에 성공 응답을 보내므로, 기록에 실패한 이벤트는 버리지 않고
+    다음 주기에 다시 기록합니다. 재고는 products/update의 variant 재고(절대값)로만 갱신하고
+    orders/create는 집계만 합니다. 주문 수량을 상대 차감하면 이미 기록된 products/update나
+    재전송된 주문 웹훅과 판매가 이중으로 반영되기 때문입니다. 같은 X-Shopify-Webhook-Id로
+    재전송된 웹훅은 적재하지 않습니다.
+    """
+
+    def __init__(self, flush_interval: float = None, max_batch: int = None, max_queue: int = None):
+        self.flush_interval = flush_interval or settings.WEBHOOK_FLUSH_INTERVAL
+        self.max_batch = max_batch or settings.WEBHOOK_MAX_BATCH
+        self.max_queue = max_queue or settings.WEBHOOK_QUEUE_SIZE
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        # Acknowledged events whose flush failed; prepended to the next batch
+        self._retry: List[Tuple[str, Dict]] = []
+        self._seen_webhook_ids = TTLCache(ttl=settings.WEBHOOK_DEDUPE_TTL,
+                                          max_size=settings.WEBHOOK_DEDUPE_MAX_ENTRIES)
+        self.stats = {
+            "received": 0,
+            "duplicates": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "lost": 0,
+            "products_upserted": 0,
+            "products_deleted": 0,
+            "orders_created": 0
+        }
+
+    def start(self):
+        """백그라운드 flusher 시작"""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """flusher 종료 (이미 꺼낸 배치와 큐에 남은 이벤트를 모두 기록한 뒤 종료)"""
+        if self._task is None:
+            return
+        self._stopping = True
+        # Wake the flusher if it is waiting on an empty queue
+        try:
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+        await self._task
+        self._task = None
+
+    def submit(self, topic: str, payload: Dict, webhook_id: Optional[str] = None) -> bool:
+        """웹훅 이벤트 적재 (큐가 가득 차면 False, 이미 받은 webhook_id는 적재 없이 True)"""
+        if webhook_id and self._seen_webhook_ids.get(webhook_id):
+            self.stats["duplicates"] += 1
+            return True
+        if self._queue is None:
+            self.start()
+        try:
+            self._queue.put_nowait((topic, payload))
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            return False
+        # Only remember accepted deliveries: a 503 must let Shopify's redelivery through
+        if webhook_id:
+            self._seen_webhook_ids.set(webhook_id, True)
+        self.stats["received"] += 1
+        return True
+
+    async def _run(self):
+        """flush_interval 동안 이벤트를 모아 한 번에 기록 (종료 요청 후에는 큐를 비울 때까지 기록)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch, self._retry = self._retry, []
+            if not batch and not self._stopping:
+                batch.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.max_batch:
+                if self._stopping:
+                    if self._queue.empty():
+                        break
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # None is the wake-up marker put by stop()
+            batch = [event for event in batch if event is not None]
+            if batch:
+                await self._flush_or_retry(batch)
+            if self._stopping and self._queue.empty() and not self._retry:
+                return
+
+    async def _flush_or_retry(self, batch):
+        """배치 기록, 실패하면 다음 주기에 다시 기록하도록 보관 (종료 중이면 유실로 집계)"""
+        try:
+            await self._flush(batch)
+        except Exception as e:
+            self.stats["flush_errors"] += 1
+            if self._stopping:
+                self.stats["lost"] += len(batch)
+                LoggingService.log_error(f"웹훅 버퍼 종료 중 기록 실패, {len(batch)}개 이벤트 유실: {str(e)}")
+                return
+
+            overflow = len(batch) - self.max_queue
+            if overflow > 0:
+                # Bound memory while the database is down; oldest events go first
+                batch = batch[overflow:]
+                self.stats["lost"] += overflow
+            self._retry = batch
+            LoggingService.log_error(f"웹훅 버퍼 기록 실패, 다음 주기에 재시도: {len(batch)}개 이벤트, 오류: {str(e)}")
+
+    def _coalesce(self, batch) -> Tuple[Dict[str, Dict], set, int]:
+        """제품 ID별 마지막 상태만 남기도록 병합 (주문은 개수만 집계)"""
+        upserts: Dict[str, Dict] = {}
+        deletes = set()
+        orders = 0
+
+        for topic, payload in batch:
+            if topic == ORDER_CREATE_TOPIC:
+                # Stock changes arrive as absolute variant inventory in products/update
+                orders += 1
+                continue
+
+            product_id = str(payload.get("id"))
+            if topic == PRODUCT_DELETE_TOPIC:
+                upserts.pop(product_id, None)
+                deletes.add(product_id)
+                continue
+
+            # Deliveries can arrive out of order; keep the newest product state
+            current = upserts.get(product_id)
+            if current is None or (payload.get("updated_at") or "") >= (current.get("updated_at") or ""):
+                upserts[product_id] = payload
+            deletes.discard(product_id)
+
+        return upserts, deletes, orders
+
+    async def _flush(self, batch):
+        """병합된 이벤트를 배치 upsert / soft-delete"""
+        upserts, deletes, orders = self._coalesce(batch)
+
+        if upserts or deletes:
+            # SQLAlchemy sessions are synchronous; keep them off the event loop
+            await asyncio.to_thread(self._write, list(upserts.values()), list(deletes))
+
+        self.stats["coalesced"] += len(batch) - len(upserts) - len(deletes) - orders
+        self.stats["flushes"] += 1
+        self.stats["products_upserted"] += len(upserts)
+        self.stats["products_deleted"] += len(deletes)
+        self.stats["orders_created"] += orders
+
+        LoggingService.log_info(
+            f"웹훅 배치 기록 완료: 이벤트 {len(batch)}개 -> 제품 upsert {len(upserts)}개, 삭제 {len(deletes)}개, "
+            f"주문 {orders}개"
+        )
+
+    @staticmethod
+    def _write(products, deleted_ids):
+        """DB 기록 (스레드에서 실행, 한 트랜잭션)"""
+        db = SessionLocal()
+        try:
+            if products:
+                ProductBulkService.upsert_products(
+                    db,
+                    [ProductSyncService.shopify_to_product_row(product) for product in products],
+                    insert_defaults={"import_source": "shopify"}
+                )
+            if deleted_ids:
+                db.query(Product).filter(Product.shopify_id.in_(deleted_ids)).update(
+                    {Product.deleted_at: datetime.utcnow()}, synchronize_session=False
+                )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+# Process-wide buffer shared by the webhook endpoint
+webhook_buffer = WebhookBuffer()
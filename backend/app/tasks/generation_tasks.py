@@ -0,0 +1,138 @@
+import openai
+from typing import List, Optional
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.product import Product
+from app.services.sns_service import SNSContentService
+from app.services.openai_batch_service import OpenAIBatchService, BATCH_TERMINAL_STATUSES
+from app.services.job_service import JobService
+from app.services.logging_service import LoggingService
+from app.tasks.tracking import run_async, run_tracked_job
+
+# Transient LLM failures (APITimeoutError is an APIConnectionError); bad requests and auth errors are not retried
+LLM_RETRY_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+    ConnectionError,
+    TimeoutError
+)
+
+
+async def _generate_sns_content(product_id: int, platform: str, content_type: str):
+    """SNS 콘텐츠 생성 (작업별 세션 사용)"""
+    db = SessionLocal()
+    try:
+        product = db.query(Product).filter(Product.id == product_id).first()
+        if not product:
+            raise ValueError(f"제품을 찾을 수 없습니다: {product_id}")
+
+        sns_content = await SNSContentService().generate_for_product(db, product, platform, content_type)
+        return {"id": sns_content.id, "product_id": product_id, "platform": platform}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=LLM_RETRY_ERRORS,
+    retry_backoff=True,
+    retry_backoff_max=300,
+    retry_jitter=True,
+    max_retries=3
+)
+def generate_sns_content_task(self, product_id: int, platform: str, content_type: str = "post",
+                              job_id: Optional[int] = None):
+    """SNS 콘텐츠 생성 작업"""
+    return run_tracked_job(self, job_id, _generate_sns_content(product_id, platform, content_type))
+
+
+async def _with_batch_service(action):
+    """작업별 세션으로 OpenAIBatchService 호출"""
+    db = SessionLocal()
+    try:
+        return await action(OpenAIBatchService(db))
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _schedule_batch_poll(batch_id: str, operation: str, job_id: Optional[int], poll_errors: int = 0):
+    """OPENAI_BATCH_POLL_INTERVAL초 뒤 배치 상태 조회 작업 등록"""
+    poll_openai_batch_task.apply_async(
+        args=(batch_id, operation),
+        kwargs={"job_id": job_id, "poll_errors": poll_errors},
+        countdown=settings.OPENAI_BATCH_POLL_INTERVAL
+    )
+
+
+@celery_app.task(bind=True)
+def openai_batch_task(self, operation: str, product_ids: Optional[List[int]] = None,
+                      product_type: Optional[str] = None, import_source: Optional[str] = None,
+                      limit: Optional[int] = None, job_id: Optional[int] = None):
+    """OpenAI Batch API로 제품 설명/SEO 메타 정보 일괄 생성 요청 제출
+
+    제출 후에는 poll_openai_batch_task가 완료될 때까지 상태를 조회하며, 작업은 그동안 running 상태로 남습니다.
+    """
+    filters = {"product_ids": product_ids, "product_type": product_type, "import_source": import_source, "limit": limit}
+    if job_id:
+        JobService.mark_running(job_id, self.request.id)
+        # A redelivered submit must not pay for the same batch twice
+        progress = JobService.get_progress(job_id)
+        batch_id = ((progress or {}).get("result") or {}).get("batch_id")
+        if batch_id:
+            _schedule_batch_poll(batch_id, operation, job_id)
+            return {"operation": operation, "batch_id": batch_id}
+
+    try:
+        batch = run_async(_with_batch_service(lambda service: service.start(operation, **filters)))
+    except Exception as e:
+        if job_id:
+            JobService.finish(job_id, "failed", error=str(e))
+        raise
+
+    if batch is None:
+        result = {"operation": operation, "requests": 0, "updated": 0, "failed": 0}
+        if job_id:
+            JobService.finish(job_id, "completed", result=result)
+        return result
+
+    result = {"operation": operation, "batch_id": batch["id"], "input_file_id": batch.get("input_file_id")}
+    if job_id:
+        JobService.save_result(job_id, result)
+    _schedule_batch_poll(batch["id"], operation, job_id)
+    return result
+
+
+@celery_app.task(bind=True)
+def poll_openai_batch_task(self, batch_id: str, operation: str, job_id: Optional[int] = None, poll_errors: int = 0):
+    """배치 상태를 한 번 조회하고, 진행 중이면 다시 등록 / 종료되면 결과 반영"""
+    try:
+        batch = run_async(_with_batch_service(lambda service: service.poll(batch_id)))
+    except Exception as e:
+        if OpenAIBatchService.is_transient(e) and poll_errors + 1 < settings.OPENAI_BATCH_MAX_POLL_ERRORS:
+            LoggingService.log_warning(f"OpenAI 배치 상태 조회 실패, 재시도 예정: {batch_id}, 오류: {str(e)}")
+            _schedule_batch_poll(batch_id, operation, job_id, poll_errors + 1)
+            return {"batch_id": batch_id, "status": "poll_error", "poll_errors": poll_errors + 1}
+        if job_id:
+            JobService.finish(job_id, "failed", error=f"OpenAI 배치 상태 조회 실패: {batch_id}, 오류: {str(e)}")
+        raise
+
+    if batch["status"] not in BATCH_TERMINAL_STATUSES:
+        if job_id:
+            JobService.save_result(job_id, {
+                "operation": operation,
+                "batch_id": batch_id,
+                "status": batch["status"],
+                "request_counts": batch.get("request_counts")
+            })
+        _schedule_batch_poll(batch_id, operation, job_id)
+        return {"batch_id": batch_id, "status": batch["status"]}
+
+    return run_tracked_job(self, job_id, _with_batch_service(lambda service: service.finish(operation, batch)))
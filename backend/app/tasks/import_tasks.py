@@ -0,0 +1,45 @@
+from typing import List, Optional
+from app.core.celery_app import celery_app
+from app.core.database import SessionLocal
+from app.services.import_pipeline import ImportPipeline
+from app.services.job_service import JobService
+from app.services.logging_service import LoggingService
+from app.tasks.tracking import run_tracked_job
+
+
+def _pending_product_ids(product_ids: List[str]) -> List[str]:
+    """아직 임포트되지 않은 제품 ID만 반환 (재시도 시 중복 생성 방지)"""
+    db = SessionLocal()
+    try:
+        imported = ImportPipeline.imported_product_ids(db, product_ids)
+        return [product_id for product_id in product_ids if product_id not in imported]
+    finally:
+        db.close()
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=3
+)
+def import_products_task(self, product_ids: List[str], job_id: Optional[int] = None):
+    """알리익스프레스 제품 임포트 작업"""
+    pending_ids = _pending_product_ids(product_ids)
+    if job_id:
+        # Imported by an earlier attempt: count them as done instead of leaving them pending
+        pending = set(pending_ids)
+        JobService.record_items(job_id, done=[product_id for product_id in product_ids if product_id not in pending])
+
+    def report_progress(event):
+        if job_id:
+            JobService.record_items(job_id, done=event["done_items"], failed=event["failed_items"])
+        self.update_state(state="PROGRESS", meta={
+            key: event[key] for key in ("total", "imported", "failed", "pending")
+        })
+
+    LoggingService.log_info(f"임포트 작업 시작: {self.request.id}, {len(pending_ids)}개 제품")
+    pipeline = ImportPipeline(progress_callback=report_progress)
+    return run_tracked_job(self, job_id, pipeline.run(pending_ids))
@@ -0,0 +1,46 @@
+from typing import Optional
+from app.core.celery_app import celery_app
+from app.core.database import SessionLocal
+from app.services.product_sync_service import ProductSyncService
+from app.tasks.tracking import run_tracked_job
+
+
+async def _run_sync(full: bool, bulk: bool):
+    """동기화 실행 (작업별 세션 사용)"""
+    db = SessionLocal()
+    try:
+        sync_service = ProductSyncService(db)
+        if bulk:
+            return await sync_service.import_bulk_export()
+        return await sync_service.sync_products(full=full)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=5
+)
+def sync_shopify_products_task(self, full: bool = False, job_id: Optional[int] = None):
+    """Shopify 제품 증분 동기화 작업"""
+    return run_tracked_job(self, job_id, _run_sync(full=full, bulk=False))
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=2
+)
+def bulk_export_products_task(self, job_id: Optional[int] = None):
+    """Shopify bulk export 동기화 작업"""
+    return run_tracked_job(self, job_id, _run_sync(full=True, bulk=True))
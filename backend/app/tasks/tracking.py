@@ -0,0 +1,39 @@
+import asyncio
+from typing import Optional, Coroutine
+from app.core.http_client import close_http_clients
+from app.services.browser_pool import browser_pool
+from app.services.job_service import JobService
+
+
+async def _run_with_cleanup(coro: Coroutine):
+    """작업 코루틴 실행 후 같은 이벤트 루프에서 공유 리소스 정리"""
+    try:
+        return await coro
+    finally:
+        # Each task runs on a fresh loop, so pooled browsers/clients must not outlive it
+        await browser_pool.close()
+        await close_http_clients()
+
+
+def run_async(coro: Coroutine):
+    """작업 안에서 코루틴을 새 이벤트 루프로 실행 (공유 리소스 정리 포함)"""
+    return asyncio.run(_run_with_cleanup(coro))
+
+
+def run_tracked_job(task, job_id: Optional[int], coro: Coroutine):
+    """코루틴을 실행하며 jobs 테이블 상태(running/retrying/completed/failed) 갱신"""
+    if job_id:
+        JobService.mark_running(job_id, task.request.id)
+
+    try:
+        result = run_async(coro)
+    except Exception as e:
+        if job_id:
+            retriable = isinstance(e, tuple(getattr(task, "autoretry_for", ()) or ()))
+            will_retry = retriable and task.request.retries < task.max_retries
+            JobService.finish(job_id, "retrying" if will_retry else "failed", error=str(e))
+        raise
+
+    if job_id:
+        JobService.finish(job_id, "completed", result=result)
+    return result
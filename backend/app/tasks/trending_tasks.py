@@ -0,0 +1,30 @@
+from typing import List, Optional
+from app.core.celery_app import celery_app
+from app.core.database import SessionLocal
+from app.services.trending_service import TrendingService
+from app.tasks.tracking import run_tracked_job
+
+
+async def _run_crawl(categories: Optional[List[str]]):
+    """인기 제품 스냅샷 수집 실행 (작업별 세션 사용)"""
+    db = SessionLocal()
+    try:
+        return await TrendingService(db).crawl(categories=categories)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=2
+)
+def crawl_trending_task(self, categories: Optional[List[str]] = None, job_id: Optional[int] = None):
+    """카테고리별 인기 제품 스냅샷 수집 작업 (celery beat로 주기 실행)"""
+    return run_tracked_job(self, job_id, _run_crawl(categories))
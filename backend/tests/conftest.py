@@ -0,0 +1,41 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+import pytest
+
+# Settings are read at import time: point the app at local, dependency-free backends
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("REDIS_URL", "")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("SHOPIFY_SHOP_URL", "test-shop.myshopify.com")
+os.environ.setdefault("SHOPIFY_ACCESS_TOKEN", "test-token")
+# Keep test-run log files out of the real log directory
+os.environ.setdefault("LOG_FILE_PATH", tempfile.mkdtemp(prefix="test-logs-"))
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(autouse=True)
+def no_db_logging(monkeypatch):
+    """서비스 로그를 logs 테이블에 쓰지 않음 (테스트 DB에는 테이블이 없거나 테스트마다 비워짐)"""
+    from app.services.logging_service import LoggingService
+
+    monkeypatch.setattr(LoggingService, "log_to_db", staticmethod(lambda *args, **kwargs: None))
+
+
+@pytest.fixture
+def db():
+    """테이블을 만든 인메모리 SQLite 세션 (SessionLocal을 쓰는 서비스와 같은 연결을 공유)"""
+    from app.core.database import SessionLocal, engine
+    from app.models import Base
+
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
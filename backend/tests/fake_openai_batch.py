@@ -0,0 +1,111 @@
+"""OpenAI Batch API 가짜 서버
+
+업로드된 요청 JSONL의 custom_id에 해당하는 응답을 fixtures/openai_batch/output.jsonl에서 골라 재생합니다.
+테스트에서는 ASGI 앱으로 직접 호출하고, 수동 확인 시에는 아래처럼 띄운 뒤
+OPENAI_BASE_URL=http://localhost:9000/v1 로 지정합니다.
+
+    uvicorn tests.fake_openai_batch:app --port 9000
+"""
+import json
+from pathlib import Path
+from typing import Dict, List
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import PlainTextResponse
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "openai_batch"
+
+
+class FakeOpenAIBatchAPI:
+    """/files, /batches 엔드포인트만 흉내 내는 인메모리 서버
+
+    생성된 배치는 polls_until_complete번 조회될 때까지 in_progress로 응답하고,
+    fail_with에 상태 코드를 넣어 두면 다음 상태 조회들이 해당 오류로 응답합니다.
+    """
+
+    def __init__(self, fixture_dir: Path = FIXTURE_DIR, polls_until_complete: int = 1):
+        self.outputs = {
+            result["custom_id"]: result
+            for result in map(json.loads, (fixture_dir / "output.jsonl").read_text(encoding="utf-8").splitlines())
+        }
+        self.polls_until_complete = polls_until_complete
+        self.fail_with: List[int] = []
+        self.files: Dict[str, str] = {}
+        self.batches: Dict[str, Dict] = {}
+        self.polls: Dict[str, int] = {}
+        self.app = self._build_app()
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.post("/v1/files")
+        async def upload_file(purpose: str = Form(...), file: UploadFile = File(...)):
+            file_id = f"file-{len(self.files) + 1}"
+            self.files[file_id] = (await file.read()).decode("utf-8")
+            return {"id": file_id, "object": "file", "purpose": purpose, "filename": file.filename}
+
+        @app.post("/v1/batches")
+        async def create_batch(body: Dict):
+            if body["input_file_id"] not in self.files:
+                raise HTTPException(status_code=404, detail="No such File object")
+            batch_id = f"batch-{len(self.batches) + 1}"
+            self.batches[batch_id] = {
+                "id": batch_id,
+                "object": "batch",
+                "endpoint": body["endpoint"],
+                "input_file_id": body["input_file_id"],
+                "completion_window": body["completion_window"],
+                "metadata": body.get("metadata"),
+                "status": "validating",
+                "output_file_id": None,
+                "request_counts": {"total": 0, "completed": 0, "failed": 0}
+            }
+            self.polls[batch_id] = 0
+            return self.batches[batch_id]
+
+        @app.get("/v1/batches/{batch_id}")
+        async def get_batch(batch_id: str):
+            if self.fail_with:
+                raise HTTPException(status_code=self.fail_with.pop(0), detail="fake error")
+            if batch_id not in self.batches:
+                raise HTTPException(status_code=404, detail="No such Batch object")
+
+            self.polls[batch_id] += 1
+            batch = self.batches[batch_id]
+            if self.polls[batch_id] <= self.polls_until_complete:
+                batch["status"] = "in_progress"
+            elif batch["status"] != "completed":
+                self._complete(batch)
+            return batch
+
+        @app.get("/v1/files/{file_id}/content")
+        async def file_content(file_id: str):
+            if file_id not in self.files:
+                raise HTTPException(status_code=404, detail="No such File object")
+            return PlainTextResponse(self.files[file_id], media_type="application/jsonl")
+
+        return app
+
+    def _complete(self, batch: Dict):
+        """입력 요청마다 고정 응답(없으면 오류 응답)을 담은 결과 파일 생성"""
+        requests = [json.loads(line) for line in self.files[batch["input_file_id"]].splitlines() if line.strip()]
+        results = []
+        for request in requests:
+            result = self.outputs.get(request["custom_id"]) or {
+                "id": f"batch_req_{request['custom_id']}",
+                "custom_id": request["custom_id"],
+                "response": None,
+                "error": {"code": "fixture_missing", "message": "고정 응답 없음"}
+            }
+            results.append(result)
+
+        output_file_id = f"file-{len(self.files) + 1}"
+        self.files[output_file_id] = "\n".join(json.dumps(result, ensure_ascii=False) for result in results) + "\n"
+        failed = sum(1 for result in results if (result.get("response") or {}).get("status_code") != 200)
+        batch.update({
+            "status": "completed",
+            "output_file_id": output_file_id,
+            "request_counts": {"total": len(results), "completed": len(results) - failed, "failed": failed}
+        })
+
+
+app = FakeOpenAIBatchAPI(polls_until_complete=3).app
@@ -0,0 +1,67 @@
+from app.services.aliexpress_page_parser import is_blocked_page, is_empty_listing, parse_product_page
+from tests.conftest import FIXTURES
+
+PAGES = FIXTURES / "aliexpress"
+
+
+def load(name):
+    return (PAGES / name).read_text(encoding="utf-8")
+
+
+def test_run_params_state():
+    url = "https://www.aliexpress.com/item/1005001.html"
+
+    detail = parse_product_page(load("product_runparams.html"), "1005001", url)
+
+    assert detail == {
+        "id": "1005001",
+        "title": "Wireless Earbuds Bluetooth 5.3 ENC Noise Cancelling",
+        "price": "US $12.66",
+        "description": "Bluetooth 5.3 earbuds with 30h battery.",
+        "images": ["https://ae01.alicdn.com/kf/earbuds-main.jpg", "https://ae01.alicdn.com/kf/earbuds-case.jpg"],
+        "variants": [{"name": "Black", "price": "US $12.66"}, {"name": "white", "price": "US $13.10"}],
+        "shipping": "AliExpress Standard Shipping, ships to US",
+        "rating": "4.8",
+        "reviews_count": "532",
+        "orders": "1,234",
+        "url": url
+    }
+
+
+def test_dc_data_state():
+    detail = parse_product_page(load("product_dcdata.html"), "1005006123456789")
+
+    assert detail["title"] == "Stainless Steel Tumbler 500ml Vacuum Insulated"
+    assert detail["price"] == "US $7.49"
+    assert detail["images"] == ["https://ae01.alicdn.com/kf/tumbler-silver.jpg"]
+    assert detail["shipping"] == "ships to United States"
+    assert detail["variants"] == []
+
+
+def test_dom_fallback_without_embedded_state():
+    detail = parse_product_page(load("product_dom.html"), "1005002", "https://www.aliexpress.com/item/1005002.html")
+
+    assert detail["title"] == "LED Desk Lamp Touch Dimmable"
+    assert detail["price"] == "US $19.00"
+    assert detail["images"] == ["https://ae01.alicdn.com/kf/lamp-1.jpg", "https://ae01.alicdn.com/kf/lamp-2.jpg"]
+    assert detail["variants"] == [{"name": "Warm White", "price": "US $19.00"}, {"name": "Cool White", "price": None}]
+    assert detail["shipping"] == "Free shipping to United States"
+    assert detail["reviews_count"] == "87 Reviews"
+
+
+def test_blocked_page_is_detected_and_not_parsed():
+    html = load("blocked.html")
+
+    assert is_blocked_page(html)
+    assert parse_product_page(html, "1005006123456789") is None
+
+
+def test_blocked_url_without_markers_in_body():
+    assert is_blocked_page("<html></html>", "https://login.aliexpress.com/?return_url=item")
+    assert not is_blocked_page(load("product_dom.html"), "https://www.aliexpress.com/item/1005002.html")
+
+
+def test_empty_listing_is_not_a_product_page_failure():
+    assert is_empty_listing(load("search_empty.html"))
+    assert not is_empty_listing(load("product_dom.html"))
+    assert not is_empty_listing(load("blocked.html"))
@@ -0,0 +1,63 @@
+from urllib.parse import parse_qs, urlparse
+import pytest
+from app.core.config import settings
+from app.services.aliexpress_service import AliExpressService
+
+
+class ScriptedListings(AliExpressService):
+    """페이지별 시도 결과 목록(제품 카드 목록 또는 예외, 마지막 결과 반복)을 재생하는 검색 대역"""
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = script
+        self.calls = {}
+
+    async def _scrape_listing(self, url, operation, limit):
+        page = int(parse_qs(urlparse(url).query)["page"][0])
+        self.calls[page] = self.calls.get(page, 0) + 1
+        outcomes = self.script.get(page, [[]])
+        outcome = outcomes[min(self.calls[page], len(outcomes)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def cards(*ids):
+    return [{"id": str(product_id)} for product_id in ids]
+
+
+@pytest.fixture(autouse=True)
+def small_pages(monkeypatch):
+    monkeypatch.setattr(settings, "ALIEXPRESS_SEARCH_PAGE_SIZE", 2)
+    monkeypatch.setattr(settings, "ALIEXPRESS_SEARCH_MAX_PAGES", 6)
+    monkeypatch.setattr(settings, "ALIEXPRESS_SEARCH_PAGE_RETRIES", 2)
+    monkeypatch.setattr(settings, "ALIEXPRESS_SEARCH_RETRY_DELAY", 0)
+
+
+async def collect(service, limit):
+    return [chunk async for chunk in service.iter_search_pages("lamp", limit=limit)]
+
+
+async def test_failed_page_is_retried_and_skipped_without_ending_pagination():
+    service = ScriptedListings({
+        1: [TimeoutError("slow"), cards(1, 2)],
+        2: [TimeoutError("never loads")],
+        3: [cards(3, 4)],
+        4: [cards(5, 6)],
+    })
+
+    chunks = await collect(service, limit=6)
+
+    assert [product["id"] for chunk in chunks for product in chunk["products"]] == ["1", "2", "3", "4", "5", "6"]
+    assert {"page": 2, "products": [], "error": "never loads"} in chunks
+    assert service.calls[1] == 2 and service.calls[2] == 3
+
+
+async def test_empty_page_stops_fetching_more_pages():
+    service = ScriptedListings({1: [cards(1, 2)], 2: [[]]})
+
+    chunks = await collect(service, limit=10)
+
+    assert [product["id"] for chunk in chunks for product in chunk["products"]] == ["1", "2"]
+    # Pages 1-5 start together for limit=10; nothing beyond them is launched after the empty page
+    assert max(service.calls) == 5
@@ -0,0 +1,142 @@
+import asyncio
+import pytest
+from app.core.config import settings
+from app.services import cache_service
+from app.services.cache_service import CacheService
+from app.utils import cache as cache_utils
+
+
+class FakeClock:
+    """time.time()/time.monotonic()을 함께 대체하는 수동 시계"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_service, "time", clock)
+    monkeypatch.setattr(cache_utils, "time", clock)
+    return clock
+
+
+class Source:
+    """호출될 때마다 버전이 올라가는 조회 대역"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return {"version": self.calls}
+
+
+async def test_hit_and_miss_in_memory(clock):
+    cache = CacheService("test")
+    source = Source()
+    key = cache.make_key("search", keyword="  Wireless   EARBUDS ", page=1.0)
+
+    first = await cache.get_or_fetch(key, source, ttl=60)
+    second = await cache.get_or_fetch(cache.make_key("search", keyword="wireless earbuds", page=1), source, ttl=60)
+
+    assert first == second == {"version": 1} and source.calls == 1
+    assert cache.get_stats()["backend"] == "memory"
+    assert {name: cache.get_stats()[name] for name in ("hits", "misses", "hit_rate")} == {
+        "hits": 1, "misses": 1, "hit_rate": 0.5
+    }
+
+
+async def test_entry_expires_after_ttl(clock):
+    cache = CacheService("test")
+    source = Source()
+
+    await cache.get_or_fetch("test:key", source, ttl=60)
+    clock.advance(61)
+
+    assert await cache.get_or_fetch("test:key", source, ttl=60) == {"version": 2}
+    assert cache.stats["misses"] == 2
+
+
+async def test_stale_value_is_served_while_refreshing(clock):
+    cache = CacheService("test")
+    source = Source()
+
+    await cache.get_or_fetch("test:key", source, ttl=60, stale_ttl=300)
+    clock.advance(120)
+
+    assert await cache.get_or_fetch("test:key", source, ttl=60, stale_ttl=300) == {"version": 1}
+    await asyncio.gather(*cache._refresh_tasks)
+
+    assert await cache.get_or_fetch("test:key", source, ttl=60, stale_ttl=300) == {"version": 2}
+    assert {name: cache.stats[name] for name in ("hits", "stale_hits", "refreshes")} == {
+        "hits": 1, "stale_hits": 1, "refreshes": 1
+    }
+
+
+async def test_empty_results_are_not_cached(clock):
+    cache = CacheService("test")
+    calls = []
+
+    async def empty():
+        calls.append(1)
+        return []
+
+    await cache.get_or_fetch("test:key", empty, ttl=60)
+    await cache.get_or_fetch("test:key", empty, ttl=60)
+
+    assert len(calls) == 2
+
+
+async def test_unreachable_redis_falls_back_to_memory(clock, monkeypatch):
+    connects = []
+
+    class UnreachableRedis:
+        async def ping(self):
+            raise ConnectionError("Connection refused")
+
+    def from_url(url, **kwargs):
+        connects.append(url)
+        return UnreachableRedis()
+
+    monkeypatch.setattr(cache_service.aioredis, "from_url", from_url)
+    cache = CacheService("test", redis_url="redis://127.0.0.1:6390")
+    source = Source()
+
+    assert await cache.get_or_fetch("test:key", source, ttl=60) == {"version": 1}
+    assert await cache.get_or_fetch("test:key", source, ttl=60) == {"version": 1}
+
+    # One failed connection, then memory only until the retry interval passes
+    assert connects == ["redis://127.0.0.1:6390"]
+    assert cache.get_stats()["backend"] == "memory" and cache.get_stats()["memory_entries"] == 1
+    clock.advance(settings.CACHE_REDIS_RETRY_INTERVAL + 1)
+    await cache.get_or_fetch("test:other", source, ttl=60)
+    assert len(connects) == 2
+
+
+async def test_redis_error_mid_request_switches_to_memory(clock):
+    class BrokenRedis:
+        async def get(self, key):
+            raise ConnectionError("Connection reset by peer")
+
+        async def set(self, *args, **kwargs):
+            raise ConnectionError("Connection reset by peer")
+
+    cache = CacheService("test", redis_url="redis://127.0.0.1:6390")
+    cache._redis = BrokenRedis()
+    cache._redis_loop = asyncio.get_running_loop()
+    source = Source()
+
+    assert await cache.get_or_fetch("test:key", source, ttl=60) == {"version": 1}
+    assert await cache.get_or_fetch("test:key", source, ttl=60) == {"version": 1}
+
+    assert cache.stats["errors"] == 1 and cache.stats["hits"] == 1
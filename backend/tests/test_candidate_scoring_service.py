@@ -0,0 +1,50 @@
+from app.services.aliexpress_service import AliExpressService
+from app.services.candidate_scoring_service import CandidateScoringService
+
+TRICKY_PRODUCTS = [
+    {"price": "US $12.99", "orders": "1,234 sold", "rating": "4.8", "reviews_count": "321 reviews",
+     "shipping": "Free shipping to US"},
+    {"price": "€ 3,50", "orders": "10K+ orders", "rating": "48", "reviews_count": "", "shipping": "Ships from CN"},
+    {"price": None, "orders": None, "rating": None, "reviews_count": None, "shipping": None},
+    # NUL bytes and newlines must not shift later rows
+    {"price": "1\x002.5", "orders": "7\x00 sold", "rating": "4\n.5", "reviews_count": "a\x00b 9",
+     "shipping": "line\nships to us"},
+    # "İ".lower() is two characters long and must not move matches to another row
+    {"price": "İİİ 5.00", "orders": "İ 3", "rating": "İ 4.1", "reviews_count": "İ2", "shipping": "İİİİ"},
+    {"price": "1.2.3", "orders": "no orders", "rating": "4.5/5", "reviews_count": "0",
+     "shipping": "UNITED STATES warehouse"},
+    {"price": ".", "orders": "0", "rating": "5.", "reviews_count": "12", "shipping": "US Shipping available"},
+    {"price": 19.5, "orders": 42, "rating": 4.2, "reviews_count": 7, "shipping": ""},
+]
+
+
+def test_to_frame_matches_per_row_extractors():
+    service = AliExpressService()
+    df = CandidateScoringService.to_frame(TRICKY_PRODUCTS)
+
+    assert len(df) == len(TRICKY_PRODUCTS)
+    for index, product in enumerate(TRICKY_PRODUCTS):
+        row = df.iloc[index]
+        assert row["price"] == service._extract_price(str(product["price"] or "")), index
+        assert row["orders"] == service._extract_number(str(product["orders"] or "")), index
+        assert row["reviews_count"] == service._extract_number(str(product["reviews_count"] or "")), index
+        assert row["rating"] == service._extract_rating(str(product["rating"] or "")), index
+        shipping = str(product["shipping"] or "").lower()
+        expected_shipping = any(indicator in shipping for indicator in AliExpressService.US_SHIPPING_INDICATORS)
+        assert bool(row["has_us_shipping"]) == expected_shipping, index
+
+
+def test_score_matches_per_row_path():
+    products = TRICKY_PRODUCTS * 3
+    vectorized = CandidateScoringService.score(products, top_k=10)
+    per_row = CandidateScoringService.score_per_row(products, top_k=10)
+    assert [item["score"] for item in vectorized] == [float(item["score"]) for item in per_row]
+
+
+def test_score_filters_and_formula():
+    ranked = CandidateScoringService.score(
+        TRICKY_PRODUCTS, min_orders=1, require_us_shipping=True, formula="orders * rating"
+    )
+    # "1,234 sold" parses as 1, exactly like _extract_number
+    assert [item["orders"] for item in ranked] == [7, 1]
+    assert all(item["has_us_shipping"] for item in ranked)
@@ -0,0 +1,54 @@
+import httpx
+import pytest
+from app.core import http_client
+from app.core.config import settings
+from app.models.product import Product
+from app.models.sns_content import SNSContent
+from app.services import openai_service
+from app.services.cache_service import CacheService
+from app.services.llm_rate_limiter import LLMRateLimiter
+from app.tasks.generation_tasks import generate_sns_content_task
+from tests.test_openai_concurrency import chat_completion
+
+
+@pytest.fixture
+def openai_replies(monkeypatch):
+    """준비된 응답(상태 코드)을 차례로 돌려주는 OpenAI 대역 (SDK 자체 재시도 없음)"""
+    replies = []
+
+    def handler(request):
+        status = replies.pop(0)
+        if status != 200:
+            return httpx.Response(status, json={"error": {"message": "upstream unavailable", "type": "server_error"}})
+        return httpx.Response(200, json=chat_completion("제목: 테스트\n설명: 생성된 설명\n해시태그: #테스트"))
+
+    monkeypatch.setattr(http_client, "_build_openai_client",
+                        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(http_client, "_openai_client", None)
+    monkeypatch.setattr(openai_service, "llm_rate_limiter", LLMRateLimiter(requests_per_minute=0, tokens_per_minute=0))
+    monkeypatch.setattr(openai_service, "llm_cache", CacheService("llm"))
+    monkeypatch.setattr(settings, "OPENAI_MAX_RETRIES", 0)
+    return replies
+
+
+def test_transient_llm_errors_are_retried(db, openai_replies):
+    db.add(Product(id=1, title="이어폰"))
+    db.commit()
+    openai_replies.extend([429, 503, 200])
+
+    result = generate_sns_content_task.apply(args=(1, "instagram")).get()
+
+    assert result["product_id"] == 1 and not openai_replies
+    assert [content.generated_content for content in db.query(SNSContent)] == ["제목: 테스트\n설명: 생성된 설명\n해시태그: #테스트"]
+
+
+def test_failed_generation_is_not_saved_as_content(db, openai_replies):
+    db.add(Product(id=1, title="이어폰"))
+    db.commit()
+    openai_replies.extend([400, 200])
+
+    result = generate_sns_content_task.apply(args=(1, "instagram"))
+
+    # A bad request is not retried and nothing is stored in place of the content
+    assert result.failed() and openai_replies == [200]
+    assert db.query(SNSContent).count() == 0
@@ -0,0 +1,27 @@
+import asyncio
+from app.core import http_client
+
+
+async def shared_clients():
+    return [http_client.get_shopify_client(), http_client.get_openai_http_client(), http_client.get_scraper_client()]
+
+
+def test_clients_are_closed_when_their_loop_shuts_down():
+    # Like a Celery task: asyncio.run() without an explicit close_http_clients()
+    first = asyncio.run(shared_clients())
+    second = asyncio.run(shared_clients())
+
+    assert all(client.is_closed for client in first + second)
+    assert not set(map(id, first)) & set(map(id, second))
+    assert http_client._loop_clients == {} and http_client._loop_closers == {}
+
+
+def test_clients_are_reused_within_a_loop():
+    async def twice():
+        first = await shared_clients()
+        second = await shared_clients()
+        return first, second
+
+    first, second = asyncio.run(twice())
+
+    assert [id(client) for client in first] == [id(client) for client in second]
@@ -0,0 +1,67 @@
+import pytest
+from app.models.product import Product
+from app.services.import_pipeline import ImportPipeline
+
+
+class FakeAliExpress:
+    def product_url(self, product_id):
+        return f"https://www.aliexpress.com/item/{product_id}.html"
+
+    async def get_product_detail(self, product_id):
+        return {"title": f"제품 {product_id}", "url": self.product_url(product_id)}
+
+    def transform_to_shopify_format(self, product_detail):
+        return {"title": product_detail["title"], "price": 9.99}
+
+
+class FakeShopify:
+    """handle로 생성된 제품을 기억하는 Shopify 대역"""
+
+    def __init__(self, existing_handles=()):
+        self.products = {handle: {"id": index, "handle": handle} for index, handle in enumerate(existing_handles, 1)}
+        self.created = []
+
+    async def find_product_by_handle(self, handle):
+        return self.products.get(handle)
+
+    async def create_product(self, product_data):
+        product = {"id": 100 + len(self.created), "handle": product_data["handle"]}
+        self.products[product_data["handle"]] = product
+        self.created.append(product_data["handle"])
+        return product
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    written = []
+    monkeypatch.setattr(ImportPipeline, "_upsert", staticmethod(written.extend))
+    pipeline = ImportPipeline(scrape_concurrency=2, shopify_concurrency=2, db_batch_size=10, queue_size=10)
+    pipeline.aliexpress_service = FakeAliExpress()
+    pipeline.written = written
+    return pipeline
+
+
+async def test_existing_shopify_product_is_reused_not_recreated(pipeline):
+    # "1001" was created on Shopify by an attempt whose DB write failed
+    pipeline.shopify_service = FakeShopify(existing_handles=["aliexpress-1001"])
+
+    report = await pipeline.run(["1001", "1002"])
+
+    assert report["imported"] == 2
+    assert pipeline.shopify_service.created == ["aliexpress-1002"]
+    rows = {row["source_id"]: row for row in pipeline.written}
+    assert rows["1001"]["shopify_id"] == "1"
+    assert rows["1002"]["handle"] == "aliexpress-1002"
+
+
+def test_imported_product_ids_match_exactly(db):
+    db.add_all([
+        Product(title="신규 방식", import_source="aliexpress", source_id="1005"),
+        # Written before source_id existed
+        Product(title="이전 방식", import_source="aliexpress", source_url="https://www.aliexpress.com/item/2007.html"),
+    ])
+    db.commit()
+
+    imported = ImportPipeline.imported_product_ids(db, ["1005", "100", "2007", "200", "05"])
+
+    assert imported == {"1005", "2007"}
@@ -0,0 +1,30 @@
+from app.models.job import Job, JobItem
+from app.services.job_service import JobService
+
+
+def counters(db, job_id):
+    db.expire_all()
+    job = db.get(Job, job_id)
+    return job.total_items, job.done_items, job.failed_items
+
+
+def test_repeated_records_do_not_double_count(db):
+    job = JobService.create_job(db, "import", item_keys=["a", "b", "c"])
+
+    JobService.record_items(job.id, done=["a"], failed={"b": "timeout"})
+    # A retried task reports "a" again and "b" succeeds this time
+    JobService.record_items(job.id, done=["a", "b"])
+    JobService.record_items(job.id, done=["a", "b"])
+
+    assert counters(db, job.id) == (3, 2, 0)
+    item_b = db.query(JobItem).filter(JobItem.job_id == job.id, JobItem.item_key == "b").one()
+    assert (item_b.status, item_b.error) == ("done", None)
+
+
+def test_unknown_items_are_inserted(db):
+    job = JobService.create_job(db, "import", item_keys=["a"])
+
+    JobService.record_items(job.id, failed={"z": "not found"})
+
+    assert counters(db, job.id) == (2, 0, 1)
+    assert JobService.get_progress(job.id)["pending"] == 1
@@ -0,0 +1,127 @@
+import httpx
+import pytest
+from app.models.job import Job
+from app.models.product import Product
+from app.services import openai_batch_service
+from app.services.openai_batch_service import OpenAIBatchService
+from app.tasks import generation_tasks
+from tests.fake_openai_batch import FakeOpenAIBatchAPI
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    fake = FakeOpenAIBatchAPI(polls_until_complete=1)
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake.app))
+    monkeypatch.setattr(openai_batch_service, "get_openai_http_client", lambda: client)
+    monkeypatch.setattr(openai_batch_service.settings, "OPENAI_BASE_URL", "http://fake-openai/v1")
+    return fake
+
+
+@pytest.fixture
+def products(db):
+    rows = [
+        Product(id=1, title="무선 블루투스 이어폰", price=29.9, product_type="audio"),
+        Product(id=2, title="스테인리스 텀블러", price=12.5, product_type="kitchen"),
+        Product(id=3, title="LED 스탠드", price=19.0, product_type="lighting"),
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+@pytest.fixture
+def scheduled(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        generation_tasks.poll_openai_batch_task, "apply_async",
+        lambda args, kwargs, countdown: calls.append({"args": args, "kwargs": kwargs, "countdown": countdown})
+    )
+    return calls
+
+
+async def test_seo_batch_round_trip_replays_fixture_outputs(db, products, fake_api):
+    service = OpenAIBatchService(db)
+
+    batch = await service.start("seo")
+    assert (await service.poll(batch["id"]))["status"] == "in_progress"
+    batch = await service.poll(batch["id"])
+    assert batch["status"] == "completed"
+
+    result = await service.finish("seo", batch)
+
+    assert result["updated"] == 2
+    assert result["failed"] == 1  # seo-3 is replayed as a 429 response
+    db.expire_all()
+    earbuds, tumbler, lamp = db.query(Product).order_by(Product.id).all()
+    assert earbuds.meta_title == "무선 블루투스 이어폰 | 노이즈 캔슬링"
+    assert tumbler.meta_description == "12시간 보온 보냉, 가볍고 튼튼한 데일리 텀블러."
+    assert lamp.meta_title is None
+
+
+async def test_empty_generations_are_counted_as_failed(db, products, fake_api):
+    service = OpenAIBatchService(db)
+
+    batch = await service.start("description", product_ids=[1, 2])
+    await service.poll(batch["id"])
+    result = await service.finish("description", await service.poll(batch["id"]))
+
+    assert (result["updated"], result["failed"]) == (1, 1)
+    db.expire_all()
+    assert db.get(Product, 2).description is None
+
+
+async def test_start_without_products_submits_nothing(db, fake_api):
+    assert await OpenAIBatchService(db).start("seo") is None
+    assert fake_api.batches == {}
+
+
+@pytest.mark.parametrize("status_code, transient", [(429, True), (500, True), (503, True), (401, False), (404, False)])
+def test_only_rate_limits_and_server_errors_are_transient(status_code, transient):
+    request = httpx.Request("GET", "http://fake-openai/v1/batches/batch-1")
+    error = httpx.HTTPStatusError("error", request=request, response=httpx.Response(status_code, request=request))
+    assert OpenAIBatchService.is_transient(error) is transient
+
+
+def test_transport_errors_are_transient():
+    assert OpenAIBatchService.is_transient(httpx.ConnectTimeout("timeout"))
+    assert not OpenAIBatchService.is_transient(ValueError("bad payload"))
+
+
+def test_poll_task_reschedules_itself_until_the_batch_finishes(db, products, fake_api, scheduled):
+    job = Job(job_type="openai_batch", status="queued")
+    db.add(job)
+    db.commit()
+
+    generation_tasks.openai_batch_task("seo", job_id=job.id)
+    assert len(scheduled) == 1
+    batch_id, operation = scheduled[0]["args"]
+    assert scheduled[0]["countdown"] == generation_tasks.settings.OPENAI_BATCH_POLL_INTERVAL
+
+    generation_tasks.poll_openai_batch_task(batch_id, operation, job_id=job.id)
+    assert len(scheduled) == 2
+    db.refresh(job)
+    assert job.status == "running"
+    assert job.result["status"] == "in_progress"
+
+    generation_tasks.poll_openai_batch_task(batch_id, operation, job_id=job.id)
+    assert len(scheduled) == 2
+    db.refresh(job)
+    assert job.status == "completed"
+    assert job.result["updated"] == 2
+
+
+def test_poll_task_retries_server_errors_but_fails_on_auth_errors(db, products, fake_api, scheduled):
+    job = Job(job_type="openai_batch", status="running")
+    db.add(job)
+    db.commit()
+
+    fake_api.fail_with = [503]
+    generation_tasks.poll_openai_batch_task("batch-1", "seo", job_id=job.id)
+    assert scheduled[-1]["kwargs"]["poll_errors"] == 1
+
+    fake_api.fail_with = [401]
+    with pytest.raises(httpx.HTTPStatusError):
+        generation_tasks.poll_openai_batch_task("batch-1", "seo", job_id=job.id, poll_errors=1)
+    assert len(scheduled) == 1
+    db.refresh(job)
+    assert job.status == "failed"
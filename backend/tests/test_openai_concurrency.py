@@ -0,0 +1,67 @@
+import asyncio
+import time
+import httpx
+import pytest
+from app.core import http_client
+from app.main import app
+from app.services import openai_service
+from app.services.llm_rate_limiter import LLMRateLimiter
+from app.services.openai_service import OpenAIService
+
+UPSTREAM_DELAY = 0.2
+GENERATIONS = 20
+
+
+def chat_completion(content):
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-3.5-turbo",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+    }
+
+
+@pytest.fixture
+def slow_openai(monkeypatch):
+    """UPSTREAM_DELAY초 뒤 응답하는 OpenAI 대역 (동시에 처리 중인 요청 수 기록)"""
+    state = {"in_flight": 0, "peak": 0}
+
+    async def handler(request):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(UPSTREAM_DELAY)
+        state["in_flight"] -= 1
+        return httpx.Response(200, json=chat_completion("생성된 콘텐츠"))
+
+    monkeypatch.setattr(http_client, "_build_openai_client",
+                        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(http_client, "_openai_client", None)
+    monkeypatch.setattr(openai_service, "llm_rate_limiter", LLMRateLimiter(requests_per_minute=0, tokens_per_minute=0))
+    return state
+
+
+async def test_generations_run_concurrently_and_health_stays_responsive(slow_openai):
+    service = OpenAIService()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as api:
+        started = time.perf_counter()
+        generations = asyncio.gather(*(
+            service.generate(f"제품 {index} 소개 글", use_cache=False) for index in range(GENERATIONS)
+        ))
+        await asyncio.sleep(UPSTREAM_DELAY / 4)
+
+        health_started = time.perf_counter()
+        health = await api.get("/health")
+        health_seconds = time.perf_counter() - health_started
+
+        results = await generations
+        elapsed = time.perf_counter() - started
+
+    assert results == ["생성된 콘텐츠"] * GENERATIONS
+    assert slow_openai["peak"] == GENERATIONS
+    # Serialized calls would take GENERATIONS * UPSTREAM_DELAY (4s)
+    assert elapsed < UPSTREAM_DELAY * 3
+    assert health.status_code == 200
+    assert health_seconds < UPSTREAM_DELAY / 2
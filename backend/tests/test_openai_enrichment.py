@@ -0,0 +1,63 @@
+import json
+import httpx
+import pytest
+from app.core import http_client
+from app.core.config import settings
+from app.services import openai_service
+from app.services.llm_rate_limiter import LLMRateLimiter
+from app.services.openai_service import OpenAIService, TruncatedResponseError
+from tests.test_openai_concurrency import chat_completion
+
+PLATFORMS = ["instagram"]
+ENRICHMENT = json.dumps({
+    "description": "<p>블루투스 5.3 이어폰</p>",
+    "seo": {"meta_title": "무선 이어폰", "meta_description": "30시간 재생", "keywords": ["이어폰"]},
+    "sns": {"instagram": {"title": "새 이어폰", "description": "지금 만나보세요", "hashtags": ["#이어폰"], "cta": "구매하기"}},
+    "sentiment": {"score": 8, "sentiment": "긍정적", "improvements": ["배터리 정보 추가"]}
+}, ensure_ascii=False)
+
+
+def openai_responding(monkeypatch, complete_from):
+    """max_tokens가 complete_from 미만이면 잘린 JSON(finish_reason=length)을 돌려주는 OpenAI 대역"""
+    requested = []
+
+    def handler(request):
+        max_tokens = json.loads(request.content)["max_tokens"]
+        requested.append(max_tokens)
+        if complete_from is None or max_tokens < complete_from:
+            body = chat_completion(ENRICHMENT[:40])
+            body["choices"][0]["finish_reason"] = "length"
+        else:
+            body = chat_completion(ENRICHMENT)
+        return httpx.Response(200, json=body)
+
+    monkeypatch.setattr(http_client, "_build_openai_client",
+                        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(http_client, "_openai_client", None)
+    monkeypatch.setattr(openai_service, "llm_rate_limiter", LLMRateLimiter(requests_per_minute=0, tokens_per_minute=0))
+    monkeypatch.setattr(settings, "OPENAI_ENRICH_MAX_TOKENS", 3000)
+    monkeypatch.setattr(settings, "OPENAI_ENRICH_MAX_TOKENS_LIMIT", 8000)
+    return requested
+
+
+async def test_truncated_response_is_retried_with_more_tokens_and_not_cached(monkeypatch):
+    requested = openai_responding(monkeypatch, complete_from=6000)
+    service = OpenAIService()
+    product = {"title": "잘림 재시도 이어폰", "price": 18.99}
+
+    result = await service.enrich_product(product, PLATFORMS, use_cache=True)
+    again = await service.enrich_product(product, PLATFORMS, use_cache=True)
+
+    assert result == again
+    assert result["seo"]["meta_title"] == "무선 이어폰"
+    # The truncated 3000-token answer was not cached; the 6000-token one was
+    assert requested == [3000, 6000, 3000]
+
+
+async def test_truncation_at_the_limit_fails_with_a_clear_error(monkeypatch):
+    requested = openai_responding(monkeypatch, complete_from=None)
+
+    with pytest.raises(TruncatedResponseError, match="8000"):
+        await OpenAIService().enrich_product({"title": "항상 잘리는 제품"}, PLATFORMS, use_cache=False)
+
+    assert requested == [3000, 6000, 8000]
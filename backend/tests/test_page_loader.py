@@ -0,0 +1,73 @@
+import asyncio
+from playwright.async_api import Error as PlaywrightError
+from app.services.page_loader import PageLoader
+
+
+class FakeResponse:
+    def __init__(self, headers, body):
+        self.headers = headers
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+
+class FakeRequest:
+    """sizes()가 실패하면 응답 헤더/본문으로 대체되는 요청 대역"""
+
+    def __init__(self, body_size=None, headers=None, body=b""):
+        self.body_size = body_size
+        self._response = FakeResponse(headers or {}, body)
+
+    async def sizes(self):
+        await asyncio.sleep(0.01)
+        if self.body_size is None:
+            raise PlaywrightError("sizes unavailable")
+        return {"requestBodySize": 0, "requestHeadersSize": 100,
+                "responseBodySize": self.body_size, "responseHeadersSize": 200}
+
+    async def response(self):
+        return self._response
+
+
+class FakePage:
+    """goto 시 requestfinished 이벤트를 동기 발생시키는 Playwright Page 대역"""
+
+    def __init__(self, requests):
+        self.requests = requests
+        self.listeners = {}
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def goto(self, url, wait_until=None):
+        for request in self.requests:
+            for handler in list(self.listeners.get("requestfinished", [])):
+                handler(request)
+
+    async def wait_for_selector(self, selector, timeout=None):
+        pass
+
+
+async def test_bytes_come_from_actual_response_sizes():
+    page = FakePage([
+        # Chunked document: no content-length header, 48KB body
+        FakeRequest(body_size=48_000, headers={"transfer-encoding": "chunked"}),
+        FakeRequest(body_size=1_500, headers={"content-length": "1500"}),
+        FakeRequest(headers={"content-length": "700"}),
+        FakeRequest(headers={}, body=b"x" * 300),
+    ])
+    loader = PageLoader(lightweight=True)
+
+    metrics = await loader.load(page, "https://www.aliexpress.com/item/1.html", "h1", operation="detail")
+
+    assert metrics["requests"] == 4
+    assert metrics["bytes"] == 48_000 + 1_500 + 700 + 300
+    assert loader.stats.summary()["detail:lightweight"]["bytes"] == metrics["bytes"]
+    assert page.listeners["requestfinished"] == []
@@ -0,0 +1,40 @@
+import pytest
+from app.services.aliexpress_service import AliExpressService
+from app.services.pricing_rules import PricingTable, parse_prices
+
+
+def test_round_to_ending_absorbs_float_noise():
+    table = PricingTable({"default": {"markup": 1.5, "round_to": 0.99}})
+
+    prices = table.apply([12.66, 12.0, 10.0, 0.0])["price"].tolist()
+
+    # 12.66 * 1.5 is 18.990000000000002 in binary floating point
+    assert prices == [18.99, 18.99, 15.99, 0.0]
+
+
+@pytest.mark.parametrize("price_strs", [
+    ["US $12.66", "1.2.3", "", None, "abc", "1,234.50", "3\n4", 0, 5.5, "€\x00 9.90"],
+])
+def test_parse_prices_matches_per_row_extraction(price_strs):
+    service = AliExpressService()
+    expected = [service._extract_price(str(price_str or '')) for price_str in price_strs]
+
+    assert parse_prices(price_strs) == expected
+
+
+def test_malformed_product_is_skipped_not_whole_batch():
+    products = [
+        {"title": "정상 제품", "price": "US $12.66", "images": ["a.jpg"],
+         "variants": [{"name": "Black", "price": "13.00"}]},
+        {"title": "변형 형식 오류", "price": "9.99", "variants": "Black,White"},
+        "not a product",
+        {"title": "가격 오류", "price": "1.2.3"},
+    ]
+    table = PricingTable({"default": {"markup": 1.5, "round_to": 0.99}})
+
+    transformed = AliExpressService().transform_products_to_shopify_format(products, pricing_table=table)
+
+    assert [product["title"] for product in transformed] == ["정상 제품", "가격 오류"]
+    assert transformed[0]["price"] == 18.99
+    assert transformed[0]["variants"][0]["price"] == 19.99
+    assert transformed[1]["price"] == 0.0
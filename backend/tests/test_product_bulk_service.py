@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+from sqlalchemy.dialects import postgresql
+from app.models.product import Product
+from app.services.product_bulk_service import ProductBulkService
+
+
+class CapturingPostgresSession:
+    """PostgreSQL 방언으로 보이게 하고 실행할 문장만 모으는 세션 대역"""
+
+    def __init__(self):
+        self.statements = []
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+    def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return SimpleNamespace(all=lambda: [])
+
+
+def test_partial_rows_keep_existing_values(db):
+    db.add(Product(shopify_id="1", title="기존 제품", description="기존 설명", price=10.0, import_source="aliexpress"))
+    db.commit()
+
+    counts = ProductBulkService.upsert_products(
+        db,
+        [{"shopify_id": "1", "price": 12.5}, {"shopify_id": "2", "title": "신규 제품"}],
+        insert_defaults={"import_source": "shopify"}
+    )
+    db.commit()
+
+    assert counts == {"inserted": 1, "updated": 1}
+    existing, created = db.query(Product).order_by(Product.shopify_id).all()
+    assert (existing.title, existing.description, existing.price) == ("기존 제품", "기존 설명", 12.5)
+    assert existing.import_source == "aliexpress"
+    assert created.import_source == "shopify"
+
+
+def test_postgres_upsert_only_sets_columns_present_in_input():
+    session = CapturingPostgresSession()
+
+    ProductBulkService.upsert_products(
+        session,
+        [{"shopify_id": "1", "price": 12.5}, {"shopify_id": "2", "price": 3.0, "title": "신규 제품"}],
+        insert_defaults={"import_source": "shopify"}
+    )
+
+    price_only, with_title = sorted(session.statements, key=len)
+    set_clause = price_only.split("DO UPDATE SET", 1)[1]
+    assert "price = excluded.price" in set_clause
+    assert "title" not in set_clause and "description" not in set_clause
+    assert "import_source" not in set_clause
+    assert "title = excluded.title" in with_title.split("DO UPDATE SET", 1)[1]
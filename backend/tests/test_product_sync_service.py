@@ -0,0 +1,81 @@
+from datetime import datetime
+from app.models.product import Product
+from app.models.sync_state import ShopifySyncState
+from app.services.product_sync_service import ProductSyncService
+
+
+class FakeShopify:
+    """iter_products/get_product_count만 제공하는 Shopify 대역"""
+
+    shop_url = "test-shop.myshopify.com"
+
+    def __init__(self, products):
+        self.products = products
+        self.id_scans = 0
+
+    async def iter_products(self, updated_at_min=None, fields=None, pages=False):
+        if fields == ['id']:
+            self.id_scans += 1
+            yield [{"id": product["id"]} for product in self.products]
+            return
+        yield [
+            product for product in self.products
+            if updated_at_min is None
+            or ProductSyncService._parse_shopify_datetime(product["updated_at"]) >= updated_at_min.replace(tzinfo=None)
+        ]
+
+    async def get_product_count(self):
+        return len(self.products)
+
+
+def shopify_product(product_id, created_at, updated_at):
+    return {"id": product_id, "title": f"제품 {product_id}", "created_at": created_at, "updated_at": updated_at,
+            "variants": [{"price": "10.00"}]}
+
+
+def seed(db, shopify_ids, high_water):
+    db.add_all(Product(shopify_id=shopify_id, title=f"제품 {shopify_id}") for shopify_id in shopify_ids)
+    db.add(ShopifySyncState(shop_url=FakeShopify.shop_url, last_updated_at=high_water))
+    db.commit()
+
+
+async def test_delete_plus_create_with_equal_counts_still_reconciles(db):
+    seed(db, ["1", "2"], datetime(2024, 1, 1))
+    # Product 2 was deleted and product 3 created since the last sync: the counts stay at 2
+    shopify = FakeShopify([
+        shopify_product(1, "2023-12-01T00:00:00Z", "2023-12-01T00:00:00Z"),
+        shopify_product(3, "2024-01-02T00:00:00Z", "2024-01-02T00:00:00Z"),
+    ])
+
+    totals = await ProductSyncService(db, shopify_service=shopify).sync_products()
+
+    assert totals == {"inserted": 1, "updated": 0, "deleted": 1}
+    assert shopify.id_scans == 1
+    db.expire_all()
+    assert db.query(Product).filter(Product.shopify_id == "2").one().deleted_at is not None
+
+
+async def test_count_match_without_creates_skips_id_scan(db):
+    seed(db, ["1", "2"], datetime(2024, 1, 1))
+    shopify = FakeShopify([
+        shopify_product(1, "2023-12-01T00:00:00Z", "2024-01-03T00:00:00Z"),
+        shopify_product(2, "2023-12-01T00:00:00Z", "2023-12-01T00:00:00Z"),
+    ])
+
+    totals = await ProductSyncService(db, shopify_service=shopify).sync_products()
+
+    assert totals == {"inserted": 0, "updated": 1, "deleted": 0}
+    assert shopify.id_scans == 0
+
+
+async def test_equal_counts_with_creates_compare_ids(db):
+    seed(db, ["1", "2"], datetime(2024, 1, 1))
+    shopify = FakeShopify([
+        shopify_product(1, "2023-12-01T00:00:00Z", "2023-12-01T00:00:00Z"),
+        shopify_product(3, "2024-01-02T00:00:00Z", "2024-01-02T00:00:00Z"),
+    ])
+    service = ProductSyncService(db, shopify_service=shopify)
+
+    assert await service.reconcile_deletions(created=1) == 1
+    assert await service.reconcile_deletions() == 0
+    assert shopify.id_scans == 2
@@ -0,0 +1,116 @@
+import asyncio
+import time
+import pytest
+from app.services.scrape_session_pool import (
+    HostLimiter, NoScrapeSessionError, ScrapeBlockedError, ScrapeSessionPool
+)
+
+URL = "https://www.aliexpress.com/item/1005001.html"
+
+
+def make_pool(**overrides):
+    options = {
+        "user_agents": ["agent-a", "agent-b", "agent-c"],
+        "proxies": ["http://proxy-1:8080", "http://proxy-2:8080"],
+        "session_count": 3,
+        "host_concurrency": 3,
+        "host_rate": 0,
+        "quarantine_seconds": 60,
+        "max_failures": 2,
+    }
+    return ScrapeSessionPool(**{**options, **overrides})
+
+
+async def use(pool, url=URL, error=None):
+    """세션 하나를 빌려 쓰고(error가 있으면 블록 안에서 발생) 세션 ID 반환"""
+    async with pool.session(url) as session:
+        if error:
+            raise error
+        return session.id
+
+
+async def test_sessions_rotate_least_recently_used():
+    pool = make_pool()
+
+    used = [await use(pool) for _ in range(6)]
+
+    assert used == ["session-0", "session-1", "session-2"] * 2
+    assert [session.proxy for session in pool.sessions] == [
+        "http://proxy-1:8080", "http://proxy-2:8080", "http://proxy-1:8080"
+    ]
+    assert pool.sessions[1].context_options()["user_agent"] == "agent-b"
+
+
+async def test_blocked_session_is_quarantined_and_cookies_dropped():
+    pool = make_pool()
+    pool.sessions[0].update_cookies([{"name": "xman_t", "value": "flagged", "domain": ".aliexpress.com", "path": "/"}])
+
+    with pytest.raises(ScrapeBlockedError):
+        await use(pool, error=ScrapeBlockedError("captcha"))
+
+    blocked = pool.sessions[0]
+    assert blocked.quarantined and blocked.cookies == {} and blocked.blocks == 1
+    assert "session-0" not in {await use(pool) for _ in range(4)}
+    assert pool.get_stats()["healthy_sessions"] == 2
+
+
+async def test_consecutive_failures_quarantine_but_success_resets():
+    pool = make_pool(session_count=1)
+
+    with pytest.raises(TimeoutError):
+        await use(pool, error=TimeoutError())
+    await use(pool)
+    with pytest.raises(TimeoutError):
+        await use(pool, error=TimeoutError())
+    assert not pool.sessions[0].quarantined
+
+    with pytest.raises(TimeoutError):
+        await use(pool, error=TimeoutError())
+    assert pool.sessions[0].quarantined
+    with pytest.raises(NoScrapeSessionError):
+        await use(pool)
+
+
+async def test_quarantine_expires():
+    pool = make_pool(session_count=1)
+    with pytest.raises(ScrapeBlockedError):
+        await use(pool, error=ScrapeBlockedError("captcha"))
+
+    pool.sessions[0].quarantined_until = time.monotonic() - 1
+
+    assert await use(pool) == "session-0"
+
+
+async def test_host_concurrency_is_capped_per_host():
+    pool = make_pool(host_concurrency=2, session_count=6)
+    active = {"www.aliexpress.com": 0, "m.aliexpress.com": 0}
+    peak = dict(active)
+
+    async def hold(url, host):
+        async with pool.session(url):
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+            await asyncio.sleep(0.02)
+            active[host] -= 1
+
+    await asyncio.gather(*(
+        hold(f"https://{host}/item/{index}.html", host) for index in range(5) for host in active
+    ))
+
+    assert peak == {"www.aliexpress.com": 2, "m.aliexpress.com": 2}
+    assert pool.get_stats()["hosts"]["www.aliexpress.com"]["total_requests"] == 5
+
+
+async def test_host_rate_spaces_request_starts():
+    limiter = HostLimiter(concurrency=5, rate=20)  # one start every 50ms
+    starts = []
+
+    async def request():
+        async with limiter.slot():
+            starts.append(time.monotonic())
+
+    await asyncio.gather(*(request() for _ in range(4)))
+
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    assert all(gap >= 0.045 for gap in gaps)
+    assert limiter.snapshot()["total_requests"] == 4
@@ -0,0 +1,62 @@
+import httpx
+import pytest
+from app.models.product import Product
+from app.services import shopify_service
+from app.services.product_sync_service import ProductSyncService
+from app.services.shopify_service import ShopifyService
+from tests.conftest import FIXTURES
+
+RESULT_URL = "https://storage.googleapis.com/shopify-bulk/bulk_products.jsonl"
+
+
+@pytest.fixture
+def bulk_result(monkeypatch):
+    """bulk 작업 결과 URL에서 fixture JSONL을 내려주는 Shopify 클라이언트 대역"""
+    body = (FIXTURES / "shopify" / "bulk_products.jsonl").read_bytes()
+
+    def handler(request):
+        assert str(request.url) == RESULT_URL
+        return httpx.Response(200, content=body)
+
+    monkeypatch.setattr(shopify_service, "get_shopify_client",
+                        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+async def test_children_are_attached_to_their_parent_product(bulk_result):
+    products = [product async for product in ShopifyService().iter_bulk_results(RESULT_URL)]
+
+    assert [product["id"] for product in products] == ["1001", "1002", "1003"]
+    earbuds, lamp, tumbler = products
+    assert earbuds["tags"] == "aliexpress, import" and earbuds["status"] == "active"
+    assert earbuds["variants"] == [
+        {"id": "5001", "title": "Black", "sku": "EB-BLK", "price": "18.99",
+         "compare_at_price": "25.00", "inventory_quantity": 40},
+        {"id": "5002", "title": "White", "sku": "EB-WHT", "price": "19.99",
+         "compare_at_price": None, "inventory_quantity": 10},
+    ]
+    assert earbuds["images"] == [{"id": "7001", "src": "https://cdn.shopify.com/s/files/earbuds.jpg", "alt": "Earbuds"}]
+    # The orphan variant points at a product that is not in the export
+    assert lamp["variants"] == [] and lamp["images"] == [] and lamp["status"] == "draft"
+    assert [variant["sku"] for variant in tumbler["variants"]] == ["TB-500"]
+
+
+async def test_bulk_export_is_upserted_into_products(bulk_result, db):
+    service = ShopifyService()
+
+    async def start_bulk_product_export():
+        return "gid://shopify/BulkOperation/1"
+
+    async def wait_for_bulk_operation(operation_id, **kwargs):
+        return {"id": operation_id, "status": "COMPLETED", "url": RESULT_URL}
+
+    service.start_bulk_product_export = start_bulk_product_export
+    service.wait_for_bulk_operation = wait_for_bulk_operation
+
+    totals = await ProductSyncService(db, shopify_service=service).import_bulk_export()
+
+    assert totals == {"inserted": 3, "updated": 0}
+    earbuds = db.query(Product).filter(Product.shopify_id == "1001").one()
+    assert earbuds.price == 18.99 and earbuds.compare_at_price == 25.0
+    assert earbuds.inventory_quantity == 50
+    assert earbuds.image_url == "https://cdn.shopify.com/s/files/earbuds.jpg"
+    assert db.query(Product).filter(Product.shopify_id == "1002").one().price is None
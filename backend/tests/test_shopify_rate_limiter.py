@@ -0,0 +1,133 @@
+import asyncio
+import httpx
+import pytest
+from app.services import shopify_rate_limiter as rate_limiter_module
+from app.services import shopify_service
+from app.services.shopify_rate_limiter import ShopifyCallBucket, ShopifyRateLimiter
+from app.services.shopify_service import ShopifyService
+
+SHOP = "test-shop.myshopify.com"
+
+
+class FakeClock:
+    """time.monotonic()과 asyncio.sleep을 대체하는 수동 시계 (sleep은 기다리지 않고 시간만 진행)"""
+
+    def __init__(self, real_sleep):
+        self.now = 0.0
+        self.sleeps = []
+        self._real_sleep = real_sleep
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await self._real_sleep(0)
+
+
+class NoJitter:
+    """random.uniform(a, b)가 항상 상한을 돌려주도록 고정"""
+
+    @staticmethod
+    def uniform(low, high):
+        return high
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock(asyncio.sleep)
+    monkeypatch.setattr(rate_limiter_module, "time", clock)
+    monkeypatch.setattr(rate_limiter_module, "random", NoJitter)
+    monkeypatch.setattr(asyncio, "sleep", clock.sleep)
+    return clock
+
+
+async def test_calls_are_paced_at_the_leak_rate_once_the_bucket_is_full(clock):
+    bucket = ShopifyCallBucket(capacity=4, leak_rate=2.0)
+
+    started = []
+    for _ in range(8):
+        await bucket.acquire(headroom=1)
+        started.append(clock.now)
+
+    # Three calls burst (capacity minus headroom), then one every 1 / leak_rate seconds
+    assert started == [0.0, 0.0, 0.0, 0.5, 1.0, 1.5, 2.0, 2.5]
+    assert bucket.snapshot()["used"] == 3 and bucket.total_calls == 8
+
+
+async def test_concurrent_callers_never_overflow_the_bucket(clock):
+    bucket = ShopifyCallBucket(capacity=10, leak_rate=5.0)
+    peaks = []
+
+    async def call():
+        await bucket.acquire()
+        peaks.append(bucket.level)
+
+    await asyncio.gather(*(call() for _ in range(30)))
+
+    assert max(peaks) == pytest.approx(10)
+    assert clock.now == pytest.approx(20 / 5.0)
+
+
+async def test_call_limit_header_corrects_the_estimate(clock):
+    bucket = ShopifyCallBucket(capacity=40, leak_rate=2.0)
+    await bucket.acquire()
+
+    # Other clients of the same shop used most of the bucket; Plus shops report a larger capacity
+    bucket.update_from_header("78/80")
+    assert bucket.snapshot()["used"] == 78 and bucket.capacity == 80
+
+    await bucket.acquire(headroom=2)
+    assert clock.now == pytest.approx(0.5)
+
+    bucket.update_from_header("garbage")
+    bucket.update_from_header(None)
+    assert bucket.capacity == 80
+
+
+async def test_pause_blocks_calls_until_retry_after_passes(clock):
+    bucket = ShopifyCallBucket(capacity=40, leak_rate=2.0)
+
+    bucket.pause(3.0)
+    bucket.pause(1.0)  # A shorter pause does not shorten the block
+    await bucket.acquire()
+
+    assert clock.now == pytest.approx(3.0)
+    assert bucket.throttled_count == 2
+
+
+def test_retry_after_header_and_backoff_delays(monkeypatch):
+    monkeypatch.setattr(rate_limiter_module, "random", NoJitter)
+    monkeypatch.setattr(rate_limiter_module.settings, "SHOPIFY_RETRY_BASE_DELAY", 0.5)
+    monkeypatch.setattr(rate_limiter_module.settings, "SHOPIFY_RETRY_MAX_DELAY", 3.0)
+
+    assert ShopifyRateLimiter.retry_after_delay({"Retry-After": "2.0"}, attempt=0) == 2.5
+    assert ShopifyRateLimiter.retry_after_delay({"Retry-After": "soon"}, attempt=1) == 1.0
+    assert [ShopifyRateLimiter.backoff_delay(attempt) for attempt in range(4)] == [0.5, 1.0, 2.0, 3.0]
+
+
+async def test_request_backs_off_after_429_and_retries(clock, monkeypatch):
+    limiter = ShopifyRateLimiter(capacity=40, leak_rate=2.0, headroom=0)
+    replies = [
+        httpx.Response(429, headers={"Retry-After": "2.0", "X-Shopify-Shop-Api-Call-Limit": "40/40"}),
+        httpx.Response(200, json={"shop": {"id": 1}}, headers={"X-Shopify-Shop-Api-Call-Limit": "36/40"}),
+    ]
+    requested_at = []
+
+    def handler(request):
+        requested_at.append(clock.now)
+        return replies.pop(0)
+
+    monkeypatch.setattr(shopify_service, "shopify_rate_limiter", limiter)
+    monkeypatch.setattr(shopify_service, "get_shopify_client",
+                        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(rate_limiter_module.settings, "SHOPIFY_RETRY_BASE_DELAY", 0.5)
+
+    response = await ShopifyService()._request("GET", "shop.json")
+
+    assert response.json() == {"shop": {"id": 1}}
+    # Retry-After plus at most one base delay of jitter, after which the full bucket has leaked a slot
+    assert requested_at == [0.0, pytest.approx(2.5)]
+    assert limiter.get_metrics()[SHOP]["throttled_count"] == 1
+    assert limiter.get_metrics()[SHOP]["used"] == 36
@@ -0,0 +1,73 @@
+import asyncio
+import json
+from datetime import datetime
+import httpx
+from fastapi.testclient import TestClient
+from app.api.v1.endpoints import sns
+from app.core.database import SessionLocal
+from app.main import app
+from app.models.product import Product
+from app.models.sns_content import SNSContent
+from app.services.sns_service import SNSContentService
+
+
+class ControlledOpenAI:
+    """제목에 "느린"이 들어간 제품만 release될 때까지 기다리는 생성 대역"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def generate(self, prompt, **kwargs):
+        if "느린" in prompt:
+            await self.release.wait()
+        return "제목: 테스트\n설명: 생성된 설명\n해시태그: #테스트"
+
+
+async def test_disconnect_keeps_generations_finished_but_not_yet_streamed(db):
+    db.add_all([Product(id=1, title="빠른 제품 1"), Product(id=2, title="빠른 제품 2"), Product(id=3, title="느린 제품")])
+    db.commit()
+    products = db.query(Product).order_by(Product.id).all()
+    service = SNSContentService(openai_service=ControlledOpenAI())
+
+    stream = service.generate_batch(db, products, ["instagram"], ["post"], concurrency=3)
+    first = await stream.__anext__()
+    # Both fast generations are finished, but only one has been handed to the consumer
+    assert first["completed"] == 1
+    await stream.aclose()
+
+    assert sorted(product_id for (product_id,) in db.query(SNSContent.product_id)) == [1, 2]
+
+
+def test_generate_batch_rejects_empty_platform_list():
+    response = TestClient(app).post("/api/v1/sns/generate-batch", json={"platforms": [], "content_types": ["post"]})
+
+    assert response.status_code == 422
+
+
+async def test_generate_batch_stream_uses_and_closes_its_own_session(db, monkeypatch):
+    db.add_all([Product(id=1, title="빠른 제품 1"), Product(id=2, title="빠른 제품 2", deleted_at=datetime(2024, 1, 1))])
+    db.commit()
+    opened, closed = [], []
+
+    def tracked_session():
+        session = SessionLocal()
+        close = session.close
+
+        def tracked_close():
+            closed.append(session)
+            close()
+
+        session.close = tracked_close
+        opened.append(session)
+        return session
+
+    monkeypatch.setattr(sns, "SessionLocal", tracked_session)
+    monkeypatch.setattr(sns, "SNSContentService", lambda: SNSContentService(openai_service=ControlledOpenAI()))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as api:
+        response = await api.post("/api/v1/sns/generate-batch", json={"platforms": ["instagram", "tiktok"]})
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[-1] == {"done": True, "total": 2, "completed": 2, "created": 2, "failed": 0}
+    assert len(opened) == 1 and closed == opened
+    assert sorted(platform for (platform,) in db.query(SNSContent.platform)) == ["instagram", "tiktok"]
@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from app.models.product import Product
+from app.services.webhook_buffer import WebhookBuffer
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """_write 대신 기록 내용을 모으고, failures 수만큼 먼저 실패"""
+    calls = {"writes": [], "failures": 0}
+
+    def fake_write(products, deleted_ids):
+        if calls["failures"]:
+            calls["failures"] -= 1
+            raise ConnectionError("database unavailable")
+        calls["writes"].append({"products": products, "deleted": deleted_ids})
+
+    monkeypatch.setattr(WebhookBuffer, "_write", staticmethod(fake_write))
+    return calls
+
+
+def product_ids(calls):
+    return sorted(str(product["id"]) for write in calls["writes"] for product in write["products"])
+
+
+async def test_stop_flushes_batch_being_collected(writes):
+    buffer = WebhookBuffer(flush_interval=30, max_batch=100, max_queue=100)
+    buffer.start()
+    for product_id in range(5):
+        buffer.submit("products/update", {"id": product_id, "updated_at": "2024-01-01T00:00:00Z"})
+    # Let the flusher dequeue the first event and start waiting for the window to close
+    await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(buffer.stop(), timeout=1)
+
+    assert product_ids(writes) == ["0", "1", "2", "3", "4"]
+
+
+async def test_failed_flush_is_retried_with_next_batch(writes):
+    writes["failures"] = 1
+    buffer = WebhookBuffer(flush_interval=0.01, max_batch=100, max_queue=100)
+    buffer.start()
+    buffer.submit("products/update", {"id": 1, "updated_at": "2024-01-01T00:00:00Z"})
+    await asyncio.sleep(0.05)
+    buffer.submit("products/delete", {"id": 2})
+
+    await buffer.stop()
+
+    assert buffer.stats["flush_errors"] == 1
+    assert product_ids(writes) == ["1"]
+    assert [deleted for write in writes["writes"] for deleted in write["deleted"]] == ["2"]
+    assert buffer.stats["lost"] == 0
+
+
+def flush_inline(buffer, batch):
+    """_flush와 같은 병합/기록을 테스트 스레드에서 실행 (인메모리 SQLite는 스레드마다 별도 DB)"""
+    upserts, deletes, orders = buffer._coalesce(batch)
+    WebhookBuffer._write(list(upserts.values()), list(deletes))
+    return orders
+
+
+def product_update(product_id, updated_at, *quantities):
+    return ("products/update", {"id": product_id, "title": "이어폰", "updated_at": updated_at,
+                                "variants": [{"price": "10.00", "inventory_quantity": quantity} for quantity in quantities]})
+
+
+def order(created_at, product_id, quantity):
+    return ("orders/create", {"created_at": created_at, "line_items": [{"product_id": product_id, "quantity": quantity}]})
+
+
+def test_order_after_an_already_flushed_stock_update_is_not_subtracted_again(db):
+    buffer = WebhookBuffer(flush_interval=1, max_batch=10, max_queue=10)
+    flush_inline(buffer, [product_update(1, "2024-01-01T10:00:00Z", 10, 5)])
+    # Shopify reports the post-sale stock before the order webhook arrives
+    flush_inline(buffer, [product_update(1, "2024-01-01T10:05:01Z", 7, 5)])
+
+    orders = flush_inline(buffer, [order("2024-01-01T10:05:00Z", 1, 3)])
+
+    db.expire_all()
+    assert orders == 1
+    assert db.query(Product).filter(Product.shopify_id == "1").one().inventory_quantity == 12
+
+
+async def test_redelivered_webhooks_are_dropped(writes):
+    buffer = WebhookBuffer(flush_interval=0.01, max_batch=100, max_queue=100)
+    buffer.start()
+
+    for _ in range(2):
+        buffer.submit(*order("2024-01-01T10:00:00Z", 1, 3), webhook_id="order-webhook-1")
+        buffer.submit(*product_update(1, "2024-01-01T10:00:01Z", 7), webhook_id="product-webhook-1")
+    await buffer.stop()
+
+    assert buffer.stats["received"] == 2 and buffer.stats["duplicates"] == 2
+    assert buffer.stats["orders_created"] == 1
+    assert product_ids(writes) == ["1"]
+
+
+async def test_rejected_webhook_is_accepted_when_redelivered(writes):
+    buffer = WebhookBuffer(flush_interval=30, max_batch=100, max_queue=1)
+    buffer.start()
+    assert buffer.submit(*product_update(1, "2024-01-01T10:00:00Z", 7), webhook_id="product-webhook-1")
+
+    assert not buffer.submit(*product_update(2, "2024-01-01T10:00:00Z", 3), webhook_id="product-webhook-2")
+    await buffer.stop()
+    buffer.start()
+    assert buffer.submit(*product_update(2, "2024-01-01T10:00:00Z", 3), webhook_id="product-webhook-2")
+    await buffer.stop()
+
+    assert product_ids(writes) == ["1", "2"]
+    assert buffer.stats["duplicates"] == 0
@@ -87,6 +87,24 @@ export const snsAPI = {
   getAnalytics: (params) => api.get('/sns/analytics', { params }),
 };
 
+// Jobs API
+export const jobsAPI = {
+  getJobs: (params) => api.get('/jobs', { params }),
+  getJob: (id) => api.get(`/jobs/${id}`),
+  getJobItems: (id, params) => api.get(`/jobs/${id}/items`, { params }),
+  // Server-sent progress events; call .close() on the returned EventSource when done
+  subscribeJob: (id, onProgress) => {
+    const source = new EventSource(`${API_BASE_URL}/api/v1/jobs/${id}/events`);
+    const handler = (event) => onProgress(JSON.parse(event.data));
+    source.addEventListener('progress', handler);
+    source.addEventListener('done', (event) => {
+      handler(event);
+      source.close();
+    });
+    return source;
+  },
+};
+
 // Dashboard API
 export const dashboardAPI = {
   getStats: () => api.get('/dashboard/stats'),
@@ -105,6 +123,7 @@ const mainAPI = {
   logs: logsAPI,
   aliexpress: aliexpressAPI,
   sns: snsAPI,
+  jobs: jobsAPI,
   dashboard: dashboardAPI,
   health: healthAPI,
   